@@ -2,10 +2,74 @@
 浏览器控制引擎 - 提供统一的网页访问和操作接口
 """
 import asyncio
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, AsyncIterator
 from pathlib import Path
 from everify.core.utils import logger
 from everify.core.utils import config
+from everify.core.utils.template import fallback_max_wait_ms
+
+# 未配置就绪条件时使用的 DOM 静默时间（毫秒）
+DEFAULT_DOM_QUIET_MS = 500
+
+# 被拦截请求的估算体积（字节）：请求被中止后无法得知真实大小，按资源类型估算
+ESTIMATED_RESOURCE_BYTES = {
+    "font": 60 * 1024,
+    "media": 500 * 1024,
+    "image": 30 * 1024,
+    "script": 40 * 1024,
+    "stylesheet": 20 * 1024,
+}
+DEFAULT_ESTIMATED_BYTES = 10 * 1024
+
+# 在页面中等待 DOM 连续 quietMs 毫秒无变化，最多等待 maxMs 毫秒
+_DOM_QUIET_SCRIPT = """
+([quietMs, maxMs]) => new Promise((resolve) => {
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    const cap = setTimeout(() => done(false), maxMs);
+    function done(quiet = true) {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(cap);
+        resolve(quiet);
+    }
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(done, quietMs);
+})
+"""
+
+
+class ResourceStats:
+    """请求拦截统计"""
+
+    def __init__(self):
+        self.blocked_requests = 0
+        # 请求在发出前被中止，无法得知真实大小，只能按资源类型估算
+        self.estimated_bytes_saved = 0
+        self.by_type: Dict[str, int] = {}
+
+    def record(self, resource_type: str) -> None:
+        """记录一次被拦截的请求"""
+        self.blocked_requests += 1
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def summary(self) -> str:
+        """统计摘要"""
+        detail = "，".join(f"{t} {n} 个" for t, n in sorted(self.by_type.items()))
+        return f"拦截请求 {self.blocked_requests} 个（{detail}），估算节省流量约 {self.estimated_bytes_saved / 1024 / 1024:.1f} MB（按资源类型估算）"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """统计数据（estimated_bytes_saved 为按资源类型估算的值，不是实测流量）"""
+        return {
+            "blocked_requests": self.blocked_requests,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "by_type": dict(self.by_type),
+        }
 
 
 class BrowserEngine:
@@ -34,14 +98,18 @@ class BrowserEngine:
         """关闭浏览器引擎"""
         pass
 
-    async def navigate(self, url: str) -> None:
-        """导航到指定 URL"""
+    async def navigate(self, url: str, readiness: Optional[Any] = None, max_wait_ms: Optional[int] = None) -> bool:
+        """导航到指定 URL，并等待页面满足就绪条件，返回是否导航成功"""
         pass
 
-    async def screenshot(self, path: Path, full_page: bool = True) -> Path:
+    async def screenshot(self, path: Path, full_page: bool = True, stability: Optional[Any] = None) -> Path:
         """截图"""
         pass
 
+    async def screenshot_bytes(self, full_page: bool = False, stability: Optional[Any] = None) -> bytes:
+        """截图并以 PNG 字节返回（不写入磁盘）"""
+        pass
+
     async def fill_form(self, selector: str, value: str) -> None:
         """填写表单"""
         pass
@@ -62,30 +130,43 @@ class BrowserEngine:
 class PlaywrightBrowser(BrowserEngine):
     """基于 Playwright 的浏览器引擎实现"""
 
+    def __init__(
+        self,
+        browser_config: Optional[Any] = None,
+        page: Optional[Any] = None,
+        resource_stats: Optional[ResourceStats] = None
+    ):
+        """初始化浏览器引擎
+
+        Args:
+            browser_config: 浏览器配置
+            page: 由 BrowserPool 租出的页面（传入时不再自行启动浏览器）
+            resource_stats: 请求拦截统计（浏览器池中的页面共享同一份统计）
+        """
+        super().__init__(browser_config)
+        self.page = page
+        self._leased = page is not None
+        self._cdp_session = None  # 用于低分辨率采样帧的 CDP 会话，False 表示不可用
+        self.resource_stats = resource_stats or ResourceStats()
+        self._resource_policy = self.config.resource_policy
+        self._route_installed = False
+
     async def initialize(self) -> None:
         """初始化 Playwright 浏览器"""
+        if self._leased:
+            return
+
         from playwright.async_api import async_playwright
         try:
             self.playwright = await async_playwright().start()
-            # 根据配置选择浏览器类型（默认为 Chromium）
-            browser_type = "chromium"
-            # 启动浏览器，添加错误处理
-            try:
-                self.browser = await getattr(self.playwright, browser_type).launch(
-                    headless=self.config.headless,
-                    args=["--no-sandbox"]
-                )
-            except Exception as e:
-                logger.error(f"Playwright 浏览器引擎初始化失败: {e}")
-                logger.error("请确保已在打包前运行 'uv run python -m playwright install' 命令")
-                logger.error("或者，您可以在运行exe文件前先手动执行 'python -m playwright install'")
-                raise
+            self.browser = await _launch_chromium(self.playwright, self.config)
             # 创建新页面
             self.page = await self.browser.new_page()
             # 设置视口大小
             if self.config.viewport:
                 width, height = map(int, self.config.viewport.split("x"))
                 await self.page.set_viewport_size({"width": width, "height": height})
+            await self.set_resource_policy()
             logger.debug("Playwright 浏览器引擎初始化成功")
         except Exception as e:
             logger.error(f"Playwright 浏览器引擎初始化失败: {e}")
@@ -93,6 +174,25 @@ class PlaywrightBrowser(BrowserEngine):
 
     async def close(self) -> None:
         """关闭浏览器"""
+        if self._cdp_session:
+            try:
+                await self._cdp_session.detach()
+            except Exception:
+                pass
+            self._cdp_session = None
+
+        if self._route_installed and self.page:
+            try:
+                await self.page.unroute("**/*", self._handle_route)
+            except Exception:
+                pass
+            self._route_installed = False
+
+        if self._leased:
+            # 租出的页面由 BrowserPool 负责回收
+            self.page = None
+            return
+
         try:
             if self.page:
                 await self.page.close()
@@ -102,44 +202,128 @@ class PlaywrightBrowser(BrowserEngine):
                 self.browser = None
             if hasattr(self, "playwright") and self.playwright:
                 await self.playwright.stop()
+            if self.resource_stats.blocked_requests:
+                logger.info(self.resource_stats.summary())
             logger.debug("Playwright 浏览器引擎已关闭")
         except Exception as e:
             logger.error(f"关闭 Playwright 浏览器引擎失败: {e}")
 
-    async def navigate(self, url: str) -> None:
-        """导航到 URL"""
+    async def navigate(self, url: str, readiness: Optional[Any] = None, max_wait_ms: Optional[int] = None) -> bool:
+        """导航到 URL
+
+        Args:
+            url: URL 地址
+            readiness: 页面就绪条件（ReadinessConfig），未提供时等待 DOM 静默，
+                并以各网站原先的固定等待时间作为上限
+            max_wait_ms: 等待上限（毫秒，预编译模板中已算好），未提供时按就绪条件和网站计算
+
+        Returns:
+            bool: 是否导航成功；失败时不抛出异常（调用方仍可截取当前页面），但结果不应被缓存
+        """
+        tracker = None
         try:
             if not self.page:
                 logger.error("页面未初始化，无法导航")
-                return
+                return False
+
+            if readiness and readiness.network_idle_ms:
+                # 在导航前开始统计请求，才能覆盖页面加载期间发出的请求
+                tracker = _NetworkTracker(self.page)
 
             # 增加超时时间并改进等待策略，以应对页面加载问题
             await self.page.goto(url, timeout=30000, wait_until="domcontentloaded")
             logger.debug(f"导航到 URL: {url}")
 
-            # 根据网站设置不同的等待时间
-            if "nea.gov.cn" in url:  # 国家能源局网站
-                await asyncio.sleep(15)
-            elif "samr.gov.cn" in url:  # 国家市场监督管理总局网站
-                await asyncio.sleep(8)
-            else:
-                await asyncio.sleep(2)
+            await self._wait_until_ready(url, readiness, tracker, max_wait_ms)
+            return True
         except Exception as e:
             logger.error(f"导航到 URL 失败: {url}, 错误: {e}")
             # 不抛出异常，而是继续执行，避免整个任务失败
-            pass
+            return False
+        finally:
+            if tracker:
+                tracker.detach()
+
+    async def set_resource_policy(self, policy: Optional[Any] = None) -> None:
+        """设置请求拦截策略
 
-    async def screenshot(self, path: Path, full_page: bool = False) -> Path:
-        """截图 - 设置固定尺寸为 1920×1080"""
+        Args:
+            policy: 拦截策略（ResourcePolicyConfig），未提供时使用浏览器配置中的全局策略
+        """
+        self._resource_policy = policy or self.config.resource_policy
+        if self._resource_policy.enabled and not self._route_installed and self.page:
+            await self.page.route("**/*", self._handle_route)
+            self._route_installed = True
+
+    async def _handle_route(self, route: Any) -> None:
+        """按拦截策略中止或放行请求"""
+        request = route.request
+        policy = self._resource_policy
+        try:
+            if policy.enabled and not request.is_navigation_request() and (
+                request.resource_type in policy.blocked_resource_types
+                or any(pattern in request.url for pattern in policy.blocked_url_patterns)
+            ):
+                self.resource_stats.record(request.resource_type)
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception as e:
+            # 页面关闭时路由可能已失效
+            logger.debug(f"处理请求拦截失败: {request.url}, 错误: {e}")
+
+    async def _wait_until_ready(
+        self,
+        url: str,
+        readiness: Optional[Any],
+        tracker: Optional["_NetworkTracker"],
+        max_wait_ms: Optional[int] = None
+    ) -> None:
+        """等待页面满足就绪条件，条件满足后立即返回，最长等待 max_wait_ms"""
+        if not max_wait_ms:
+            max_wait_ms = readiness.max_wait_ms if readiness and readiness.max_wait_ms else fallback_max_wait_ms(url)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + max_wait_ms / 1000
+
+        conditions = []
+        if readiness and readiness.wait_selector:
+            conditions.append(self.page.wait_for_selector(readiness.wait_selector, state="visible", timeout=max_wait_ms))
+        if tracker:
+            conditions.append(tracker.wait_for_idle(readiness.network_idle_ms))
+        if readiness and readiness.dom_quiet_ms:
+            conditions.append(self.page.evaluate(_DOM_QUIET_SCRIPT, [readiness.dom_quiet_ms, max_wait_ms]))
+        if readiness is None:
+            conditions.append(self.page.evaluate(_DOM_QUIET_SCRIPT, [DEFAULT_DOM_QUIET_MS, max_wait_ms]))
+
+        if not conditions:
+            # 只配置了最长等待时间，等同于固定等待
+            await asyncio.sleep(max_wait_ms / 1000)
+            return
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(_until_deadline(c, deadline) for c in conditions)),
+                timeout=max_wait_ms / 1000
+            )
+            logger.debug(f"页面就绪: {url}（{(loop.time() - start) * 1000:.0f} ms）")
+        except asyncio.TimeoutError:
+            logger.debug(f"等待页面就绪达到上限 {max_wait_ms} ms: {url}")
+
+    async def screenshot(self, path: Path, full_page: bool = False, stability: Optional[Any] = None) -> Path:
+        """截图 - 设置固定尺寸为 1920×1080
+
+        Args:
+            path: 截图保存路径
+            full_page: 是否截取整个页面
+            stability: 视觉稳定检测配置（StabilityConfig），未提供时使用浏览器配置
+        """
         try:
             if not self.page:
                 logger.error("页面未初始化，无法截图")
                 return path
 
-            # 设置固定的视口尺寸
-            await self.page.set_viewport_size({"width": 1920, "height": 1080})
-            # 等待页面内容加载完成
-            await asyncio.sleep(2)
+            await self._prepare_capture(stability)
             await self.page.screenshot(path=str(path), full_page=full_page)
             logger.debug(f"截图保存到: {path}")
             return path
@@ -147,6 +331,89 @@ class PlaywrightBrowser(BrowserEngine):
             logger.error(f"截图失败: {e}")
             return path
 
+    async def screenshot_bytes(self, full_page: bool = False, stability: Optional[Any] = None) -> bytes:
+        """截图并以 PNG 字节返回 - 设置固定尺寸为 1920×1080
+
+        Args:
+            full_page: 是否截取整个页面
+            stability: 视觉稳定检测配置（StabilityConfig），未提供时使用浏览器配置
+
+        Returns:
+            bytes: PNG 图片数据，失败时为空
+        """
+        try:
+            if not self.page:
+                logger.error("页面未初始化，无法截图")
+                return b""
+
+            await self._prepare_capture(stability)
+            data = await self.page.screenshot(full_page=full_page)
+            logger.debug(f"截图完成: {len(data)} 字节")
+            return data
+        except Exception as e:
+            logger.error(f"截图失败: {e}")
+            return b""
+
+    async def _prepare_capture(self, stability: Optional[Any]) -> None:
+        """设置截图视口并等待页面渲染稳定"""
+        # 设置固定的视口尺寸
+        await self.page.set_viewport_size({"width": 1920, "height": 1080})
+        # 等待页面渲染稳定
+        stability = stability or self.config.stability
+        if stability.enabled:
+            await self._wait_for_visual_stability(stability)
+        else:
+            await asyncio.sleep(stability.budget_ms / 1000)
+
+    async def _wait_for_visual_stability(self, stability: Any) -> None:
+        """按固定间隔采样低分辨率帧，连续 stable_frames 次无变化即返回，最长等待 budget_ms"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + stability.budget_ms / 1000
+        previous = None
+        unchanged = 0
+
+        while loop.time() < deadline:
+            try:
+                frame = await self._capture_frame(stability)
+            except Exception as e:
+                logger.debug(f"采样帧失败，等待至上限: {e}")
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+                return
+
+            unchanged = unchanged + 1 if frame == previous else 0
+            if unchanged >= stability.stable_frames:
+                logger.debug(f"页面渲染稳定（{(loop.time() - start) * 1000:.0f} ms）")
+                return
+            previous = frame
+            await asyncio.sleep(min(stability.interval_ms / 1000, max(0.0, deadline - loop.time())))
+
+        logger.debug(f"等待页面渲染稳定达到上限 {stability.budget_ms} ms")
+
+    async def _capture_frame(self, stability: Any) -> Any:
+        """截取一帧低分辨率采样图
+
+        Chromium 下通过 CDP 按 frame_scale 缩放截图；其他浏览器无法缩放，退化为按 CSS 像素截取的
+        低质量 JPEG（不受设备像素比放大，但 frame_scale 不生效）
+        """
+        if self._cdp_session is None:
+            try:
+                self._cdp_session = await self.page.context.new_cdp_session(self.page)
+            except Exception:
+                self._cdp_session = False
+
+        if self._cdp_session:
+            viewport = self.page.viewport_size or {"width": 1920, "height": 1080}
+            result = await self._cdp_session.send("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": stability.frame_quality,
+                "clip": {"x": 0, "y": 0, "width": viewport["width"], "height": viewport["height"],
+                         "scale": stability.frame_scale},
+            })
+            return result["data"]
+
+        return await self.page.screenshot(type="jpeg", quality=stability.frame_quality, caret="hide", scale="css")
+
     async def fill_form(self, selector: str, value: str) -> None:
         """填写表单"""
         try:
@@ -184,6 +451,241 @@ class PlaywrightBrowser(BrowserEngine):
             logger.warning(f"等待页面加载超时: {e}")
 
 
+async def _until_deadline(condition: Any, deadline: float) -> None:
+    """等待单个就绪条件；条件出错（如页面跳转导致脚本上下文销毁）时退化为等到上限"""
+    try:
+        await condition
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.debug(f"就绪条件检测失败，等待至上限: {e}")
+        await asyncio.sleep(max(0.0, deadline - asyncio.get_running_loop().time()))
+
+
+class _NetworkTracker:
+    """统计页面进行中的网络请求，用于判断网络空闲窗口"""
+
+    def __init__(self, page: Any):
+        self.page = page
+        self.inflight = set()
+        self.last_activity = asyncio.get_running_loop().time()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+
+    def _on_request(self, request: Any) -> None:
+        self.inflight.add(request)
+        self.last_activity = asyncio.get_running_loop().time()
+
+    def _on_done(self, request: Any) -> None:
+        self.inflight.discard(request)
+        self.last_activity = asyncio.get_running_loop().time()
+
+    async def wait_for_idle(self, idle_ms: int) -> None:
+        """等待连续 idle_ms 毫秒没有进行中的请求"""
+        loop = asyncio.get_running_loop()
+        while self.inflight or (loop.time() - self.last_activity) * 1000 < idle_ms:
+            await asyncio.sleep(0.1)
+
+    def detach(self) -> None:
+        """移除事件监听"""
+        for event, handler in (("request", self._on_request),
+                               ("requestfinished", self._on_done),
+                               ("requestfailed", self._on_done)):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+
+async def _launch_chromium(playwright: Any, browser_config: Any) -> Any:
+    """启动一个 Chromium 进程"""
+    # 根据配置选择浏览器类型（默认为 Chromium）
+    browser_type = "chromium"
+    launch_options = {"headless": browser_config.headless, "args": ["--no-sandbox"]}
+    if browser_config.proxy:
+        launch_options["proxy"] = {"server": browser_config.proxy}
+    # 启动浏览器，添加错误处理
+    try:
+        return await getattr(playwright, browser_type).launch(**launch_options)
+    except Exception as e:
+        logger.error(f"Playwright 浏览器引擎初始化失败: {e}")
+        logger.error("请确保已在打包前运行 'uv run python -m playwright install' 命令")
+        logger.error("或者，您可以在运行exe文件前先手动执行 'python -m playwright install'")
+        raise
+
+
+class _BrowserSlot:
+    """浏览器池中的单个 Chromium 进程"""
+
+    def __init__(self, browser: Any):
+        self.browser = browser
+        self.active = 0  # 当前租出的上下文数
+        self.leases = 0  # 累计租出次数
+        self.retired = False
+        self.idle_contexts: List[Any] = []  # 可复用的 (context, page)
+
+
+class BrowserPool:
+    """浏览器池 - 少量常驻 Chromium 进程，按需租出相互隔离的 BrowserContext
+
+    每次租借得到一个独立上下文中的页面（cookies、缓存互不影响），
+    创建上下文只需毫秒级，而启动 Chromium 需要数秒。
+    同时租出的页面数不超过 pool_size × contexts_per_browser，从而限制内存占用。
+    """
+
+    def __init__(self, browser_config: Optional[Any] = None):
+        self.config = browser_config or config.browser
+        self.playwright = None
+        self._slots: List[_BrowserSlot] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.resource_stats = ResourceStats()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def capacity(self) -> int:
+        """可同时租出的页面数"""
+        return max(1, self.config.pool_size) * max(1, self.config.contexts_per_browser)
+
+    async def initialize(self) -> None:
+        """启动 Playwright 和常驻浏览器进程"""
+        from playwright.async_api import async_playwright
+
+        self._semaphore = asyncio.Semaphore(self.capacity)
+        self._lock = asyncio.Lock()
+        self.playwright = await async_playwright().start()
+        try:
+            for _ in range(max(1, self.config.pool_size)):
+                self._slots.append(_BrowserSlot(await _launch_chromium(self.playwright, self.config)))
+        except Exception:
+            await self.close()
+            raise
+        logger.debug(f"浏览器池初始化成功: {len(self._slots)} 个进程，容量 {self.capacity}")
+
+    async def close(self) -> None:
+        """关闭所有浏览器进程"""
+        for slot in self._slots:
+            await self._close_slot(slot)
+        self._slots = []
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except Exception as e:
+                logger.error(f"停止 Playwright 失败: {e}")
+            self.playwright = None
+        logger.debug("浏览器池已关闭")
+
+    @asynccontextmanager
+    async def lease(self, resource_stats: Optional[ResourceStats] = None) -> AsyncIterator[PlaywrightBrowser]:
+        """租借一个隔离上下文中的页面
+
+        Args:
+            resource_stats: 请求拦截统计（如单次核查的统计），未提供时记入浏览器池的统计
+
+        Yields:
+            PlaywrightBrowser: 绑定到租借页面的浏览器引擎
+        """
+        await self._semaphore.acquire()
+        slot = context = page = browser = None
+        try:
+            slot, context, page = await self._acquire_context()
+            browser = PlaywrightBrowser(
+                browser_config=self.config, page=page, resource_stats=resource_stats or self.resource_stats
+            )
+            await browser.set_resource_policy()
+            yield browser
+        finally:
+            if browser is not None:
+                await browser.close()
+            if context is not None:
+                await self._release_context(slot, context, page)
+            self._semaphore.release()
+
+    async def _acquire_context(self):
+        """选择负载最小的进程并取得上下文"""
+        async with self._lock:
+            slot = min(self._slots, key=lambda s: s.active)
+            recycle_after = self.config.recycle_after
+            if not slot.browser.is_connected() or (recycle_after and slot.leases >= recycle_after):
+                slot = await self._replace_slot(slot)
+            slot.active += 1
+            slot.leases += 1
+            reused = slot.idle_contexts.pop() if slot.idle_contexts else None
+
+        if reused:
+            return (slot, *reused)
+
+        try:
+            options = {}
+            if self.config.viewport:
+                width, height = map(int, self.config.viewport.split("x"))
+                options["viewport"] = {"width": width, "height": height}
+            if self.config.user_agent:
+                options["user_agent"] = self.config.user_agent
+            context = await slot.browser.new_context(**options)
+            page = await context.new_page()
+            return slot, context, page
+        except Exception:
+            slot.active -= 1
+            raise
+
+    async def _release_context(self, slot: _BrowserSlot, context: Any, page: Any) -> None:
+        """归还上下文：复用或关闭"""
+        slot.active -= 1
+        reusable = (
+            self.config.reuse_contexts
+            and not slot.retired
+            and slot.browser.is_connected()
+            and not page.is_closed()
+        )
+        try:
+            if reusable:
+                await context.clear_cookies()
+                await page.goto("about:blank")
+                slot.idle_contexts.append((context, page))
+            else:
+                await context.close()
+        except Exception as e:
+            logger.debug(f"回收浏览器上下文失败: {e}")
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+        if slot.retired and slot.active == 0:
+            await self._close_slot(slot)
+
+    async def _replace_slot(self, slot: _BrowserSlot) -> _BrowserSlot:
+        """重启浏览器进程（回收或崩溃恢复），旧进程在租借全部归还后关闭"""
+        logger.debug(f"回收浏览器进程（累计租出 {slot.leases} 次）")
+        new_slot = _BrowserSlot(await _launch_chromium(self.playwright, self.config))
+        self._slots[self._slots.index(slot)] = new_slot
+        slot.retired = True
+        if slot.active == 0:
+            await self._close_slot(slot)
+        return new_slot
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        """关闭单个浏览器进程"""
+        for context, _ in slot.idle_contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        slot.idle_contexts = []
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器进程失败: {e}")
+
+
 async def create_browser_engine() -> BrowserEngine:
     """创建浏览器引擎实例"""
     browser = PlaywrightBrowser()
@@ -1,11 +1,21 @@
 """
 文档处理引擎 - 提供 Word 文档创建和编辑功能
 """
-from typing import Optional, List, Dict, Any
+import re
+from typing import Optional, List, Dict, Any, Union, BinaryIO
 from pathlib import Path
 from everify.core.utils import logger
 from everify.core.utils import config
 
+# 二级标题的自动编号前缀，如 "3、"
+HEADING_NUMBER_PATTERN = re.compile(r"^\d+、")
+# 汉字（CJK 统一表意文字）
+CJK_PATTERN = re.compile("[\u4e00-\u9fff]")
+
+# 报告使用的命名样式：正文段落样式和西文字符样式
+BODY_STYLE = "Everify Body"
+LATIN_STYLE = "Everify Latin"
+
 
 class DocumentEngine:
     """文档处理引擎接口"""
@@ -26,8 +36,26 @@ class DocumentEngine:
         """添加段落"""
         pass
 
-    def add_image(self, image_path: Path, caption: Optional[str] = None, width: Optional[int] = None) -> None:
-        """添加图片"""
+    def add_image(
+        self,
+        image_path: Union[Path, bytes, BinaryIO],
+        caption: Optional[str] = None,
+        width: Optional[int] = None,
+        heading: Optional[str] = None
+    ) -> None:
+        """添加图片（文件路径、图片字节或二进制流），指定 heading 时插入到该标题处"""
+        pass
+
+    def load_document(self, source: Union[Path, bytes], output_path: Optional[Path] = None) -> None:
+        """从文件或文档字节打开文档（用于复用预先生成的报告骨架）"""
+        pass
+
+    def save_to_bytes(self) -> bytes:
+        """将当前文档保存为字节"""
+        pass
+
+    def set_title(self, title: str) -> None:
+        """替换文档的一级标题和文档属性中的标题"""
         pass
 
     def add_table(self, data: List[List[Any]], headers: Optional[List[str]] = None) -> None:
@@ -68,17 +96,21 @@ class DocxDocumentEngine(DocumentEngine):
         self.doc = None
         self.current_output_path = None
         self.level2_counter = 0
+        # 标题索引 {标题文本（不含编号）: 段落}，用于按章节插入图片
+        self.headings: Dict[str, Any] = {}
         logger.debug("DocxDocumentEngine 初始化完成")
 
     def create_document(self, title: str, output_path: Optional[Path] = None) -> Path:
         """创建新文档"""
         self.doc = self.Document()
         self.level2_counter = 0  # 重置二级标题编号
+        self.headings = {}
 
         # 设置文档默认属性
         self.doc.core_properties.title = title
         self.doc.core_properties.author = "Everify"
         self.doc.core_properties.subject = "诚信核查报告"
+        self._register_styles()
 
         if output_path is None:
             from datetime import datetime
@@ -103,57 +135,70 @@ class DocxDocumentEngine(DocumentEngine):
                 title = f"{self.level2_counter}、{title}"
 
             heading = self.doc.add_heading(title, level=level)
+            self.headings[HEADING_NUMBER_PATTERN.sub("", title, count=1) if level == 2 else title] = heading
 
-            if level == 1:
-                # 一级标题格式：四号字体，居中对齐，1.5倍行距，首行不缩进，黑色
-                heading.paragraph_format.alignment = self.WD_PARAGRAPH_ALIGNMENT.CENTER
-                heading.paragraph_format.line_spacing = 1.5
-                heading.paragraph_format.first_line_indent = 0
-
-                for run in heading.runs:
-                    run.font.name = '楷体'
-                    run._element.rPr.rFonts.set(self.qn('w:eastAsia'), '楷体')
-                    run.font.size = self.Pt(14)  # 四号字体
-                    run.font.color.rgb = self.RGBColor(0, 0, 0)  # 黑色
-            elif level == 2:
-                # 二级标题格式：小四字体，左对齐，1.5倍行距，首行缩进，黑色，标题后不换行
-                heading.paragraph_format.alignment = self.WD_PARAGRAPH_ALIGNMENT.LEFT
-                heading.paragraph_format.line_spacing = 1.5
-                heading.paragraph_format.first_line_indent = self.Pt(14)  # 首行缩进2字符（小四字体）
-                heading.paragraph_format.space_after = self.Pt(0)  # 标题后不换行
-
-                for run in heading.runs:
-                    if any('\u4e00' <= c <= '\u9fff' for c in run.text):  # 包含汉字
-                        run.font.name = '楷体'
-                        run._element.rPr.rFonts.set(self.qn('w:eastAsia'), '楷体')
-                    else:  # 英文或数字
-                        run.font.name = 'Times New Roman'
-                        run._element.rPr.rFonts.set(self.qn('w:ascii'), 'Times New Roman')
-                        run._element.rPr.rFonts.set(self.qn('w:hAnsi'), 'Times New Roman')
-                    run.font.size = self.Pt(12)  # 小四字体
-                    run.font.color.rgb = self.RGBColor(0, 0, 0)  # 黑色
-            elif level == 3:
-                # 三级标题格式：小四字体，左对齐，1.5倍行距，首行缩进，黑色
-                heading.paragraph_format.alignment = self.WD_PARAGRAPH_ALIGNMENT.LEFT
-                heading.paragraph_format.line_spacing = 1.5
-                heading.paragraph_format.first_line_indent = self.Pt(14)  # 首行缩进2字符（小四字体）
-                heading.paragraph_format.space_after = self.Pt(6)
-
-                for run in heading.runs:
-                    if any('\u4e00' <= c <= '\u9fff' for c in run.text):  # 包含汉字
-                        run.font.name = '楷体'
-                        run._element.rPr.rFonts.set(self.qn('w:eastAsia'), '楷体')
-                    else:  # 英文或数字
-                        run.font.name = 'Times New Roman'
-                        run._element.rPr.rFonts.set(self.qn('w:ascii'), 'Times New Roman')
-                        run._element.rPr.rFonts.set(self.qn('w:hAnsi'), 'Times New Roman')
-                    run.font.size = self.Pt(12)  # 小四字体
-                    run.font.color.rgb = self.RGBColor(0, 0, 0)  # 黑色
+            # 标题格式由已登记的标题样式提供，二、三级标题中不含汉字的文本使用西文字符样式
+            if level in (2, 3):
+                self._apply_latin_style(heading)
 
             logger.debug(f"添加标题: {title} (级别: {level})")
         except Exception as e:
             logger.error(f"添加标题失败: {e}")
 
+    def _register_styles(self) -> None:
+        """在文档中登记报告样式（每个文档一次），标题和段落按样式引用而不是逐个文字设置格式"""
+        from docx.enum.style import WD_STYLE_TYPE
+
+        styles = self.doc.styles
+        if BODY_STYLE in [style.name for style in styles]:
+            return
+
+        # 一级标题：四号楷体，居中对齐，1.5倍行距，首行不缩进，黑色
+        heading1 = styles["Heading 1"]
+        self._set_style_font(heading1, '楷体', self.Pt(14))
+        heading1.paragraph_format.alignment = self.WD_PARAGRAPH_ALIGNMENT.CENTER
+        heading1.paragraph_format.line_spacing = 1.5
+        heading1.paragraph_format.first_line_indent = 0
+
+        # 二、三级标题：小四楷体，左对齐，1.5倍行距，首行缩进2字符，黑色；二级标题后不换行
+        for name, space_after in (("Heading 2", self.Pt(0)), ("Heading 3", self.Pt(6))):
+            heading = styles[name]
+            self._set_style_font(heading, '楷体', self.Pt(12))
+            heading.paragraph_format.alignment = self.WD_PARAGRAPH_ALIGNMENT.LEFT
+            heading.paragraph_format.line_spacing = 1.5
+            heading.paragraph_format.first_line_indent = self.Pt(14)
+            heading.paragraph_format.space_after = space_after
+
+        # 正文：小四楷体，1.5倍行距，首行缩进2字符，段后6磅
+        body = styles.add_style(BODY_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+        body.base_style = styles["Normal"]
+        self._set_style_font(body, '楷体', self.Pt(12), color=False)
+        body.paragraph_format.line_spacing = 1.5
+        body.paragraph_format.first_line_indent = self.Pt(14)
+        body.paragraph_format.space_after = self.Pt(6)
+
+        # 西文字符：Times New Roman
+        latin = styles.add_style(LATIN_STYLE, WD_STYLE_TYPE.CHARACTER)
+        latin.font.name = 'Times New Roman'
+
+    def _set_style_font(self, style: Any, font_name: str, size: Any, color: bool = True) -> None:
+        """设置样式字体（含东亚字体），并去掉会覆盖显式字体的主题字体"""
+        style.font.name = font_name
+        style.font.size = size
+        if color:
+            style.font.color.rgb = self.RGBColor(0, 0, 0)  # 黑色
+
+        r_fonts = style.element.rPr.rFonts
+        r_fonts.set(self.qn('w:eastAsia'), font_name)
+        for theme_attr in ('w:asciiTheme', 'w:hAnsiTheme', 'w:eastAsiaTheme'):
+            r_fonts.attrib.pop(self.qn(theme_attr), None)
+
+    def _apply_latin_style(self, paragraph: Any) -> None:
+        """不含汉字的文字块（英文或数字）使用西文字符样式"""
+        for run in paragraph.runs:
+            if not CJK_PATTERN.search(run.text):
+                run.style = LATIN_STYLE
+
     def add_paragraph(self, text: str) -> None:
         """添加段落"""
         if not self.doc:
@@ -161,35 +206,36 @@ class DocxDocumentEngine(DocumentEngine):
             return
 
         try:
-            para = self.doc.add_paragraph(text)
-
-            # 设置段落格式：小四字体，1.5倍行距，首行缩进
-            para.paragraph_format.line_spacing = 1.5
-            para.paragraph_format.first_line_indent = self.Pt(14)  # 首行缩进2字符（小四字体）
-
-            # 设置字体
-            for run in para.runs:
-                if any('\u4e00' <= c <= '\u9fff' for c in run.text):  # 包含汉字
-                    run.font.name = '楷体'
-                    run._element.rPr.rFonts.set(self.qn('w:eastAsia'), '楷体')
-                else:  # 英文或数字
-                    run.font.name = 'Times New Roman'
-                    run._element.rPr.rFonts.set(self.qn('w:ascii'), 'Times New Roman')
-                    run._element.rPr.rFonts.set(self.qn('w:hAnsi'), 'Times New Roman')
-                run.font.size = self.Pt(12)  # 小四字体
-
-            para.paragraph_format.space_after = self.Pt(6)
+            # 段落格式：小四字体，1.5倍行距，首行缩进，由正文样式统一提供
+            para = self.doc.add_paragraph(text, style=BODY_STYLE)
+            self._apply_latin_style(para)
             logger.debug(f"添加段落: {text[:50]}...")
         except Exception as e:
             logger.error(f"添加段落失败: {e}")
 
-    def add_image(self, image_path: Path, caption: Optional[str] = None, width: Optional[int] = None) -> None:
-        """添加图片"""
+    def add_image(
+        self,
+        image_path: Union[Path, bytes, BinaryIO],
+        caption: Optional[str] = None,
+        width: Optional[int] = None,
+        heading: Optional[str] = None
+    ) -> None:
+        """添加图片
+
+        Args:
+            image_path: 图片文件路径，或内存中的图片字节/二进制流
+            caption: 图片说明
+            width: 图片宽度
+            heading: 插入位置的标题文本（不含编号），未提供时插入到当前段落
+        """
         if not self.doc:
             logger.warning("文档尚未创建，无法添加图片")
             return
 
-        if not image_path.exists():
+        if isinstance(image_path, bytes):
+            import io
+            image_path = io.BytesIO(image_path)
+        elif isinstance(image_path, Path) and not image_path.exists():
             logger.warning(f"图片文件不存在: {image_path}")
             self.add_paragraph("图片未找到")
             return
@@ -199,9 +245,15 @@ class DocxDocumentEngine(DocumentEngine):
             img_width = width if width is not None else self.Inches(6)
 
             # 添加图片
-            para = self.doc.paragraphs[-1]  # 获取当前段落
+            if heading is not None:
+                para = self.headings.get(heading)
+                if para is None:
+                    logger.warning(f"未找到章节标题: {heading}")
+                    return
+            else:
+                para = self.doc.paragraphs[-1]  # 获取当前段落
             run = para.add_run()
-            run.add_picture(str(image_path), width=img_width)
+            run.add_picture(str(image_path) if isinstance(image_path, Path) else image_path, width=img_width)
 
             # 设置图片居中对齐
             para.paragraph_format.alignment = self.WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -210,10 +262,70 @@ class DocxDocumentEngine(DocumentEngine):
             if caption:
                 self.doc.add_paragraph(caption, style='Caption')
 
-            logger.debug(f"添加图片: {image_path}")
+            logger.debug(f"添加图片: {image_path if isinstance(image_path, Path) else '内存图片'}")
         except Exception as e:
             logger.error(f"添加图片失败: {e}")
-            self.add_paragraph(f"图片加载失败: {image_path}")
+            self.add_paragraph(f"图片加载失败: {image_path if isinstance(image_path, Path) else '内存图片'}")
+
+    def load_document(self, source: Union[Path, bytes], output_path: Optional[Path] = None) -> None:
+        """从文件或文档字节打开文档
+
+        Args:
+            source: 文档路径或文档字节（如预先生成的报告骨架）
+            output_path: 默认保存路径
+        """
+        import io
+
+        self.doc = self.Document(io.BytesIO(source) if isinstance(source, bytes) else str(source))
+        self.current_output_path = output_path
+        self._register_styles()
+        self._build_heading_index()
+        logger.debug(f"打开文档: {'内存文档' if isinstance(source, bytes) else source}")
+
+    def _build_heading_index(self) -> None:
+        """扫描一次全部段落，建立标题索引并恢复二级标题编号"""
+        self.headings = {}
+        self.level2_counter = 0
+        for para in self.doc.paragraphs:
+            style_name = para.style.name if para.style is not None else ""
+            if not style_name.startswith("Heading"):
+                continue
+            text = para.text
+            if style_name.startswith("Heading 2"):
+                self.level2_counter += 1
+                text = HEADING_NUMBER_PATTERN.sub("", text, count=1)
+            self.headings.setdefault(text, para)
+
+    def save_to_bytes(self) -> bytes:
+        """将当前文档保存为字节"""
+        import io
+
+        buffer = io.BytesIO()
+        self.doc.save(buffer)
+        return buffer.getvalue()
+
+    def set_title(self, title: str) -> None:
+        """替换文档的一级标题和文档属性中的标题，保留原有格式
+
+        Args:
+            title: 新标题
+        """
+        if not self.doc:
+            logger.warning("文档尚未创建，无法设置标题")
+            return
+
+        self.doc.core_properties.title = title
+        for para in self.doc.paragraphs:
+            if para.style is not None and para.style.name.startswith("Heading 1"):
+                old_title = para.text
+                runs = para.runs
+                if runs:
+                    runs[0].text = title
+                    for run in runs[1:]:
+                        run.text = ""
+                self.headings.pop(old_title, None)
+                self.headings[title] = para
+                break
 
     def add_table(self, data: List[List[Any]], headers: Optional[List[str]] = None) -> None:
         """添加表格"""
@@ -309,11 +421,332 @@ class DocxDocumentEngine(DocumentEngine):
             try:
                 self.doc = None
                 self.current_output_path = None
+                self.headings = {}
                 logger.debug("文档已关闭")
             except Exception as e:
                 logger.error(f"关闭文档失败: {e}")
 
 
+# 流式文档中内联图片的 DrawingML 片段（与 python-docx 生成的结构一致）
+_INLINE_PICTURE_XML = (
+    '<w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+    '<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{id}" name="Picture {id}"/>'
+    '<wp:cNvGraphicFramePr><a:graphicFrameLocks xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+    '<a:graphic xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+    '<a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<pic:pic xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<pic:nvPicPr><pic:cNvPr id="0" name="{name}"/><pic:cNvPicPr/></pic:nvPicPr>'
+    '<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+    '<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm><a:prstGeom prst="rect"/></pic:spPr>'
+    '</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>'
+)
+_IMAGE_RELATIONSHIP_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+
+class StreamingDocxDocumentEngine(DocumentEngine):
+    """流式 docx 文档引擎
+
+    正文 XML 边生成边写入临时文件，图片直接写入 docx 压缩包，保存时再拼装
+    document.xml、关系和内容类型。内存占用与文档大小无关，适合包含大量主体截图的合并报告。
+    样式、页面设置等其余部件取自 DocxDocumentEngine 生成的空白文档，排版与之一致。
+    """
+
+    def __init__(self, document_config: Optional[Any] = None):
+        super().__init__(document_config)
+        from docx.shared import Inches
+
+        self.Inches = Inches
+        self.current_output_path = None
+        self.level2_counter = 0
+        self._template: Optional[bytes] = None
+        self._style_ids: Dict[str, str] = {}
+        self._body = None
+        self._package = None
+        self._package_path: Optional[Path] = None
+        self._pending: Optional[List[str]] = None
+        self._images: List[tuple] = []
+        self._image_exts: set = set()
+        logger.debug("StreamingDocxDocumentEngine 初始化完成")
+
+    def create_document(self, title: str, output_path: Optional[Path] = None) -> Path:
+        """创建新文档"""
+        import tempfile
+        import uuid
+        import zipfile
+
+        self.close_document()
+        self.level2_counter = 0
+
+        # 用普通引擎生成只含样式和文档属性的空白文档，作为其余部件的来源
+        engine = DocxDocumentEngine(self.config)
+        engine.create_document(title)
+        self._style_ids = {
+            name: engine.doc.styles[name].style_id
+            for name in ("Heading 1", "Heading 2", "Heading 3", "Caption", "Table Grid", BODY_STYLE, LATIN_STYLE)
+        }
+        self._template = engine.save_to_bytes()
+        engine.close_document()
+
+        if output_path is None:
+            from datetime import datetime
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = self.config.reports_dir / f"{timestamp}_report.docx"
+        self.current_output_path = output_path
+
+        # 正文写入临时文件，图片写入保存目录下的临时压缩包，保存时改名即可
+        # 压缩包按普通方式创建（不用 mkstemp），改名后的报告权限与直接保存的文档一致
+        self._body = tempfile.TemporaryFile()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(exist_ok=True, parents=True)
+        self._package_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex[:8]}.part")
+        self._package = zipfile.ZipFile(self._package_path, "x", zipfile.ZIP_DEFLATED)
+        logger.debug(f"创建流式文档: {output_path}")
+
+        return output_path
+
+    def add_title(self, title: str, level: int = 1) -> None:
+        """添加标题"""
+        if self._body is None:
+            logger.warning("文档尚未创建，无法添加标题")
+            return
+
+        # 为二级标题添加编号
+        if level == 2:
+            self.level2_counter += 1
+            title = f"{self.level2_counter}、{title}"
+
+        style_id = self._style_ids.get(f"Heading {level}", f"Heading{level}")
+        self._start_paragraph(style_id, [self._run_xml(title, latin=level in (2, 3))])
+        logger.debug(f"添加标题: {title} (级别: {level})")
+
+    def add_paragraph(self, text: str) -> None:
+        """添加段落"""
+        if self._body is None:
+            logger.warning("文档尚未创建，无法添加段落")
+            return
+
+        runs = [self._run_xml(text, latin=True)] if text else []
+        self._start_paragraph(self._style_ids[BODY_STYLE], runs)
+
+    def add_image(
+        self,
+        image_path: Union[Path, bytes, BinaryIO],
+        caption: Optional[str] = None,
+        width: Optional[int] = None,
+        heading: Optional[str] = None
+    ) -> None:
+        """添加图片（追加到当前段落并居中，图片数据立即写入压缩包）
+
+        Args:
+            image_path: 图片文件路径，或内存中的图片字节/二进制流
+            caption: 图片说明
+            width: 图片宽度
+            heading: 流式文档只能追加到当前段落，不支持按标题插入
+        """
+        if self._body is None:
+            logger.warning("文档尚未创建，无法添加图片")
+            return
+        if heading is not None:
+            logger.warning(f"流式文档不支持按标题插入图片，已追加到当前段落: {heading}")
+
+        if isinstance(image_path, Path):
+            if not image_path.exists():
+                logger.warning(f"图片文件不存在: {image_path}")
+                self.add_paragraph("图片未找到")
+                return
+            blob = image_path.read_bytes()
+        elif isinstance(image_path, bytes):
+            blob = image_path
+        else:
+            blob = image_path.read()
+
+        try:
+            from docx.image.image import Image as DocxImage
+
+            image = DocxImage.from_blob(blob)
+            cx, cy = image.scaled_dimensions(width if width is not None else self.Inches(6), None)
+
+            index = len(self._images) + 1
+            part_name = f"media/image{index}.{image.ext}"
+            rel_id = f"rIdImage{index}"
+            self._package.writestr(f"word/{part_name}", blob)
+            self._images.append((rel_id, part_name))
+            self._image_exts.add((image.ext, image.content_type))
+
+            if self._pending is None:
+                self._start_paragraph(self._style_ids[BODY_STYLE], [])
+            self._pending[1] = True  # 居中对齐
+            self._pending[2].append(_INLINE_PICTURE_XML.format(
+                cx=int(cx), cy=int(cy), id=index, name=f"image{index}.{image.ext}", rid=rel_id
+            ))
+
+            # 添加图片说明
+            if caption:
+                self._start_paragraph(self._style_ids["Caption"], [self._run_xml(caption)])
+
+            logger.debug(f"添加图片: {image_path if isinstance(image_path, Path) else '内存图片'}")
+        except Exception as e:
+            logger.error(f"添加图片失败: {e}")
+            self.add_paragraph(f"图片加载失败: {image_path if isinstance(image_path, Path) else '内存图片'}")
+
+    def add_table(self, data: List[List[Any]], headers: Optional[List[str]] = None) -> None:
+        """添加表格"""
+        if self._body is None:
+            logger.warning("文档尚未创建，无法添加表格")
+            return
+
+        from xml.sax.saxutils import escape
+
+        # 计算列数
+        if headers:
+            col_count = len(headers)
+        elif data:
+            col_count = len(data[0])
+        else:
+            logger.warning("表格数据为空")
+            return
+
+        def row_xml(cells: List[Any], bold: bool = False) -> str:
+            properties = "<w:rPr><w:b/></w:rPr>" if bold else ""
+            cells = list(cells)[:col_count] + [""] * (col_count - len(cells))
+            return "<w:tr>" + "".join(
+                f'<w:tc><w:p><w:r>{properties}<w:t xml:space="preserve">{escape(str(cell))}</w:t></w:r></w:p></w:tc>'
+                for cell in cells
+            ) + "</w:tr>"
+
+        self._flush_paragraph()
+        table = (
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="{self._style_ids["Table Grid"]}"/><w:tblW w:w="0" w:type="auto"/></w:tblPr>'
+            f'<w:tblGrid>{"<w:gridCol/>" * col_count}</w:tblGrid>'
+        )
+        if headers:
+            table += row_xml(headers, bold=True)
+        table += "".join(row_xml(row) for row in data) + "</w:tbl>"
+        self._body.write(table.encode("utf-8"))
+        logger.debug(f"添加表格: {len(data)} 行, {col_count} 列")
+
+    def add_section(self, title: str) -> None:
+        """添加章节"""
+        if self._body is None:
+            logger.warning("文档尚未创建，无法添加章节")
+            return
+
+        # 添加章节分隔符
+        self._start_paragraph(None, ['<w:r><w:br w:type="page"/></w:r>'])
+        self.add_title(title, level=1)
+        logger.debug(f"添加章节: {title}")
+
+    def save_document(self, output_path: Optional[Path] = None) -> Path:
+        """拼装并保存文档"""
+        if self._body is None:
+            logger.warning("文档尚未创建，无法保存")
+            return None
+
+        try:
+            import io
+            import shutil
+            import zipfile
+
+            output_path = Path(output_path) if output_path is not None else Path(self.current_output_path)
+            self._flush_paragraph()
+
+            template = zipfile.ZipFile(io.BytesIO(self._template))
+            document_xml = template.read("word/document.xml").decode("utf-8")
+            body_start = document_xml.index("<w:body>") + len("<w:body>")
+            body_end = document_xml.index("<w:sectPr")
+
+            # 正文：模板的根元素 + 流式写入的段落 + 模板的页面设置
+            with self._package.open("word/document.xml", "w") as part:
+                part.write(document_xml[:body_start].encode("utf-8"))
+                self._body.seek(0)
+                shutil.copyfileobj(self._body, part)
+                part.write(document_xml[body_end:].encode("utf-8"))
+
+            # 文档关系：模板已有的关系 + 图片关系
+            rels_xml = template.read("word/_rels/document.xml.rels").decode("utf-8")
+            image_rels = "".join(
+                f'<Relationship Id="{rel_id}" Type="{_IMAGE_RELATIONSHIP_TYPE}" Target="{part_name}"/>'
+                for rel_id, part_name in self._images
+            )
+            self._package.writestr(
+                "word/_rels/document.xml.rels",
+                rels_xml.replace("</Relationships>", f"{image_rels}</Relationships>")
+            )
+
+            # 内容类型：补充图片扩展名
+            content_types = template.read("[Content_Types].xml").decode("utf-8")
+            defaults = "".join(
+                f'<Default Extension="{ext}" ContentType="{content_type}"/>'
+                for ext, content_type in sorted(self._image_exts)
+                if f'Extension="{ext}"' not in content_types
+            )
+            self._package.writestr("[Content_Types].xml", content_types.replace("<Default ", f"{defaults}<Default ", 1))
+
+            # 其余部件（样式、设置、主题、文档属性等）原样复制
+            for name in template.namelist():
+                if name not in ("word/document.xml", "word/_rels/document.xml.rels", "[Content_Types].xml"):
+                    self._package.writestr(template.getinfo(name), template.read(name))
+
+            self._package.close()
+            self._package = None
+            output_path.parent.mkdir(exist_ok=True, parents=True)
+            shutil.move(str(self._package_path), str(output_path))
+            self._package_path = None
+            logger.info(f"文档保存成功: {output_path}")
+
+            return output_path
+        except Exception as e:
+            logger.error(f"保存文档失败: {e}")
+            return None
+        finally:
+            self.close_document()
+
+    def close_document(self) -> None:
+        """关闭文档并清理临时文件"""
+        if self._body is not None:
+            self._body.close()
+            self._body = None
+        if self._package is not None:
+            self._package.close()
+            self._package = None
+        if self._package_path is not None:
+            self._package_path.unlink(missing_ok=True)
+            self._package_path = None
+        self._pending = None
+        self._images = []
+        self._image_exts = set()
+        self.current_output_path = None
+
+    def _start_paragraph(self, style_id: Optional[str], runs: List[str]) -> None:
+        """开始新段落：先写出上一个段落（图片可能还会追加到当前段落）"""
+        self._flush_paragraph()
+        self._pending = [style_id, False, runs]
+
+    def _flush_paragraph(self) -> None:
+        """将当前段落写入正文临时文件"""
+        if self._pending is None:
+            return
+
+        style_id, centered, runs = self._pending
+        properties = ""
+        if style_id:
+            properties += f'<w:pStyle w:val="{style_id}"/>'
+        if centered:
+            properties += '<w:jc w:val="center"/>'
+        paragraph = f"<w:p><w:pPr>{properties}</w:pPr>{''.join(runs)}</w:p>" if properties else f"<w:p>{''.join(runs)}</w:p>"
+        self._body.write(paragraph.encode("utf-8"))
+        self._pending = None
+
+    def _run_xml(self, text: str, latin: bool = False) -> str:
+        """生成文字块 XML，不含汉字的文字块按需使用西文字符样式"""
+        from xml.sax.saxutils import escape
+
+        properties = ""
+        if latin and not CJK_PATTERN.search(text):
+            properties = f'<w:rPr><w:rStyle w:val="{self._style_ids[LATIN_STYLE]}"/></w:rPr>'
+        return f'<w:r>{properties}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
 def create_document_engine() -> DocumentEngine:
     """创建文档处理引擎实例"""
     try:
@@ -1,11 +1,91 @@
 """
 图片处理引擎 - 提供图片编辑和水印添加功能
 """
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple, List, Union
 from pathlib import Path
 from everify.core.utils import logger
 from everify.core.utils import config
 
+# 水印旋转角度（从左下到右上）
+WATERMARK_ANGLE = 45
+# 缓存的旋转水印数量（同一批截图通常共享相同的主体和时间文本）
+WATERMARK_TILE_CACHE_SIZE = 128
+
+# 批量水印任务：(原始图片路径或字节, 水印文本, 输出路径)，输出路径为 None 时返回图片字节
+WatermarkJob = Tuple[Union[Path, bytes], str, Optional[Path]]
+
+
+def _font_path() -> str:
+    """按操作系统选择水印字体（Windows系统使用微软雅黑）"""
+    import platform
+
+    system = platform.system()
+    if system == "Windows":
+        return "C:/Windows/Fonts/msyh.ttc"
+    elif system == "Darwin":
+        return "/System/Library/Fonts/PingFang.ttc"
+    else:  # Linux
+        return "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@lru_cache(maxsize=None)
+def _load_font(font_path: str, font_size: int) -> Any:
+    """加载水印字体，每个进程每种字体和字号只加载一次"""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except:
+        # 如果无法加载系统字体，使用默认字体
+        return ImageFont.load_default()
+
+
+def _parse_color(color: str) -> Tuple[int, int, int]:
+    """将颜色字符串转换为 RGB"""
+    if color.startswith("#"):
+        # 十六进制颜色
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    # 颜色名称
+    from PIL import ImageColor
+
+    return ImageColor.getrgb(color)[:3]
+
+
+@lru_cache(maxsize=WATERMARK_TILE_CACHE_SIZE)
+def _render_watermark_tile(text: str, font_path: str, font_size: int, color: str, opacity: float, angle: int) -> Any:
+    """渲染旋转后的水印图块（LRU 缓存，键为文本、字体、字号、颜色、透明度和角度）"""
+    from PIL import Image, ImageDraw
+
+    font = _load_font(font_path, font_size)
+    r, g, b = _parse_color(color)
+    rgba_color = (r, g, b, int(opacity * 255))
+
+    # 计算文本尺寸
+    bbox = ImageDraw.Draw(Image.new('RGBA', (1, 1))).textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    # 创建旋转后的文字图像
+    text_image = Image.new('RGBA', (text_width + 40, text_height + 40), (0, 0, 0, 0))
+    ImageDraw.Draw(text_image).text((20, 20), text, font=font, fill=rgba_color)
+    rotated_text = text_image.rotate(angle, expand=True)
+
+    # 以文字自身为蒙版贴到透明图块上，与原先贴到整幅水印图层的效果一致
+    tile = Image.new('RGBA', rotated_text.size, (0, 0, 0, 0))
+    tile.paste(rotated_text, (0, 0), rotated_text)
+    return tile
+
+
+def _watermark_job(job: WatermarkJob, watermark_config: Dict[str, Any], embed_profile: Optional[Dict[str, Any]]) -> Union[Path, bytes]:
+    """进程池中执行的单个水印任务（模块级函数，便于跨进程序列化）"""
+    from everify.core.utils.config import WatermarkConfig, EmbedProfileConfig
+
+    source, text, output_path = job
+    engine = PillowImageEngine(WatermarkConfig(**watermark_config))
+    profile = EmbedProfileConfig(**embed_profile) if embed_profile else None
+    return engine._run_watermark_job(source, text, output_path, profile)
+
 
 class ImageEngine:
     """图片处理引擎接口"""
@@ -18,6 +98,23 @@ class ImageEngine:
         """添加水印到图片"""
         pass
 
+    def add_watermark_bytes(self, image_data: bytes, watermark_text: str) -> bytes:
+        """添加水印到内存中的图片，返回 PNG 字节"""
+        pass
+
+    def add_watermark_many(
+        self,
+        jobs: List[WatermarkJob],
+        workers: Optional[int] = None,
+        embed_profile: Optional[Any] = None
+    ) -> List[Optional[Union[Path, bytes]]]:
+        """批量添加水印，返回与任务顺序一致的结果（失败的任务为 None）"""
+        pass
+
+    def prepare_for_embed(self, image: Union[Path, bytes], profile: Optional[Any] = None) -> bytes:
+        """按嵌入配置缩放并重新压缩图片，返回用于插入文档的图片字节"""
+        pass
+
     def resize_image(self, image_path: Path, width: int, height: int, output_path: Optional[Path] = None) -> Path:
         """调整图片大小"""
         pass
@@ -41,128 +138,201 @@ class PillowImageEngine(ImageEngine):
     def add_watermark(self, image_path: Path, watermark_text: str, output_path: Optional[Path] = None) -> Path:
         """添加水印到图片"""
         try:
-            from PIL import Image, ImageDraw, ImageFont
-            import datetime
+            from PIL import Image
 
-            # 打开图片
-            image = Image.open(image_path)
+            image = self._apply_watermark(Image.open(image_path), watermark_text)
 
-            # 创建绘图对象
-            draw = ImageDraw.Draw(image)
-
-            # 解析水印配置
-            font_size = self.config.font_size
-            color = self.config.color
-            opacity = self.config.opacity
-            position = self.config.position
-
-            # 尝试加载字体
-            try:
-                # 首先尝试加载系统字体（Windows系统使用微软雅黑）
-                import platform
-
-                system = platform.system()
-                if system == "Windows":
-                    font_path = "C:/Windows/Fonts/msyh.ttc"
-                elif system == "Darwin":
-                    font_path = "/System/Library/Fonts/PingFang.ttc"
-                else:  # Linux
-                    font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
-
-                font = ImageFont.truetype(font_path, font_size)
-            except:
-                # 如果无法加载系统字体，使用默认字体
-                font = ImageFont.load_default()
-
-            # 格式化水印文本（支持时间戳格式）
-            try:
-                watermark_text = datetime.datetime.now().strftime(watermark_text)
-            except:
-                pass
-
-            # 计算文本尺寸
-            bbox = draw.textbbox((0, 0), watermark_text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            # 计算水印位置
-            img_width, img_height = image.size
-            padding = 20
-
-            if position == "top_left":
-                x = padding
-                y = padding
-            elif position == "top_right":
-                x = img_width - text_width - padding
-                y = padding
-            elif position == "bottom_left":
-                x = padding
-                y = img_height - text_height - padding
-            elif position == "bottom_right":
-                x = img_width - text_width - padding
-                y = img_height - text_height - padding
-            elif position == "center":
-                x = (img_width - text_width) // 2
-                y = (img_height - text_height) // 2
-            else:
-                # 默认右下角
-                x = img_width - text_width - padding
-                y = img_height - text_height - padding
-
-            # 处理颜色和透明度
-            # 将颜色字符串转换为 RGB
-            if color.startswith("#"):
-                # 十六进制颜色
-                r = int(color[1:3], 16)
-                g = int(color[3:5], 16)
-                b = int(color[5:7], 16)
-            else:
-                # 颜色名称
-                from PIL import ImageColor
+            # 保存图片
+            if output_path is None:
+                output_path = image_path.parent / f"{image_path.stem}_watermarked{image_path.suffix}"
 
-                r, g, b = ImageColor.getrgb(color)
+            image.save(output_path)
+            logger.debug(f"水印已添加到图片: {output_path}")
+            return output_path
 
-            # 转换为 RGBA
-            rgba_color = (r, g, b, int(opacity * 255))
+        except Exception as e:
+            logger.error(f"添加水印失败: {e}")
+            raise
 
-            # 创建水印图层
-            watermark_layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
-            draw_layer = ImageDraw.Draw(watermark_layer)
+    def add_watermark_bytes(self, image_data: bytes, watermark_text: str) -> bytes:
+        """添加水印到内存中的图片
 
-            # 计算斜向水印位置（从左下到右上，旋转45度）
-            angle = 45
-            # 创建旋转后的文字图像
-            text_image = Image.new('RGBA', (text_width + 40, text_height + 40), (0, 0, 0, 0))
-            draw_text = ImageDraw.Draw(text_image)
-            draw_text.text((20, 20), watermark_text, font=font, fill=rgba_color)
-            rotated_text = text_image.rotate(angle, expand=True)
+        Args:
+            image_data: 原始图片数据
+            watermark_text: 水印文本
 
-            # 计算水印在图片上的位置
-            rx, ry = rotated_text.size
-            # 斜向排列，从左下到右上
-            x = (image.width - rx) // 2
-            y = (image.height - ry) // 2
+        Returns:
+            bytes: 带水印的 PNG 图片数据
+        """
+        try:
+            from PIL import Image
+            import io
 
-            # 将旋转后的文字粘贴到水印图层
-            watermark_layer.paste(rotated_text, (x, y), rotated_text)
+            image = self._apply_watermark(Image.open(io.BytesIO(image_data)), watermark_text)
 
-            # 合并水印图层到原始图片
-            if image.mode != 'RGBA':
-                image = image.convert('RGBA')
-            image = Image.alpha_composite(image, watermark_layer)
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            logger.debug(f"水印已添加到内存图片: {buffer.tell()} 字节")
+            return buffer.getvalue()
 
-            # 保存图片
-            if output_path is None:
-                output_path = image_path.parent / f"{image_path.stem}_watermarked{image_path.suffix}"
+        except Exception as e:
+            logger.error(f"添加水印失败: {e}")
+            raise
 
-            image.save(output_path)
-            logger.debug(f"水印已添加到图片: {output_path}")
-            return output_path
+    def add_watermark_many(
+        self,
+        jobs: List[WatermarkJob],
+        workers: Optional[int] = None,
+        embed_profile: Optional[Any] = None
+    ) -> List[Optional[Union[Path, bytes]]]:
+        """批量添加水印，在进程池中并行处理以利用全部 CPU 核心
+
+        Args:
+            jobs: 水印任务列表 [(原始图片路径或字节, 水印文本, 输出路径)]，输出路径为 None 时返回图片字节
+            workers: 并行进程数（未提供时使用配置，0 表示 CPU 核数）
+            embed_profile: 嵌入配置（EmbedProfileConfig），提供且启用时结果为缩放压缩后的图片字节
+
+        Returns:
+            list: 与任务顺序一致的结果，带水印的图片路径或字节；失败的任务为 None
+        """
+        import os
+
+        if workers is None:
+            workers = self.config.workers
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+        # 任务很少时创建进程池得不偿失，直接在当前进程处理
+        if workers <= 1:
+            return [self._run_job_safely(job, embed_profile) for job in jobs]
+
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        results: List[Optional[Union[Path, bytes]]] = [None] * len(jobs)
+        # 进程池中途崩溃时未完成的任务
+        unfinished: List[int] = []
+        watermark_config = self.config.model_dump()
+        profile = embed_profile.model_dump() if embed_profile is not None else None
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_watermark_job, job, watermark_config, profile) for job in jobs]
+                for index, future in enumerate(futures):
+                    try:
+                        results[index] = future.result()
+                    except BrokenProcessPool:
+                        unfinished.append(index)
+                    except Exception as e:
+                        logger.error(f"添加水印失败: {e}")
+        except Exception as e:
+            # 进程池不可用（如受限环境），退回当前进程逐个处理
+            logger.warning(f"水印进程池不可用，改为逐个处理: {e}")
+            return [self._run_job_safely(job, embed_profile) for job in jobs]
+
+        if unfinished:
+            # 进程池中途崩溃，在当前进程补做未完成的任务
+            logger.warning(f"水印进程池异常退出，在当前进程处理剩余 {len(unfinished)} 个任务")
+            for index in unfinished:
+                results[index] = self._run_job_safely(jobs[index], embed_profile)
+
+        logger.debug(f"批量水印完成: {sum(r is not None for r in results)}/{len(jobs)}，进程数 {workers}")
+        return results
 
+    def _run_job_safely(self, job: WatermarkJob, embed_profile: Optional[Any] = None) -> Optional[Union[Path, bytes]]:
+        """在当前进程执行单个水印任务，失败时返回 None"""
+        try:
+            return self._run_watermark_job(*job, embed_profile)
         except Exception as e:
             logger.error(f"添加水印失败: {e}")
+            return None
+
+    def _run_watermark_job(
+        self,
+        source: Union[Path, bytes],
+        text: str,
+        output_path: Optional[Path],
+        embed_profile: Optional[Any] = None
+    ) -> Union[Path, bytes]:
+        """执行单个水印任务：有输出路径时写文件，否则返回图片字节；提供嵌入配置时再缩放压缩"""
+        if output_path is not None:
+            result = self.add_watermark(Path(source), text, output_path)
+        else:
+            if not isinstance(source, bytes):
+                source = Path(source).read_bytes()
+            result = self.add_watermark_bytes(source, text)
+
+        if embed_profile is not None and embed_profile.enabled:
+            result = self.prepare_for_embed(result, embed_profile)
+        return result
+
+    def prepare_for_embed(self, image: Union[Path, bytes], profile: Optional[Any] = None) -> bytes:
+        """按嵌入配置缩放并重新压缩图片，原图不做修改
+
+        Args:
+            image: 图片路径或图片字节
+            profile: 嵌入配置（EmbedProfileConfig），未提供时使用全局配置
+
+        Returns:
+            bytes: 用于插入文档的图片字节
+        """
+        try:
+            from PIL import Image
+            import io
+
+            profile = profile or config.embed
+            source = Image.open(image if isinstance(image, Path) else io.BytesIO(image))
+
+            # 按显示宽度和目标 DPI 计算所需像素宽度，只缩小不放大
+            target_width = int(profile.width_inches * profile.target_dpi)
+            if source.width > target_width:
+                target_height = max(1, round(source.height * target_width / source.width))
+                source = source.resize((target_width, target_height), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            dpi = (profile.target_dpi, profile.target_dpi)
+            if profile.format.upper() in ("JPEG", "JPG"):
+                source.convert("RGB").save(buffer, format="JPEG", quality=profile.quality, optimize=True, dpi=dpi)
+            else:
+                # 截图以文字和色块为主，量化为调色板 PNG 后清晰度基本不变
+                if source.mode not in ("RGB", "RGBA"):
+                    source = source.convert("RGBA")
+                method = Image.Quantize.FASTOCTREE if source.mode == "RGBA" else Image.Quantize.MEDIANCUT
+                source.quantize(colors=256, method=method).save(buffer, format="PNG", optimize=True, dpi=dpi)
+            return buffer.getvalue()
+
+        except Exception as e:
+            logger.error(f"处理嵌入图片失败: {e}")
             raise
 
+    def _apply_watermark(self, image: Any, watermark_text: str) -> Any:
+        """在图片中央合成斜向水印，返回合成后的 RGBA 图片"""
+        import datetime
+
+        # 格式化水印文本（支持时间戳格式）
+        try:
+            watermark_text = datetime.datetime.now().strftime(watermark_text)
+        except:
+            pass
+
+        # 相同文本和样式的旋转水印只渲染一次
+        tile = _render_watermark_tile(
+            watermark_text,
+            _font_path(),
+            self.config.font_size,
+            self.config.color,
+            self.config.opacity,
+            WATERMARK_ANGLE
+        )
+
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+
+        # 只在水印覆盖的区域内合成，不再分配整幅图片大小的水印图层
+        rx, ry = tile.size
+        x = (image.width - rx) // 2
+        y = (image.height - ry) // 2
+        image.alpha_composite(tile, dest=(max(x, 0), max(y, 0)), source=(max(-x, 0), max(-y, 0)))
+        return image
+
     def resize_image(self, image_path: Path, width: int, height: int, output_path: Optional[Path] = None) -> Path:
         """调整图片大小"""
         try:
@@ -0,0 +1,110 @@
+"""
+访问频率限制 - 按网站（host）限制请求速率和同时打开的页面数
+"""
+import threading
+import time
+from typing import Optional, Dict, Any
+from everify.core.utils import logger
+from everify.core.utils import config
+
+
+class _HostState:
+    """单个网站的令牌桶和在途页面计数"""
+
+    def __init__(self, limit: Any):
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated_at = time.monotonic()
+        self.inflight = 0
+
+    def refill(self, now: float) -> None:
+        """按流逝时间补充令牌"""
+        self.tokens = min(float(self.limit.burst), self.tokens + (now - self.updated_at) * self.limit.rate)
+        self.updated_at = now
+
+
+class HostRateLimiter:
+    """按网站限流：令牌桶控制请求速率，并限制每个网站同时打开的页面数
+
+    try_acquire 不会阻塞，调用方在某个网站饱和时可以先处理其他网站的任务。
+    限流状态需要跨核查任务共享（同一网站的并发任务共用一个令牌桶），通常使用 shared_rate_limiter()
+    获取进程内共享的实例；各任务在不同线程的事件循环中运行，因此内部加锁。
+    """
+
+    def __init__(self, default_limit: Optional[Any] = None):
+        """初始化限流器
+
+        Args:
+            default_limit: 默认限流配置（RateLimitConfig），模板未单独配置时使用
+        """
+        self.default_limit = default_limit or config.browser.rate_limit
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, host: str, limit: Optional[Any] = None) -> Optional[float]:
+        """尝试占用一次访问名额
+
+        Args:
+            host: 网站域名
+            limit: 该网站的限流配置（未提供时使用默认配置）
+
+        Returns:
+            Optional[float]: 0 表示已占用；正数为令牌补充所需的秒数；None 表示并发已满，需等待释放
+        """
+        limit = limit or self.default_limit
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(limit)
+            elif limit is not state.limit and limit != state.limit:
+                # 配置或模板重新加载后使用最新的限流配置
+                state.limit = limit
+
+            if state.limit.max_inflight and state.inflight >= state.limit.max_inflight:
+                return None
+
+            now = time.monotonic()
+            state.refill(now)
+            # rate 为 0 表示不限速率
+            if state.limit.rate > 0 and state.tokens < 1:
+                return (1 - state.tokens) / state.limit.rate
+
+            state.tokens -= 1
+            state.inflight += 1
+            return 0
+
+    def release(self, host: str) -> None:
+        """释放访问名额
+
+        Args:
+            host: 网站域名
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state and state.inflight > 0:
+                state.inflight -= 1
+                return
+        if state is None:
+            logger.debug(f"释放未登记网站的访问名额: {host}")
+
+    def inflight(self, host: str) -> int:
+        """获取网站当前打开的页面数"""
+        state = self._hosts.get(host)
+        return state.inflight if state else 0
+
+
+_shared_rate_limiter: Optional[HostRateLimiter] = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> HostRateLimiter:
+    """获取进程内共享的限流器（首次调用时创建），所有核查任务共用同一组令牌桶和在途页面计数
+
+    Returns:
+        HostRateLimiter: 共享的限流器
+    """
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = HostRateLimiter()
+        return _shared_rate_limiter
@@ -2,11 +2,13 @@
 自动核查操作模型
 负责执行自动核查任务
 """
-from typing import List, Dict
+import threading
+from typing import Callable, List, Dict, Optional
 from everify.core.operations.base_operation import BaseOperation, OperationResult
 from everify.core.services.url_generator import URLGenerator
-from everify.core.services.verify_service import VerifyService
-from everify.core.services.report_generator import ReportGenerator
+from everify.core.services.verify_service import VerifyService, VerifyEvent
+from everify.core.services.report_generator import ReportGenerator, ReportPipeline
+from everify.core.services.run_journal import RunJournal
 from everify.core.utils import logger
 import asyncio
 
@@ -31,12 +33,22 @@ class AutoVerifyOperation(BaseOperation):
         self.verify_service = verify_service
         self.report_generator = report_generator
 
-    def execute(self, entities: List[str], templates: Dict) -> OperationResult:
+    def execute(
+        self,
+        entities: List[str],
+        templates: Dict,
+        resume_run_id: Optional[str] = None,
+        on_event: Optional[Callable[[VerifyEvent], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> OperationResult:
         """执行自动核查操作
 
         Args:
             entities: 需要核查的主体列表
             templates: 核查模板字典
+            resume_run_id: 要恢复的运行 ID（跳过记录中已完成的 URL）
+            on_event: 核查事件回调（用于上报进度），报告生成事件在报告 worker 线程中回调
+            cancel_event: 取消标志，设置后在下一个核查事件时停止，已完成主体的报告照常生成
 
         Returns:
             OperationResult: 操作结果
@@ -47,27 +59,117 @@ class AutoVerifyOperation(BaseOperation):
             if not entity_urls:
                 return OperationResult.error_result("未能为任何主体生成有效的核查URL")
 
-            # 异步执行核查
-            results = asyncio.run(self.verify_service.process_all_entities(entity_urls))
+            # 打开或创建运行记录，每完成一个 URL 即落盘，中断后可恢复
+            runs_dir = self.verify_service.config.output_dir / "runs"
+            if resume_run_id:
+                journal = RunJournal.open(runs_dir, resume_run_id)
+                if journal is None:
+                    return OperationResult.error_result(f"无法恢复核查记录: {resume_run_id}")
+                done = journal.completed()
+            else:
+                journal = RunJournal.create(runs_dir, list(entity_urls), list(templates))
+                done = {}
+            logger.info(f"本次核查记录: {journal.run_id}（中断后可使用 --resume {journal.run_id} 继续）")
+
+            pending = {
+                entity: [url for url in urls if url not in done.get(entity, {})]
+                for entity, urls in entity_urls.items()
+            }
+            skipped = sum(len(urls) for urls in entity_urls.values()) - sum(len(urls) for urls in pending.values())
+            if skipped:
+                logger.info(f"跳过记录中已完成的 {skipped} 个 URL")
 
-            # 生成报告
-            report_paths = self.report_generator.generate_report(results, templates=templates)
+            # 异步执行核查，每个主体核查完成后立即交给后台报告 worker，与后续主体的核查并行
+            pipeline = self.report_generator.start_pipeline(templates=templates, on_report=on_event)
+            try:
+                asyncio.run(self._verify(
+                    entity_urls, pending, done, templates, journal, pipeline, on_event, cancel_event
+                ))
+            finally:
+                journal.close()
+                # 等待剩余的报告生成完成
+                report_paths = pipeline.finish()
             logger.info(f"报告生成结果: {report_paths}")
 
+            if cancel_event is not None and cancel_event.is_set():
+                str_report_paths = {entity: str(path) for entity, path in report_paths.items()}
+                logger.info(f"核查已取消，已为完成的主体生成 {len(str_report_paths)} 个报告")
+                return OperationResult.success_result({
+                    'report_paths': str_report_paths,
+                    'run_id': journal.run_id,
+                    'message': f"核查已取消，已生成 {len(str_report_paths)} 个报告（可恢复运行 {journal.run_id} 继续）"
+                })
+
             # 检查报告生成结果
             if report_paths:
                 str_report_paths = {entity: str(path) for entity, path in report_paths.items()}
                 logger.info(f"成功生成 {len(str_report_paths)} 个报告")
                 return OperationResult.success_result({
                     'report_paths': str_report_paths,
+                    'run_id': journal.run_id,
                     'message': f"所有报告已生成！共 {len(str_report_paths)} 个报告"
                 })
             else:
                 logger.warning("报告生成器返回空结果，可能没有符合条件的数据")
                 return OperationResult.success_result({
                     'report_paths': {},
+                    'run_id': journal.run_id,
                     'message': "没有符合条件的数据用于生成报告"
                 })
         except Exception as e:
             logger.error(f"自动核查操作执行失败: {str(e)}")
             return OperationResult.error_result(f"自动核查操作执行失败: {str(e)}")
+
+    async def _verify(
+        self,
+        entity_urls: Dict[str, List[str]],
+        pending: Dict[str, List[str]],
+        done: Dict[str, Dict[str, str]],
+        templates: Dict,
+        journal: RunJournal,
+        pipeline: ReportPipeline,
+        on_event: Optional[Callable[[VerifyEvent], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> None:
+        """核查未完成的 URL，逐个写入运行记录，主体完成后与已有结果合并并提交报告
+
+        Args:
+            entity_urls: 全部 {主体名称: [URL, ...]}
+            pending: 尚未完成的 {主体名称: [URL, ...]}
+            done: 运行记录中已完成的 {主体名称: {URL: 截图路径}}
+            templates: 核查模板字典
+            journal: 运行记录
+            pipeline: 报告流水线
+            on_event: 核查事件回调
+            cancel_event: 取消标志
+        """
+        def submit(entity: str, results: Dict) -> None:
+            merged = dict(done.get(entity, {}))
+            merged.update(results)
+            pipeline.submit(entity, {url: merged[url] for url in entity_urls[entity] if url in merged})
+
+        # 全部已完成时不必启动浏览器，直接生成报告
+        if not any(pending.values()):
+            for entity in entity_urls:
+                submit(entity, {})
+            return
+
+        events = self.verify_service.iter_results(pending, templates)
+        try:
+            async for event in events:
+                if event.type == VerifyEvent.URL_DONE:
+                    journal.record(event.entity, event.url, event.template, event.result)
+                else:
+                    submit(event.entity, event.results)
+
+                if on_event is not None:
+                    try:
+                        on_event(event)
+                    except Exception as e:
+                        logger.error(f"核查事件回调执行失败: {e}")
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info("核查已取消，停止剩余 URL 的核查")
+                    break
+        finally:
+            # 提前停止时立即关闭浏览器并保存缓存
+            await events.aclose()
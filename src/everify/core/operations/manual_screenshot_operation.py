@@ -5,8 +5,11 @@
 from everify.core.operations.base_operation import BaseOperation, OperationResult
 from everify.core.services.report_generator import ReportGenerator
 from everify.core.utils.config import AppConfig
+from everify.core.services.verify_service import VerifyEvent
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Optional
+import asyncio
+import threading
 
 
 class ManualScreenshotOperation(BaseOperation):
@@ -30,7 +33,9 @@ class ManualScreenshotOperation(BaseOperation):
         self,
         entities: List[str],
         report_paths: Dict[str, Path],
-        screenshot_dir: Path
+        screenshot_dir: Path,
+        on_event: Optional[Callable[[VerifyEvent], None]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> OperationResult:
         """执行人工截图插入操作
 
@@ -38,19 +43,110 @@ class ManualScreenshotOperation(BaseOperation):
             entities: 需要核查的主体列表
             report_paths: 报告文件路径字典
             screenshot_dir: 截图保存目录
+            on_event: 进度回调，每处理完一个报告调用一次（entity_done 和 report_ready）
+            cancel_event: 取消标志，设置后不再处理剩余报告
 
         Returns:
             OperationResult: 操作结果
         """
         try:
-            # 插入人工核查的截图
-            for entity, report_path in report_paths.items():
-                self.report_generator.insert_manual_screenshots(
-                    entity, report_path, screenshot_dir, entities
-                )
+            def on_report(event: VerifyEvent) -> None:
+                on_event(VerifyEvent.entity_done(event.entity, {}))
+                on_event(event)
 
+            # 截图目录只扫描一次，为所有报告分配截图后批量插入
+            results = self.report_generator.insert_manual_screenshots_batch(
+                report_paths, screenshot_dir, entities,
+                on_report=on_report if on_event is not None else None,
+                cancel_event=cancel_event
+            )
+
+            if cancel_event is not None and cancel_event.is_set():
+                return OperationResult.success_result({
+                    'message': "人工核查已取消，部分报告未插入截图"
+                })
+
+            failed = [entity for entity, success in results.items() if not success]
+            if failed:
+                return OperationResult.success_result({
+                    'message': f"人工核查截图插入完成，{len(failed)} 个报告插入失败: {', '.join(failed)}"
+                })
             return OperationResult.success_result({
                 'message': "人工核查截图插入完成！"
             })
         except Exception as e:
             return OperationResult.error_result(f"插入人工核查截图失败: {str(e)}")
+
+    def watch(
+        self,
+        entities: List[str],
+        report_paths: Dict[str, Path],
+        screenshot_dir: Path,
+        stop_event: threading.Event,
+        on_event: Optional[Callable[[VerifyEvent], None]] = None
+    ) -> OperationResult:
+        """实时插入人工核查截图：监视截图目录，新截图到达后立即插入对应报告，直到 stop_event 被设置
+
+        Args:
+            entities: 需要核查的主体列表
+            report_paths: 报告文件路径字典
+            screenshot_dir: 截图保存目录
+            stop_event: 结束监视的标志（操作员完成截图后设置）
+            on_event: 报告保存回调（report_ready）
+
+        Returns:
+            OperationResult: 操作结果
+        """
+        from everify.core.services.screenshot_watcher import ManualScreenshotWatcher
+
+        try:
+            screenshot_dir.mkdir(parents=True, exist_ok=True)
+            watcher = ManualScreenshotWatcher(
+                report_paths, screenshot_dir, entities, self.config.manual_watch, on_report=on_event
+            )
+            inserted = watcher.run(stop_event)
+            return OperationResult.success_result({
+                'inserted': inserted,
+                'message': f"人工核查截图实时插入完成！共插入 {inserted} 张截图"
+            })
+        except Exception as e:
+            return OperationResult.error_result(f"实时插入人工核查截图失败: {str(e)}")
+
+    def guided_capture(
+        self,
+        entities: List[str],
+        templates: Dict[str, Any],
+        screenshot_dir: Path,
+        stop_event: Optional[threading.Event] = None,
+        on_event: Optional[Callable[[VerifyEvent], None]] = None
+    ) -> OperationResult:
+        """引导式人工截图：在有界面的浏览器中依次打开人工核查网页，操作员按快捷键截图，
+        截图按 (主体, 章节) 记录到截图清单，之后插入报告时精确定位
+
+        Args:
+            entities: 需要核查的主体列表
+            templates: 核查模板字典（只使用人工核查模板）
+            screenshot_dir: 截图保存目录
+            stop_event: 结束截图的标志（可选，关闭浏览器同样会结束）
+            on_event: 截图回调，每截图或跳过一个网页调用一次（url_done）
+
+        Returns:
+            OperationResult: 操作结果
+        """
+        from everify.core.services.guided_capture import GuidedCaptureSession
+
+        try:
+            session = GuidedCaptureSession.from_templates(
+                entities, templates, screenshot_dir, self.config, on_capture=on_event
+            )
+            if not session.items:
+                return OperationResult.error_result("所选模板中没有人工核查模板")
+
+            summary = asyncio.run(session.run(stop_event))
+            summary['message'] = (
+                f"引导式截图完成！共 {summary['total']} 个网页，"
+                f"截图 {summary['captured']} 个，跳过 {summary['skipped']} 个"
+            )
+            return OperationResult.success_result(summary)
+        except Exception as e:
+            return OperationResult.error_result(f"引导式截图失败: {str(e)}")
@@ -5,10 +5,15 @@
 from everify.core.operations.base_operation import BaseOperation, OperationResult
 from everify.core.base.browser import BrowserEngine
 from everify.core.services.report_generator import ReportGenerator
+from everify.core.services.result_cache import ResultCache
+from everify.core.services.verify_service import VerifyEvent
+from everify.core.utils import logger
 from everify.core.utils.config import AppConfig
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 import asyncio
+import threading
+import time
 import urllib.parse
 
 
@@ -35,13 +40,17 @@ class SearchEngineQueryOperation(BaseOperation):
     def execute(
         self,
         entities: List[str],
-        search_keywords: Optional[List[str]] = None
+        search_keywords: Optional[List[str]] = None,
+        on_event: Optional[Callable[[VerifyEvent], None]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> OperationResult:
         """执行搜索引擎查询操作
 
         Args:
             entities: 需要查询的主体列表
             search_keywords: 自定义搜索关键词（可选）
+            on_event: 查询事件回调（用于上报进度）
+            cancel_event: 取消标志，设置后不再查询剩余主体，已查询的主体照常生成报告
 
         Returns:
             OperationResult: 操作结果
@@ -50,15 +59,18 @@ class SearchEngineQueryOperation(BaseOperation):
             if search_keywords is None:
                 search_keywords = self.config.get_search_keywords()
 
-            results = asyncio.run(self._async_execute(entities, search_keywords))
+            results, captured_at = asyncio.run(self._async_execute(entities, search_keywords, on_event, cancel_event))
 
             report_paths = self.report_generator.generate_search_engine_report(
                 results,
                 single_report=True,
-                search_keywords=search_keywords
+                search_keywords=search_keywords,
+                captured_at=captured_at
             )
 
             str_report_paths = {name: str(path) for name, path in report_paths.items()}
+            for name, path in str_report_paths.items():
+                self._emit(on_event, VerifyEvent.report_ready(name, path))
 
             return OperationResult.success_result({
                 'results': results,
@@ -71,56 +83,102 @@ class SearchEngineQueryOperation(BaseOperation):
     async def _async_execute(
         self,
         entities: List[str],
-        search_keywords: List[str]
-    ) -> Dict:
+        search_keywords: List[str],
+        on_event: Optional[Callable[[VerifyEvent], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[Dict, Dict[str, Dict[str, float]]]:
         """异步执行搜索引擎查询操作
 
         Args:
             entities: 需要查询的主体列表
             search_keywords: 搜索关键词列表
+            on_event: 查询事件回调
+            cancel_event: 取消标志
 
         Returns:
-            Dict: 查询结果
+            tuple: (查询结果 {主体名称: {关键词: 截图路径}}, 复用缓存的截图时间 {主体名称: {关键词: 截图时间戳}})
         """
-        # 初始化浏览器引擎
-        await self.browser_engine.initialize()
+        # 有效期内已有截图的查询直接复用，全部命中时不启动浏览器
+        cache = ResultCache.from_app_config(self.config)
+        browser_started = False
 
         results = {}
+        captured_at: Dict[str, Dict[str, float]] = {}
 
         # 创建搜索引擎查询结果的子文件夹
         search_screenshots_dir = self.config.screenshots_dir / "search_engine"
         search_screenshots_dir.mkdir(exist_ok=True)
 
-        # 为每个主体执行搜索
-        for entity in entities:
-            entity_results = {}
-
-            # 为每个主体创建一个子文件夹
-            from everify.common.file import clean_filename
-            entity_dir = search_screenshots_dir / clean_filename(entity)
-            entity_dir.mkdir(exist_ok=True)
-
-            # 为每个关键词执行搜索
-            for keyword in search_keywords:
-                query = f"{entity} {keyword}"
-                encoded_query = urllib.parse.quote(query)
-                search_url = f"https://www.baidu.com/s?wd={encoded_query}"
-
-                # 创建截图文件名
-                clean_keyword = clean_filename(keyword)
-                screenshot_path = entity_dir / f"{clean_keyword}.png"
-
-                try:
-                    # 使用浏览器引擎进行搜索和截图
-                    await self.browser_engine.navigate(search_url)
-                    await self.browser_engine.screenshot(str(screenshot_path))
-                    entity_results[keyword] = str(screenshot_path)
-                except Exception as e:
-                    entity_results[keyword] = str(e)
-
-            results[entity] = entity_results
-
-        # 关闭浏览器引擎
-        await self.browser_engine.close()
-
-        return results
+        try:
+            # 为每个主体执行搜索
+            for entity in entities:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                entity_results = {}
+
+                # 为每个主体创建一个子文件夹
+                from everify.common.file import clean_filename
+                entity_dir = search_screenshots_dir / clean_filename(entity)
+                entity_dir.mkdir(exist_ok=True)
+
+                # 为每个关键词执行搜索
+                for keyword in search_keywords:
+                    query = f"{entity} {keyword}"
+                    encoded_query = urllib.parse.quote(query)
+                    search_url = f"https://www.baidu.com/s?wd={encoded_query}"
+
+                    # 创建截图文件名（每次截图使用新文件，不覆盖缓存中仍在使用的旧截图）
+                    from datetime import datetime
+                    clean_keyword = clean_filename(keyword)
+                    screenshot_path = entity_dir / f"{clean_keyword}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
+
+                    cache_scope = f"search_engine:{keyword}"
+                    cached = cache.get(cache_scope, entity)
+                    if cached:
+                        entity_results[keyword] = cached["screenshot"]
+                        # 报告水印使用缓存记录的原始截图时间
+                        captured_at.setdefault(entity, {})[keyword] = cached["captured_at"]
+                        self._emit(on_event, VerifyEvent.url_done(entity, search_url, cached["screenshot"]))
+                        continue
+
+                    if not browser_started:
+                        # 首次需要访问网页时才初始化浏览器引擎；初始化失败直接结束查询，不为每个关键词重复启动
+                        browser_started = True
+                        await self.browser_engine.initialize()
+
+                    started = time.monotonic()
+                    try:
+                        # 使用浏览器引擎进行搜索和截图
+                        navigated = await self.browser_engine.navigate(search_url)
+                        await self.browser_engine.screenshot(str(screenshot_path))
+                        entity_results[keyword] = str(screenshot_path)
+                        # 导航失败时截到的是错误页面，不缓存
+                        if navigated and screenshot_path.exists():
+                            cache.put(cache_scope, entity, str(screenshot_path))
+                        self._emit(on_event, VerifyEvent.url_done(
+                            entity, search_url, str(screenshot_path), elapsed=time.monotonic() - started
+                        ))
+                    except Exception as e:
+                        entity_results[keyword] = str(e)
+                        self._emit(on_event, VerifyEvent.url_done(entity, search_url, "", elapsed=time.monotonic() - started))
+
+                results[entity] = entity_results
+                self._emit(on_event, VerifyEvent.entity_done(entity, entity_results))
+        finally:
+            cache.save()
+
+            # 关闭浏览器引擎（初始化失败时也释放已启动的 Playwright）
+            if browser_started:
+                await self.browser_engine.close()
+
+        return results, captured_at
+
+    @staticmethod
+    def _emit(on_event: Optional[Callable[[VerifyEvent], None]], event: VerifyEvent) -> None:
+        """调用查询事件回调，回调异常不影响查询"""
+        if on_event is None:
+            return
+        try:
+            on_event(event)
+        except Exception as e:
+            logger.error(f"查询事件回调执行失败: {e}")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+人工截图清单模块
+引导式截图时为每张截图记录 (主体, 章节)，插入报告时按清单精确定位，不再依赖文件排序
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from everify.core.utils import logger
+
+# 清单文件保存在截图目录中（非图片格式，不会被当作截图扫描）
+MANIFEST_FILENAME = "everify_captures.json"
+
+
+class CaptureManifest:
+    """人工截图清单
+
+    以截图文件名为键记录主体、章节、模板和 URL。同一 (主体, 章节) 重新截图时以最后一张为准。
+    截图文件已被删除或被替换（修改时间与记录不符）的记录在读取和查找时丢弃，下次写回清单时随之清除。
+    """
+
+    def __init__(self, path: Path):
+        """初始化截图清单
+
+        Args:
+            path: 清单文件路径
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, screenshot_dir: Path) -> "CaptureManifest":
+        """读取截图目录中的清单，不存在或无法读取时返回空清单
+
+        Args:
+            screenshot_dir: 截图文件夹路径
+
+        Returns:
+            CaptureManifest: 截图清单
+        """
+        manifest = cls(screenshot_dir / MANIFEST_FILENAME)
+        if not manifest.path.exists():
+            return manifest
+
+        try:
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                manifest.entries = json.load(f).get("captures", {})
+        except Exception as e:
+            logger.warning(f"读取截图清单失败，将按文件顺序分配截图: {e}")
+        manifest.prune()
+        return manifest
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, screenshot: Path, entity: str, chapter: str, template: Optional[str] = None,
+            url: Optional[str] = None, modified_at: Optional[float] = None) -> None:
+        """记录一张截图并立即写回清单文件（同时清除失效的记录）
+
+        Args:
+            screenshot: 截图路径（位于截图目录中）
+            entity: 主体名称
+            chapter: 报告章节标题
+            template: 模板名称
+            url: 截图的网页地址
+            modified_at: 截图文件的修改时间（未提供时读取已存在的截图文件）
+        """
+        self.prune()
+        if modified_at is None and screenshot.exists():
+            modified_at = screenshot.stat().st_mtime
+        self.entries[screenshot.name] = {
+            "entity": entity,
+            "chapter": chapter,
+            "template": template,
+            "url": url,
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+            "modified_at": modified_at
+        }
+        self.save()
+
+    def prune(self) -> int:
+        """丢弃截图文件已不存在或已被替换的记录（只修改内存中的清单）
+
+        Returns:
+            int: 丢弃的记录数
+        """
+        stale = []
+        for filename, entry in self.entries.items():
+            try:
+                modified_at = (self.path.parent / filename).stat().st_mtime
+            except OSError:
+                stale.append(filename)
+                continue
+            # 旧版清单没有记录修改时间，只按文件是否存在判断
+            if entry.get("modified_at") is not None and entry["modified_at"] != modified_at:
+                stale.append(filename)
+
+        for filename in stale:
+            del self.entries[filename]
+        if stale:
+            logger.debug(f"截图清单丢弃 {len(stale)} 条失效记录")
+        return len(stale)
+
+    def lookup(self) -> Dict[str, Dict[str, Path]]:
+        """按 (主体, 章节) 查找截图，只包含仍然存在且未被替换的文件
+
+        Returns:
+            dict: {主体名称: {章节标题: 截图路径}}
+        """
+        self.prune()
+        tagged: Dict[str, Dict[str, Path]] = {}
+        # 按截图时间排序，同一位置重新截图时后面的覆盖前面的
+        for filename, entry in sorted(self.entries.items(), key=lambda item: item[1].get("captured_at", "")):
+            tagged.setdefault(entry["entity"], {})[entry["chapter"]] = self.path.parent / filename
+        return tagged
+
+    def save(self) -> None:
+        """将清单写回磁盘（原子替换）"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"captures": self.entries}, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"保存截图清单失败: {e}")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+引导式人工截图模块
+打开有界面的浏览器，按顺序展示人工核查网页并在后台标签页预先加载后续网页；操作员按快捷键或页面上的按钮截图，
+截图以 (主体, 章节) 命名并记录到截图清单，插入报告时按清单精确定位
+"""
+import asyncio
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from everify.common.file import clean_filename
+from everify.core.base.browser import _launch_chromium
+from everify.core.services.capture_manifest import CaptureManifest
+from everify.core.services.report_generator import MANUAL_CHAPTERS
+from everify.core.services.url_generator import URLGenerator
+from everify.core.services.verify_service import VerifyEvent
+from everify.core.utils import logger
+
+# 注入每个页面的操作条：显示当前主体和网页，提供截图、跳过按钮和快捷键
+_OVERLAY_SCRIPT = """
+(() => {
+    if (window.top !== window || window.__everifyOverlayInstalled) {
+        return;
+    }
+    window.__everifyOverlayInstalled = true;
+    const captureKey = __CAPTURE_KEY__;
+    const skipKey = __SKIP_KEY__;
+
+    document.addEventListener("keydown", (event) => {
+        if (event.key === captureKey) {
+            event.preventDefault();
+            window.everifyCommand("capture");
+        } else if (event.key === skipKey) {
+            event.preventDefault();
+            window.everifyCommand("skip");
+        }
+    }, true);
+
+    function button(text, action) {
+        const element = document.createElement("button");
+        element.textContent = text;
+        element.style.cssText = "margin-left:8px;padding:4px 10px;border:0;border-radius:4px;cursor:pointer;";
+        element.addEventListener("click", () => window.everifyCommand(action));
+        return element;
+    }
+
+    function mount() {
+        const bar = document.createElement("div");
+        bar.style.cssText = "position:fixed;right:16px;bottom:16px;z-index:2147483647;display:flex;align-items:center;"
+            + "padding:8px 12px;border-radius:6px;background:rgba(0,0,0,0.75);color:#fff;font:13px sans-serif;";
+        const label = document.createElement("span");
+        window.everifyLabel().then((text) => { label.textContent = text; });
+        bar.append(label, button(`截图 (${captureKey})`, "capture"), button(`跳过 (${skipKey})`, "skip"));
+        document.documentElement.appendChild(bar);
+        window.__everifyOverlay = bar;
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", mount);
+    } else {
+        mount();
+    }
+})();
+"""
+
+# 截图时隐藏 / 恢复操作条
+_TOGGLE_OVERLAY_SCRIPT = "(visible) => { if (window.__everifyOverlay) window.__everifyOverlay.style.display = visible ? 'flex' : 'none'; }"
+
+
+class GuidedCaptureSession:
+    """引导式人工截图会话
+
+    网页按章节顺序排列（网页1主体1 → 网页1主体2 → ...，与人工核查顺序一致），当前网页之后的
+    preload_tabs - 1 个网页在后台标签页中提前加载，截图或跳过后直接切换到已加载好的下一页。
+    关闭标签页视为跳过，关闭浏览器结束会话。
+    """
+
+    def __init__(
+        self,
+        items: List[Dict[str, str]],
+        screenshot_dir: Path,
+        browser_config: Any,
+        capture_config: Any,
+        on_capture: Optional[Callable[[VerifyEvent], None]] = None
+    ):
+        """初始化会话
+
+        Args:
+            items: 待截图的网页 [{'entity', 'template', 'chapter', 'url'}, ...]
+            screenshot_dir: 截图保存目录
+            browser_config: 浏览器配置（BrowserConfig），会话始终使用有界面模式
+            capture_config: 引导式截图配置（GuidedCaptureConfig）
+            on_capture: 截图事件回调，每截图或跳过一个网页时以 VerifyEvent.url_done 调用
+        """
+        self.items = items
+        self.screenshot_dir = screenshot_dir
+        self.browser_config = browser_config
+        self.config = capture_config
+        self.on_capture = on_capture
+        self.manifest = CaptureManifest.load(screenshot_dir)
+        self.captured = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_templates(
+        cls,
+        entities: List[str],
+        templates: Dict[str, Any],
+        screenshot_dir: Path,
+        app_config: Any,
+        on_capture: Optional[Callable[[VerifyEvent], None]] = None
+    ) -> "GuidedCaptureSession":
+        """根据主体和人工核查模板创建会话
+
+        Args:
+            entities: 主体列表
+            templates: 核查模板字典（只使用人工核查模板）
+            screenshot_dir: 截图保存目录
+            app_config: 应用程序配置
+            on_capture: 截图事件回调
+
+        Returns:
+            GuidedCaptureSession: 会话
+        """
+        items = []
+        for item in URLGenerator.generate_manual_verify_urls(entities, templates):
+            item['chapter'] = templates[item['template']].InsertContext
+            items.append(item)
+
+        # 按报告章节顺序、再按主体输入顺序排列
+        chapter_order = {chapter: index for index, chapter in enumerate(MANUAL_CHAPTERS)}
+        entity_order = {entity: index for index, entity in reversed(list(enumerate(entities)))}
+        items.sort(key=lambda item: (chapter_order.get(item['chapter'], len(chapter_order)), entity_order[item['entity']]))
+
+        return cls(items, screenshot_dir, app_config.browser, app_config.guided_capture, on_capture)
+
+    async def run(self, stop_event: Optional[threading.Event] = None) -> Dict[str, int]:
+        """运行会话，直到全部网页处理完、浏览器被关闭或 stop_event 被设置
+
+        Args:
+            stop_event: 结束会话的标志（可选）
+
+        Returns:
+            dict: {'total': 网页数, 'captured': 截图数, 'skipped': 跳过数}
+        """
+        from playwright.async_api import async_playwright
+
+        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+        commands: asyncio.Queue = asyncio.Queue()
+        pages: Dict[int, Any] = {}
+        page_items: Dict[Any, int] = {}
+        done = set()
+
+        playwright = await async_playwright().start()
+        browser = None
+        try:
+            browser = await _launch_chromium(playwright, self.browser_config.model_copy(update={"headless": False}))
+            browser.on("disconnected", lambda *_: commands.put_nowait(("quit", None)))
+
+            context_options = {}
+            if self.browser_config.viewport:
+                width, height = map(int, self.browser_config.viewport.split("x"))
+                context_options["viewport"] = {"width": width, "height": height}
+            context = await browser.new_context(**context_options)
+            await context.expose_binding("everifyCommand", lambda source, action: commands.put_nowait((action, source["page"])))
+            await context.expose_binding("everifyLabel", lambda source: self._label(page_items.get(source["page"])))
+            await context.add_init_script(
+                script=_OVERLAY_SCRIPT
+                .replace("__CAPTURE_KEY__", json.dumps(self.config.capture_key))
+                .replace("__SKIP_KEY__", json.dumps(self.config.skip_key))
+            )
+
+            async def open_tab(index: int) -> None:
+                page = await context.new_page()
+                pages[index] = page
+                page_items[page] = index
+                page.on("close", lambda *_: commands.put_nowait(("closed", page)))
+                # 后台加载，不等待页面完成
+                asyncio.create_task(self._load(page, self.items[index]['url']))
+
+            logger.info(
+                f"共 {len(self.items)} 个人工核查网页，按 {self.config.capture_key} 截图，"
+                f"按 {self.config.skip_key} 跳过，关闭浏览器结束"
+            )
+            while True:
+                pending = [index for index in range(len(self.items)) if index not in done]
+                if not pending:
+                    break
+
+                # 当前网页及其后若干网页保持打开
+                for index in pending[:max(1, self.config.preload_tabs)]:
+                    if index not in pages:
+                        await open_tab(index)
+                await pages[pending[0]].bring_to_front()
+
+                action, page = await self._next_command(commands, stop_event)
+                if action == "quit":
+                    break
+
+                index = page_items.get(page)
+                if index is None or index in done:
+                    continue
+
+                if action == "capture":
+                    if not await self._capture(page, self.items[index]):
+                        continue
+                else:
+                    # 跳过或手动关闭标签页
+                    self.skipped += 1
+                    self._notify(self.items[index], "")
+
+                done.add(index)
+                del pages[index]
+                del page_items[page]
+                if action != "closed" and not page.is_closed():
+                    await page.close()
+        finally:
+            if browser is not None and browser.is_connected():
+                await browser.close()
+            await playwright.stop()
+
+        logger.info(f"引导式截图结束：截图 {self.captured} 个，跳过 {self.skipped} 个，共 {len(self.items)} 个网页")
+        return {'total': len(self.items), 'captured': self.captured, 'skipped': self.skipped}
+
+    async def _next_command(self, commands: asyncio.Queue, stop_event: Optional[threading.Event]) -> tuple:
+        """等待操作员的下一个操作，同时响应 stop_event"""
+        while True:
+            try:
+                return await asyncio.wait_for(commands.get(), timeout=0.5)
+            except asyncio.TimeoutError:
+                if stop_event is not None and stop_event.is_set():
+                    return "quit", None
+
+    async def _load(self, page: Any, url: str) -> None:
+        """在标签页中加载网页（失败时保留页面，操作员可以手动刷新）"""
+        try:
+            await page.goto(url, timeout=self.browser_config.timeout, wait_until="domcontentloaded")
+        except Exception as e:
+            logger.warning(f"加载人工核查网页失败: {url}: {e}")
+
+    async def _capture(self, page: Any, item: Dict[str, str]) -> bool:
+        """截取页面，保存截图并记录到截图清单
+
+        Args:
+            page: 页面
+            item: 网页信息
+
+        Returns:
+            bool: 是否截图成功
+        """
+        try:
+            await page.evaluate(_TOGGLE_OVERLAY_SCRIPT, False)
+            try:
+                data = await page.screenshot(full_page=self.config.full_page)
+            finally:
+                await page.evaluate(_TOGGLE_OVERLAY_SCRIPT, True)
+        except Exception as e:
+            logger.error(f"截图失败: {item['url']}: {e}")
+            return False
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        screenshot = self.screenshot_dir / f"{timestamp}_{clean_filename(item['entity'])}_{item['template']}.png"
+        # 先记录清单再将文件改名为截图，监视模式看到文件时已能精确定位；临时文件不是图片格式，不会被提前扫描
+        tmp_path = screenshot.with_suffix(".part")
+        tmp_path.write_bytes(data)
+        # 改名不改变修改时间，清单据此识别之后被替换的截图
+        self.manifest.add(
+            screenshot, item['entity'], item['chapter'], item['template'], item['url'],
+            modified_at=tmp_path.stat().st_mtime
+        )
+        tmp_path.replace(screenshot)
+
+        self.captured += 1
+        logger.info(f"已截图: {item['entity']} - {item['chapter']} → {screenshot.name}")
+        self._notify(item, str(screenshot))
+        return True
+
+    def _label(self, index: Optional[int]) -> str:
+        """操作条上显示的文字"""
+        if index is None:
+            return "非核查页面"
+        item = self.items[index]
+        return f"[{index + 1}/{len(self.items)}] {item['entity']} · {item['chapter']}"
+
+    def _notify(self, item: Dict[str, str], screenshot: str) -> None:
+        """调用截图事件回调"""
+        if self.on_capture is None:
+            return
+        try:
+            self.on_capture(VerifyEvent.url_done(item['entity'], item['url'], screenshot, item['template']))
+        except Exception as e:
+            logger.error(f"截图事件回调执行失败: {e}")
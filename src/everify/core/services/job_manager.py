@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+后台任务管理模块
+网页端提交的核查任务在有界线程池中后台执行，请求立即返回任务 ID，
+任务状态、进度和结果持久化到 output_dir/jobs，服务重启或会话结束后仍可查询；
+任务事件保存在内存中，供 SSE 接口实时推送
+"""
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from everify.core.operations.base_operation import OperationResult
+from everify.core.services.verify_service import VerifyEvent
+from everify.core.utils import logger
+
+# 进度变化时最多每秒写一次任务文件，状态变化时立即写入
+PROGRESS_SAVE_INTERVAL = 1.0
+# 每个任务在内存中保留的最近事件数，断线重连时从中补发
+MAX_JOB_EVENTS = 2000
+# 已结束的任务在内存中保留的时间（秒）和数量上限，超出后只保留任务文件，查询时从文件读取
+FINISHED_JOB_TTL = 600
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    """后台任务"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    # 任务文件记录为未结束，但执行它的进程已经退出
+    INTERRUPTED = "interrupted"
+
+    FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED, INTERRUPTED)
+
+    def __init__(self, job_id: str, kind: str, params: Optional[Dict[str, Any]] = None):
+        """初始化任务
+
+        Args:
+            job_id: 任务 ID
+            kind: 任务类型（verify / bribery_verify / manual_verify / manual_capture）
+            params: 任务参数（仅用于展示）
+        """
+        self.id = job_id
+        self.kind = kind
+        self.params = params or {}
+        self.status = self.PENDING
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Dict[str, int] = {
+            'entities_total': 0,
+            'entities_done': 0,
+            'urls_done': 0,
+            'urls_failed': 0,
+            'reports_done': 0
+        }
+        self.result: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        # 事件日志 [(序号, 事件数据)]，序号用作 SSE 的事件 ID
+        self._events: deque = deque(maxlen=MAX_JOB_EVENTS)
+        self._event_seq = 0
+        self._condition = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in self.FINISHED_STATUSES
+
+    def on_event(self, event: VerifyEvent) -> None:
+        """根据核查事件更新进度，并记录到事件日志
+
+        Args:
+            event: 核查事件
+        """
+        with self._condition:
+            if event.type == VerifyEvent.URL_DONE:
+                self.progress['urls_done'] += 1
+                if not event.result:
+                    self.progress['urls_failed'] += 1
+            elif event.type == VerifyEvent.REPORT_READY:
+                self.progress['reports_done'] += 1
+            else:
+                self.progress['entities_done'] += 1
+
+            data = event.to_dict()
+            data['progress'] = dict(self.progress)
+            self._publish(data)
+
+    def set_status(self, status: str) -> None:
+        """更新任务状态，并记录状态事件
+
+        Args:
+            status: 新状态
+        """
+        with self._condition:
+            self.status = status
+            if status == self.RUNNING:
+                self.started_at = time.time()
+            elif status in self.FINISHED_STATUSES:
+                self.finished_at = time.time()
+            self._publish({
+                'type': 'status',
+                'status': status,
+                'progress': dict(self.progress),
+                'error': self.error
+            })
+
+    def events_since(self, last_seq: int, timeout: Optional[float] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """取出序号大于 last_seq 的事件，没有新事件时最多等待 timeout 秒
+
+        Args:
+            last_seq: 已收到的最后一个事件序号
+            timeout: 等待时间（秒）
+
+        Returns:
+            list: [(序号, 事件数据)]，任务已结束且没有新事件时返回空列表
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._event_seq > last_seq or self.finished, timeout)
+            return [(seq, data) for seq, data in self._events if seq > last_seq]
+
+    def _publish(self, data: Dict[str, Any]) -> None:
+        """追加事件并唤醒等待中的订阅者（调用方持有 _condition）"""
+        self._event_seq += 1
+        self._events.append((self._event_seq, data))
+        self._condition.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        def iso(timestamp: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'params': self.params,
+            'status': self.status,
+            'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at),
+            'progress': dict(self.progress),
+            'result': self.result,
+            'error': self.error
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        def timestamp(value: Optional[str]) -> Optional[float]:
+            return datetime.fromisoformat(value).timestamp() if value else None
+
+        job = cls(data['id'], data.get('kind', ''), data.get('params'))
+        job.status = data.get('status', cls.INTERRUPTED)
+        job.created_at = timestamp(data.get('created_at')) or 0
+        job.started_at = timestamp(data.get('started_at'))
+        job.finished_at = timestamp(data.get('finished_at'))
+        job.progress.update(data.get('progress') or {})
+        job.result = data.get('result') or {}
+        job.error = data.get('error')
+        return job
+
+
+# 任务执行函数：接收任务对象（用于上报进度和检查取消），返回操作结果
+JobRunner = Callable[[Job], OperationResult]
+
+
+class JobManager:
+    """后台任务管理器
+
+    任务在有界线程池中执行，超出并发数的任务排队等待。取消排队中的任务会直接移除；
+    运行中的任务通过 cancel_event 协作取消，操作在下一个核查事件时停止并保留已完成的结果。
+    已结束的任务只在内存中保留一段时间（FINISHED_JOB_TTL、MAX_FINISHED_JOBS），之后查询时从任务文件读取。
+
+    需要操作员全程参与的交互式任务（引导式截图）在单独的单线程池中执行，不占用核查任务的并发名额，
+    也不会被排在核查任务之后。
+    """
+
+    def __init__(self, app_config: Any, max_workers: Optional[int] = None):
+        """初始化任务管理器
+
+        Args:
+            app_config: 应用程序配置
+            max_workers: 同时运行的任务数（默认取配置 job_workers）
+        """
+        self.jobs_dir: Path = app_config.output_dir / "jobs"
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers or app_config.job_workers),
+            thread_name_prefix="everify-job"
+        )
+        self._interactive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="everify-interactive")
+        self._jobs: Dict[str, Job] = {}
+        self._futures: Dict[str, Future] = {}
+        self._saved_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, runner: JobRunner, params: Optional[Dict[str, Any]] = None,
+               entities_total: int = 0, interactive: bool = False) -> Job:
+        """提交后台任务
+
+        Args:
+            kind: 任务类型
+            runner: 任务执行函数
+            params: 任务参数（仅用于展示）
+            entities_total: 任务涉及的主体数（用于计算进度）
+            interactive: 是否为交互式任务（在单独的线程池中执行）
+
+        Returns:
+            Job: 已排队的任务
+        """
+        job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        job = Job(job_id, kind, params)
+        job.progress['entities_total'] = entities_total
+
+        self._save(job)
+        with self._lock:
+            self._prune_finished()
+            self._jobs[job.id] = job
+            # 在锁内登记 future：任务结束时 _finish 同样在锁内移除，不会早于登记执行
+            executor = self._interactive_executor if interactive else self._executor
+            self._futures[job.id] = executor.submit(self._run, job, runner)
+        logger.info(f"已提交后台任务 {job.id}（{kind}）")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """查询任务，本进程中没有时从任务文件读取
+
+        Args:
+            job_id: 任务 ID
+
+        Returns:
+            Optional[Job]: 任务，不存在时返回 None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        path = self._job_path(job_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                job = Job.from_dict(json.load(f))
+        except Exception as e:
+            logger.error(f"读取任务文件失败: {e}")
+            return None
+
+        # 文件中未结束的任务属于已退出的进程，不会再继续执行
+        if not job.finished:
+            job.status = Job.INTERRUPTED
+        return job
+
+    def active(self, kind: str) -> List[Job]:
+        """查询指定类型的未结束任务
+
+        Args:
+            kind: 任务类型
+
+        Returns:
+            list: 排队中或运行中的任务
+        """
+        with self._lock:
+            return [job for job in self._jobs.values() if job.kind == kind and not job.finished]
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """取消任务
+
+        Args:
+            job_id: 任务 ID
+
+        Returns:
+            Optional[Job]: 任务，不存在时返回 None
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return self.get(job_id)
+        if job.finished:
+            return job
+
+        job.cancel_event.set()
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            # 尚未开始执行，直接结束
+            self._finish(job, Job.CANCELLED)
+        else:
+            logger.info(f"正在取消后台任务 {job.id}")
+        return job
+
+    def report_progress(self, job: Job, event: VerifyEvent) -> None:
+        """更新任务进度（供操作的核查事件回调使用）
+
+        Args:
+            job: 任务
+            event: 核查事件
+        """
+        job.on_event(event)
+        with self._lock:
+            saved_at = self._saved_at.get(job.id, 0)
+        if time.monotonic() - saved_at >= PROGRESS_SAVE_INTERVAL:
+            self._save(job)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """关闭任务管理器，取消排队中的任务
+
+        Args:
+            wait: 是否等待运行中的任务结束
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not job.finished:
+                self.cancel(job.id)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._interactive_executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, runner: JobRunner) -> None:
+        """在线程池中执行任务"""
+        if job.cancel_event.is_set():
+            return
+
+        job.set_status(Job.RUNNING)
+        self._save(job)
+
+        try:
+            result = runner(job)
+        except Exception as e:
+            logger.error(f"后台任务 {job.id} 执行失败: {e}")
+            job.error = str(e)
+            self._finish(job, Job.FAILED)
+            return
+
+        job.result = result.data
+        if job.cancel_event.is_set():
+            self._finish(job, Job.CANCELLED)
+        elif result.success:
+            self._finish(job, Job.SUCCEEDED)
+        else:
+            job.error = result.error
+            self._finish(job, Job.FAILED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        """记录任务结束状态"""
+        job.set_status(status)
+        self._save(job)
+        with self._lock:
+            self._futures.pop(job.id, None)
+            self._prune_finished()
+        logger.info(f"后台任务 {job.id} 已结束: {status}")
+
+    def _prune_finished(self) -> None:
+        """从内存中移除结束超过 FINISHED_JOB_TTL 秒或超出 MAX_FINISHED_JOBS 个的已结束任务（调用方持有 _lock）"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda job: job.finished_at or 0
+        )
+        expire_before = time.time() - FINISHED_JOB_TTL
+        excess = len(finished) - MAX_FINISHED_JOBS
+        for index, job in enumerate(finished):
+            if index >= excess and (job.finished_at or 0) >= expire_before:
+                break
+            del self._jobs[job.id]
+            self._saved_at.pop(job.id, None)
+
+    def _save(self, job: Job) -> None:
+        """将任务状态写入任务文件（原子替换）"""
+        try:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            path = self._job_path(job.id)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(job.to_dict(), f, ensure_ascii=False, default=str)
+            tmp_path.replace(path)
+            with self._lock:
+                self._saved_at[job.id] = time.monotonic()
+        except Exception as e:
+            logger.warning(f"保存任务状态失败: {e}")
+
+    def _job_path(self, job_id: str) -> Path:
+        # 任务 ID 来自请求路径，只取文件名部分，避免访问任务目录之外的文件
+        return self.jobs_dir / f"{Path(job_id).name}.json"
@@ -3,12 +3,252 @@
 报告生成服务模块
 负责生成Word报告
 """
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 from everify.core.utils import logger
-from everify.core.base.document import DocumentEngine, DocxDocumentEngine
-from everify.core.base.image import ImageEngine, PillowImageEngine
-from everify.core.utils.config import VerifyTemplate, WatermarkConfig
+from everify.core.base.document import DocumentEngine, DocxDocumentEngine, StreamingDocxDocumentEngine
+from everify.core.base.image import ImageEngine, PillowImageEngine, WatermarkJob
+from everify.core.services.capture_manifest import CaptureManifest
+from everify.core.services.url_generator import TemplatePrefixIndex
+from everify.core.utils.config import VerifyTemplate, WatermarkConfig, EmbedProfileConfig
+
+# 每批并行加水印的主体数（限制同时驻留内存的水印图片数量）
+WATERMARK_BATCH_ENTITIES = 16
+
+# 可以自动化核查的网页（报告章节标题）
+AUTOMATED_CHAPTERS = [
+    "百度（https://www.baidu.com/s）",
+    "中华人民共和国生态环境部网站（https://www.mee.gov.cn）",
+    "中华人民共和国商务部网站（https://search.mofcom.gov.cn）",
+    "国家外汇管理局网站（http://www.safe.gov.cn）",
+    "中国人民银行网站（https://wzdig.pbc.gov.cn）",
+    "国家金融监督管理总局（https://www.nfra.gov.cn/cn/view/pages/index/jiansuo.html）",
+    "中国盐业协会（https://www.cnsalt.cn）",
+    "国家统计局网站（https://www.stats.gov.cn）",
+    "国家能源局网站（https://www.nea.gov.cn）",
+    "国家市场监督管理总局（https://www.samr.gov.cn）",
+    "国家农业农村部网站（https://www.moa.gov.cn）",
+    "中华人民共和国住房和城乡建设部（https://www.mohurd.gov.cn）",
+    "全国建筑市场监管公共服务平台（https://jzsc.mohurd.gov.cn）",
+    "中华人民共和国人力资源和社会保障部网站（https://www.mohrss.gov.cn/hsearch/）",
+    "中国电力企业联合会网站（https://cec.org.cn）",
+    "国家药品监督管理局（https://www.nmpa.gov.cn）"
+]
+
+# 需要人工核查的网页（报告章节标题）
+MANUAL_CHAPTERS = [
+    "国家企业信用信息公示系统（http://www.gsxt.gov.cn/index.html）",
+    "国家税务总局重大税收违法案件信息公布栏（https://www.chinatax.gov.cn）",
+    "信用中国网（http://www.creditchina.gov.cn）",
+    "中国裁判文书网（http://wenshu.court.gov.cn）",
+    "中华人民共和国国家发展和改革委员会网站（http://www.ndrc.gov.cn）",
+    "中国执行信息公开网（http://zxgk.court.gov.cn/shixin/）",
+    "中华人民共和国应急管理部网站（http://www.mem.gov.cn）",
+    "中华人民共和国工业和信息化部网站（http://www.miit.gov.cn）",
+    "中国商务信用平台（http://www.bcpcn.com）",
+    "全国行业信用公共服务平台（http://www.bcp12312.org.cn）",
+    "中国证券监督管理委员会网站（http://www.csrc.gov.cn）",
+    "证券期货市场失信记录查询平台（http://neris.csrc.gov.cn/shixinchaxun/）",
+    "中华人民共和国自然资源部（http://www.mnr.gov.cn/）",
+    "国家财政部网站（http://www.mof.gov.cn/index.htm）",
+    "中国海关企业进出口信用信息公示平台（http://credit.customs.gov.cn）",
+    "全国资源公共交易平台（http://www.ggzy.gov.cn）",
+    "中华人民共和国海关总署（http://www.customs.gov.cn/）",
+    "中华人民共和国交通运输部网站（https://www.mot.gov.cn/）",
+    "政府采购严重违法失信行为信息记录（http://www.ccgp.gov.cn/cr/list）",
+    "信用能源（https://xyny.nea.gov.cn）",
+    "被执行人信息查询（https://zxgk.court.gov.cn/zhzxgk/）"
+]
+
+# 人工核查截图支持的图片格式
+MANUAL_SCREENSHOT_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def scan_manual_screenshots(screenshot_dir: Path) -> List[Path]:
+    """扫描一次截图目录，取出全部人工核查截图并按文件名（截图时间）排序
+
+    扩展名不区分大小写（与 Windows 下原先逐个 glob 的结果一致，Linux/macOS 下也能识别 .PNG 等），
+    并排除以 "." 开头的隐藏文件（如 macOS 的 ._xxx.png），避免它们打乱按顺序分配的位置。
+
+    Args:
+        screenshot_dir: 截图文件夹路径
+
+    Returns:
+        list: 截图路径列表
+    """
+    import os
+
+    if not screenshot_dir.is_dir():
+        return []
+    with os.scandir(screenshot_dir) as entries:
+        screenshots = [
+            Path(entry.path) for entry in entries
+            if not entry.name.startswith(".")
+            and os.path.splitext(entry.name)[1].lower() in MANUAL_SCREENSHOT_SUFFIXES
+            and entry.is_file()
+        ]
+    screenshots.sort(key=lambda path: path.name)
+    return screenshots
+
+
+def map_manual_screenshots(
+    screenshots: List[Path],
+    all_entities: List[str],
+    manifest: Optional[CaptureManifest] = None
+) -> Dict[str, List[Optional[Path]]]:
+    """将排好序的截图分配到 (章节, 主体)
+
+    截图清单中记录过的截图（引导式截图）按记录的主体和章节精确定位；其余截图按顺序依次填入
+    清单没有占用的位置：网页1主体1 → 网页1主体2 → ... → 网页2主体1 → ...。没有清单时即第 i 张截图属于
+    第 i // 主体数 个章节、第 i % 主体数 个主体。
+
+    Args:
+        screenshots: 按文件名排序的截图路径列表
+        all_entities: 所有需要核查的主体列表（保持原始输入顺序）
+        manifest: 截图清单（可选）
+
+    Returns:
+        dict: {主体名称: 与 MANUAL_CHAPTERS 一一对应的截图路径（没有截图的章节为 None）}
+    """
+    tagged: Dict[str, Dict[str, Path]] = {}
+    if manifest:
+        tagged = manifest.lookup()
+        screenshots = [screenshot for screenshot in screenshots if screenshot.name not in manifest]
+
+    # 重复的主体名称与原有逻辑一致，使用第一次出现的位置（后面出现的位置仍占用一张截图）
+    first_index: Dict[str, int] = {}
+    for entity_index, entity in enumerate(all_entities):
+        first_index.setdefault(entity, entity_index)
+    mapping: Dict[str, List[Optional[Path]]] = {entity: [None] * len(MANUAL_CHAPTERS) for entity in first_index}
+
+    untagged = iter(screenshots)
+    for chapter_index, chapter_title in enumerate(MANUAL_CHAPTERS):
+        for entity_index, entity in enumerate(all_entities):
+            tagged_screenshot = tagged.get(entity, {}).get(chapter_title)
+            if tagged_screenshot is not None:
+                # 清单已定位的位置不占用按顺序分配的截图
+                if first_index[entity] == entity_index:
+                    mapping[entity][chapter_index] = tagged_screenshot
+                continue
+            screenshot = next(untagged, None)
+            if first_index[entity] == entity_index:
+                mapping[entity][chapter_index] = screenshot
+    return mapping
+
+
+def _insert_manual_screenshots_job(entity: str, report_path: Path, chapter_files: List[Optional[Path]]) -> bool:
+    """进程池中为单个报告插入人工核查截图"""
+    return ReportGenerator._insert_manual_screenshot_files(entity, report_path, chapter_files)
+
+
+def _generate_report_job(
+    config: Any,
+    templates: Optional[Dict[str, VerifyTemplate]],
+    skeleton: bytes,
+    entity: str,
+    entity_results: Dict[str, Union[str, bytes]],
+    output_dir: Path
+) -> Path:
+    """进程池中为单个主体生成报告（每个进程使用自己的文档引擎和图片引擎）"""
+    generator = ReportGenerator(config)
+    generator._skeleton = skeleton
+    return generator._generate_single_report(entity, entity_results, output_dir, templates)
+
+
+class ReportPipeline:
+    """流水线报告阶段 - 主体核查完成后立即交给后台 worker 生成报告，与浏览器核查并行
+
+    report_workers 大于 1 时使用进程池，否则使用一个后台线程逐个生成（截图在该线程中逐个加水印）。
+    """
+
+    def __init__(
+        self,
+        generator: "ReportGenerator",
+        output_dir: Path,
+        workers: int,
+        on_report: Optional[Callable[[Any], None]] = None,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
+    ):
+        """初始化报告流水线
+
+        Args:
+            generator: 报告生成器（已准备好报告骨架）
+            output_dir: 报告输出目录
+            workers: 后台进程数，1 表示使用单个后台线程
+            on_report: 报告生成事件回调，每个主体的报告完成（或失败）时以 VerifyEvent 调用
+            templates: 本次运行的核查模板字典
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        self.generator = generator
+        self.output_dir = output_dir
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else ThreadPoolExecutor(max_workers=1)
+        self._futures: Dict[str, Any] = {}
+        self.on_report = on_report
+        self.templates = templates
+
+    def submit(self, entity: str, entity_results: Dict[str, Union[str, bytes]]) -> None:
+        """提交一个已完成核查的主体（不阻塞调用方）
+
+        Args:
+            entity: 主体名称
+            entity_results: 主体的核查结果 {URL: 截图路径或截图字节}
+        """
+        generator = self.generator
+        if self.workers > 1:
+            future = self._executor.submit(
+                _generate_report_job,
+                generator.config,
+                self.templates,
+                generator._skeleton,
+                entity,
+                entity_results,
+                self.output_dir
+            )
+        else:
+            future = self._executor.submit(
+                generator._generate_watermarked_report, entity, entity_results, self.output_dir, self.templates
+            )
+        self._futures[entity] = future
+        if self.on_report is not None:
+            future.add_done_callback(lambda done: self._notify(entity, done))
+        logger.debug(f"主体 '{entity}' 已提交报告生成")
+
+    def _notify(self, entity: str, future: Any) -> None:
+        """报告生成完成时发出 report_ready 事件（在 worker 线程中调用）"""
+        from everify.core.services.verify_service import VerifyEvent
+
+        report_path = None if future.cancelled() or future.exception() else future.result()
+        try:
+            self.on_report(VerifyEvent.report_ready(entity, report_path))
+        except Exception as e:
+            logger.error(f"报告生成事件回调执行失败: {e}")
+
+    def finish(self) -> Dict[str, Path]:
+        """等待所有已提交的报告生成完成
+
+        Returns:
+            dict: {主体名称: 报告文件路径}，失败的主体不包含在内
+        """
+        report_paths = {}
+        try:
+            for entity, future in self._futures.items():
+                try:
+                    report_paths[entity] = future.result()
+                    logger.info(f"主体 '{entity}' 报告生成成功: {report_paths[entity]}")
+                except Exception as e:
+                    logger.error(f"主体 '{entity}' 报告生成失败: {e}")
+        finally:
+            self._executor.shutdown(wait=True)
+
+        # 检查是否生成了报告
+        if report_paths:
+            logger.info(f"报告生成成功，共生成 {len(report_paths)} 个报告")
+        else:
+            logger.warning("未能生成任何有效报告")
+
+        return report_paths
 
 
 class ReportGenerator:
@@ -23,39 +263,52 @@ class ReportGenerator:
         self.config = config
         self.document_engine: DocumentEngine = DocxDocumentEngine()
         self.image_engine: ImageEngine = PillowImageEngine()
-        self.templates: Optional[Dict[str, VerifyTemplate]] = None
+        # 预先批量生成的水印图片 {(主体名称, URL或关键词): 带水印的图片路径或字节}
+        self._watermarked: Dict[Tuple[str, str], Union[Path, bytes]] = {}
+        # 本次运行的报告骨架（标题和全部章节已排版好的文档字节）
+        self._skeleton: Optional[bytes] = None
 
     def generate_report(
         self,
         results: Dict[str, Dict[str, str]],
         output_path: Optional[Path] = None,
-        templates: Optional[Dict[str, VerifyTemplate]] = None
+        templates: Optional[Dict[str, VerifyTemplate]] = None,
+        workers: Optional[int] = None
     ) -> Dict[str, Path]:
         """生成最终的 Word 报告
 
         Args:
-            results: 核查结果 {主体名称: {URL: 截图路径}}
+            results: 核查结果 {主体名称: {URL: 截图路径或截图字节}}
             output_path: 报告输出路径
             templates: 核查模板字典
+            workers: 并行生成报告的进程数（未提供时使用配置 report_workers）
 
         Returns:
             dict: {主体名称: 报告文件路径}
         """
-        if templates:
-            self.templates = templates
+        import os
 
         output_dir = output_path or self.config.reports_dir
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        report_paths = {}
+        # 报告骨架每次运行只排版一次，各主体在其副本上填充
+        self._skeleton = self._build_report_skeleton()
 
-        for entity, entity_results in results.items():
-            try:
-                report_path = self._generate_single_report(entity, entity_results, output_dir)
-                report_paths[entity] = report_path
-                logger.info(f"主体 '{entity}' 报告生成成功: {report_path}")
-            except Exception as e:
-                logger.error(f"主体 '{entity}' 报告生成失败: {e}")
+        if workers is None:
+            workers = getattr(self.config, "report_workers", 1)
+        workers = min(workers or os.cpu_count() or 1, len(results))
+
+        if workers > 1:
+            # 按主体分片到多个进程，水印也在各进程内完成
+            report_paths = self._generate_reports_parallel(results, output_dir, workers, templates)
+        else:
+            # 按批并行加水印，再逐个组装文档
+            report_paths = {}
+            for shard in self._watermark_shards(results):
+                for entity, entity_results in shard.items():
+                    report_path = self._generate_report_safely(entity, entity_results, output_dir, templates)
+                    if report_path:
+                        report_paths[entity] = report_path
 
         # 检查是否生成了报告
         if report_paths:
@@ -65,11 +318,150 @@ class ReportGenerator:
 
         return report_paths
 
+    def start_pipeline(
+        self,
+        output_path: Optional[Path] = None,
+        templates: Optional[Dict[str, VerifyTemplate]] = None,
+        workers: Optional[int] = None,
+        on_report: Optional[Callable[[Any], None]] = None
+    ) -> ReportPipeline:
+        """启动流水线报告阶段，核查过程中逐个提交已完成的主体
+
+        Args:
+            output_path: 报告输出路径
+            templates: 核查模板字典
+            workers: 后台进程数（未提供时使用配置 report_workers）
+            on_report: 报告生成事件回调（VerifyEvent.report_ready）
+
+        Returns:
+            ReportPipeline: 报告流水线，全部提交后调用 finish() 取得报告路径
+        """
+        import os
+
+        output_dir = output_path or self.config.reports_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # 报告骨架在流水线启动时排版一次
+        self._skeleton = self._build_report_skeleton()
+
+        if workers is None:
+            workers = getattr(self.config, "report_workers", 1)
+        return ReportPipeline(self, output_dir, workers or os.cpu_count() or 1, on_report, templates)
+
+    def _generate_report_safely(
+        self,
+        entity: str,
+        entity_results: Dict[str, Union[str, bytes]],
+        output_dir: Path,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
+    ) -> Optional[Path]:
+        """为单个主体生成报告，失败时记录日志并返回 None"""
+        try:
+            report_path = self._generate_single_report(entity, entity_results, output_dir, templates)
+            logger.info(f"主体 '{entity}' 报告生成成功: {report_path}")
+            return report_path
+        except Exception as e:
+            logger.error(f"主体 '{entity}' 报告生成失败: {e}")
+            return None
+
+    def _generate_watermarked_report(
+        self,
+        entity: str,
+        entity_results: Dict[str, Union[str, bytes]],
+        output_dir: Path,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
+    ) -> Path:
+        """先为主体的全部截图加水印，再生成报告（流水线后台线程中逐个主体调用）
+
+        水印在当前线程逐个处理：核查仍在进行，不在后台线程中为每个主体新建进程池。
+
+        Args:
+            entity: 主体名称
+            entity_results: 主体的核查结果 {URL: 截图路径或截图字节}
+            output_dir: 输出目录
+            templates: 核查模板字典
+
+        Returns:
+            Path: 报告文件路径
+        """
+        try:
+            self._prepare_watermarks({entity: entity_results}, workers=1)
+            return self._generate_single_report(entity, entity_results, output_dir, templates)
+        finally:
+            self._watermarked.clear()
+
+    def _generate_reports_parallel(
+        self,
+        results: Dict[str, Dict[str, Union[str, bytes]]],
+        output_dir: Path,
+        workers: int,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
+    ) -> Dict[str, Path]:
+        """在进程池中按主体并行生成报告，单个主体失败不影响其他主体
+
+        Args:
+            results: 核查结果 {主体名称: {URL: 截图路径或截图字节}}
+            output_dir: 输出目录
+            workers: 进程数
+            templates: 核查模板字典
+
+        Returns:
+            dict: {主体名称: 报告文件路径}
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        report_paths = {}
+        # 进程池中途崩溃时未完成的主体
+        unfinished: List[str] = []
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    entity: executor.submit(
+                        _generate_report_job,
+                        self.config,
+                        templates,
+                        self._skeleton,
+                        entity,
+                        entity_results,
+                        output_dir
+                    )
+                    for entity, entity_results in results.items()
+                }
+                for entity, future in futures.items():
+                    try:
+                        report_paths[entity] = future.result()
+                        logger.info(f"主体 '{entity}' 报告生成成功: {report_paths[entity]}")
+                    except BrokenProcessPool:
+                        unfinished.append(entity)
+                    except Exception as e:
+                        logger.error(f"主体 '{entity}' 报告生成失败: {e}")
+        except Exception as e:
+            # 进程池不可用（如受限环境），对尚未完成的主体退回当前进程逐个生成
+            logger.warning(f"报告进程池不可用，改为逐个生成: {e}")
+            for entity, entity_results in results.items():
+                if entity not in report_paths:
+                    report_path = self._generate_report_safely(entity, entity_results, output_dir, templates)
+                    if report_path:
+                        report_paths[entity] = report_path
+            return report_paths
+
+        if unfinished:
+            # 进程池中途崩溃，在当前进程逐个生成未完成的主体
+            logger.warning(f"报告进程池异常退出，在当前进程生成剩余 {len(unfinished)} 个主体的报告")
+            for entity in unfinished:
+                report_path = self._generate_report_safely(entity, results[entity], output_dir, templates)
+                if report_path:
+                    report_paths[entity] = report_path
+
+        return report_paths
+
     def _generate_single_report(
         self,
         entity: str,
         entity_results: Dict[str, str],
-        output_dir: Path
+        output_dir: Path,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
     ) -> Path:
         """为单个主体生成报告
 
@@ -77,158 +469,294 @@ class ReportGenerator:
             entity: 主体名称
             entity_results: 主体的核查结果 {URL: 截图路径}
             output_dir: 输出目录
+            templates: 核查模板字典（用于确定各 URL 对应的章节）
 
         Returns:
             Path: 报告文件路径
         """
         from everify.common.file import clean_filename
 
-        # 创建文档
+        # 在报告骨架副本上设置标题
         from datetime import datetime
         current_date = datetime.now().strftime("%Y%m%d")
         title = f"{entity}诚信核查报告{current_date}"
-        self.document_engine.create_document(title)
+        if self._skeleton is None:
+            self._skeleton = self._build_report_skeleton()
+        self.document_engine.load_document(self._skeleton)
+        self.document_engine.set_title(title)
+
+        # 按章节归类核查结果（每个章节取第一个对应的 URL）
+        index = TemplatePrefixIndex(templates) if templates else None
+        chapter_results: Dict[str, Tuple[str, Union[str, bytes]]] = {}
+        for url, screenshot_path in entity_results.items():
+            template_info = self._get_template_info(url, templates, index)
+            chapter_results.setdefault(template_info["InsertContext"], (url, screenshot_path))
+
+        # 在自动化核查的章节处插入截图
+        for chapter_title in AUTOMATED_CHAPTERS:
+            if chapter_title not in chapter_results:
+                continue
+            url, screenshot_path = chapter_results[chapter_title]
+            # 添加截图
+            if self._has_screenshot(screenshot_path):
+                # 添加水印
+                self.document_engine.add_image(
+                    self._watermarked_image(entity, url, screenshot_path),
+                    heading=chapter_title
+                )
 
-        # 添加标题
-        self.document_engine.add_title(title, level=1)
+        # 保存文档
+        filename = f"{clean_filename(entity)} 诚信核查.docx"
+        report_path = output_dir / filename
+        self.document_engine.save_document(report_path)
 
+        return report_path
 
-        # 定义可以自动化核查的网页
-        automated_chapters = [
-            "百度（https://www.baidu.com/s）",
-            "中华人民共和国生态环境部网站（https://www.mee.gov.cn）",
-            "中华人民共和国商务部网站（https://search.mofcom.gov.cn）",
-            "国家外汇管理局网站（http://www.safe.gov.cn）",
-            "中国人民银行网站（https://wzdig.pbc.gov.cn）",
-            "国家金融监督管理总局（https://www.nfra.gov.cn/cn/view/pages/index/jiansuo.html）",
-            "中国盐业协会（https://www.cnsalt.cn）",
-            "国家统计局网站（https://www.stats.gov.cn）",
-            "国家能源局网站（https://www.nea.gov.cn）",
-            "国家市场监督管理总局（https://www.samr.gov.cn）",
-            "国家农业农村部网站（https://www.moa.gov.cn）",
-            "中华人民共和国住房和城乡建设部（https://www.mohurd.gov.cn）",
-            "全国建筑市场监管公共服务平台（https://jzsc.mohurd.gov.cn）",
-            "中华人民共和国人力资源和社会保障部网站（https://www.mohrss.gov.cn/hsearch/）",
-            "中国电力企业联合会网站（https://cec.org.cn）",
-            "国家药品监督管理局（https://www.nmpa.gov.cn）"
-        ]
+    def _build_report_skeleton(self) -> bytes:
+        """生成报告骨架：一级标题和全部自动化、人工核查章节标题
 
-        # 定义需要人工核查的网页
-        manual_chapters = [
-            "国家企业信用信息公示系统（http://www.gsxt.gov.cn/index.html）",
-            "国家税务总局重大税收违法案件信息公布栏（https://www.chinatax.gov.cn）",
-            "信用中国网（http://www.creditchina.gov.cn）",
-            "中国裁判文书网（http://wenshu.court.gov.cn）",
-            "中华人民共和国国家发展和改革委员会网站（http://www.ndrc.gov.cn）",
-            "中国执行信息公开网（http://zxgk.court.gov.cn/shixin/）",
-            "中华人民共和国应急管理部网站（http://www.mem.gov.cn）",
-            "中华人民共和国工业和信息化部网站（http://www.miit.gov.cn）",
-            "中国商务信用平台（http://www.bcpcn.com）",
-            "全国行业信用公共服务平台（http://www.bcp12312.org.cn）",
-            "中国证券监督管理委员会网站（http://www.csrc.gov.cn）",
-            "证券期货市场失信记录查询平台（http://neris.csrc.gov.cn/shixinchaxun/）",
-            "中华人民共和国自然资源部（http://www.mnr.gov.cn/）",
-            "国家财政部网站（http://www.mof.gov.cn/index.htm）",
-            "中国海关企业进出口信用信息公示平台（http://credit.customs.gov.cn）",
-            "全国资源公共交易平台（http://www.ggzy.gov.cn）",
-            "中华人民共和国海关总署（http://www.customs.gov.cn/）",
-            "中华人民共和国交通运输部网站（https://www.mot.gov.cn/）",
-            "政府采购严重违法失信行为信息记录（http://www.ccgp.gov.cn/cr/list）",
-            "信用能源（https://xyny.nea.gov.cn）",
-            "被执行人信息查询（https://zxgk.court.gov.cn/zhzxgk/）"
-        ]
+        Returns:
+            bytes: 骨架文档字节
+        """
+        self.document_engine.create_document("诚信核查报告")
+        self.document_engine.add_title("诚信核查报告", level=1)
 
         # 添加自动化核查的网页
-        for chapter_title in automated_chapters:
-            # 添加章节标题
+        for chapter_title in AUTOMATED_CHAPTERS:
             self.document_engine.add_title(chapter_title, level=2)
 
-            # 查找是否有对应的 URL
-            found = False
-            for url, screenshot_path in entity_results.items():
-                # 获取模板信息
-                template_info = self._get_template_info(url)
-                if template_info.get("InsertContext") == chapter_title:
-                    # 添加截图
-                    if screenshot_path and Path(screenshot_path).exists():
-                        # 添加水印
-                        watermarked_path = self._add_watermark(screenshot_path, entity)
-                        self.document_engine.add_image(Path(watermarked_path))
-                    found = True
-                    break
-
         # 添加人工核查的网页
-        for chapter_title in manual_chapters:
-            # 添加章节标题
+        for chapter_title in MANUAL_CHAPTERS:
             self.document_engine.add_title(chapter_title, level=2)
 
+        return self.document_engine.save_to_bytes()
 
-        # 保存文档
-        filename = f"{clean_filename(entity)} 诚信核查.docx"
-        report_path = output_dir / filename
-        self.document_engine.save_document(report_path)
-
-        return report_path
-
-    def _get_template_info(self, url: str) -> Dict:
-        """根据URL获取模板信息
+    @staticmethod
+    def _get_template_info(
+        url: str,
+        templates: Optional[Dict[str, VerifyTemplate]],
+        index: Optional[TemplatePrefixIndex]
+    ) -> Dict:
+        """根据URL获取模板信息（TemplateURL 直接使用携带的模板名称，否则查前缀索引）
 
         Args:
             url: URL地址
+            templates: 核查模板字典
+            index: 由 templates 建立的前缀索引
 
         Returns:
             dict: 模板信息
         """
-        if not self.templates:
+        if not templates or index is None:
+            return {"name": "unknown", "description": "未知模板", "InsertContext": "网页核查"}
+
+        template_name = index.lookup(url)
+        if template_name is None:
             return {"name": "unknown", "description": "未知模板", "InsertContext": "网页核查"}
 
-        for template_name, template in self.templates.items():
-            if template.url_pattern and "{}" in template.url_pattern:
-                # 检查URL是否匹配模板模式（简化匹配：只检查是否包含模板模式的固定部分）
-                fixed_part = template.url_pattern.split("{}")[0]
-                if fixed_part in url:
-                    return {
-                        "name": template_name,
-                        "description": template.description,
-                        "InsertContext": template.InsertContext if hasattr(template, "InsertContext") else "网页核查"
-                    }
+        template = templates[template_name]
+        return {
+            "name": template_name,
+            "description": template.description,
+            "InsertContext": template.compiled.chapter
+        }
 
-        return {"name": "unknown", "description": "未知模板", "InsertContext": "网页核查"}
+    def _has_screenshot(self, screenshot: Union[str, bytes]) -> bool:
+        """判断核查结果中是否有可用的截图（截图字节或存在的截图文件）"""
+        if isinstance(screenshot, bytes):
+            return bool(screenshot)
+        return bool(screenshot) and Path(screenshot).exists()
 
-    def _add_watermark(self, image_path: str, entity: str) -> str:
+    def _add_watermark(
+        self,
+        screenshot: Union[str, bytes],
+        entity: str,
+        captured_at: Optional[float] = None
+    ) -> Union[Path, bytes]:
         """为图片添加水印
 
         Args:
-            image_path: 原始图片路径
+            screenshot: 原始图片路径或图片字节
             entity: 主体名称
+            captured_at: 截图时间戳（可选，如缓存记录的原始截图时间）
 
         Returns:
-            str: 带水印的图片路径
+            Union[Path, bytes]: 带水印的图片路径；内存流水线模式下为图片字节
         """
-        from datetime import datetime
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        watermark_text = f"{entity} - {current_time}"
+        source, watermark_text, output_path = self._watermark_job(screenshot, entity, captured_at)
 
-        # 生成输出路径
-        from pathlib import Path
-        img_path = Path(image_path)
-        output_path = img_path.parent / f"{img_path.stem}_watermarked{img_path.suffix}"
+        # 内存流水线：直接在内存中加水印，不写 _watermarked 副本
+        if output_path is None:
+            if not isinstance(source, bytes):
+                source = source.read_bytes()
+            return self.image_engine.add_watermark_bytes(source, watermark_text)
 
         # 添加水印
         self.image_engine.add_watermark(
-            img_path,
+            source,
             watermark_text,
             output_path
         )
 
-        return str(output_path)
+        return output_path
+
+    def _watermark_job(
+        self,
+        screenshot: Union[str, bytes],
+        entity: str,
+        captured_at: Optional[float] = None
+    ) -> WatermarkJob:
+        """构造水印任务
+
+        Args:
+            screenshot: 原始图片路径或图片字节
+            entity: 主体名称
+            captured_at: 截图时间戳（可选，如缓存记录的原始截图时间）
+
+        Returns:
+            WatermarkJob: (原始图片, 水印文本, 输出路径)，内存流水线模式下输出路径为 None
+        """
+        from datetime import datetime
+
+        # 水印时间为截图时间：优先使用调用方提供的时间，其次为截图文件的修改时间
+        if captured_at is not None:
+            watermark_time = datetime.fromtimestamp(captured_at)
+        elif isinstance(screenshot, bytes):
+            watermark_time = datetime.now()
+        else:
+            watermark_time = datetime.fromtimestamp(Path(screenshot).stat().st_mtime)
+        watermark_text = f"{entity} - {watermark_time.strftime('%Y-%m-%d %H:%M:%S')}"
+
+        if isinstance(screenshot, bytes):
+            return screenshot, watermark_text, None
+        img_path = Path(screenshot)
+        if getattr(self.config, "in_memory_pipeline", False):
+            return img_path, watermark_text, None
+
+        # 生成输出路径
+        output_path = img_path.parent / f"{img_path.stem}_watermarked{img_path.suffix}"
+        return img_path, watermark_text, output_path
+
+    def _watermark_shards(
+        self,
+        results: Dict[str, Dict[str, Union[str, bytes]]],
+        captured_at: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> Iterator[Dict[str, Dict[str, Union[str, bytes]]]]:
+        """按 WATERMARK_BATCH_ENTITIES 个主体分批并行加水印，逐批交给调用方组装文档
+
+        每批处理完（包括出错时）清空预先生成的水印图片，内存占用不随主体数量增长。
+
+        Args:
+            results: 核查结果 {主体名称: {URL或关键词: 截图路径或截图字节}}
+            captured_at: 截图时间 {主体名称: {URL或关键词: 截图时间戳}}（可选）
+
+        Yields:
+            dict: 一批主体的核查结果
+        """
+        entities = list(results)
+        for start in range(0, len(entities), WATERMARK_BATCH_ENTITIES):
+            shard = {entity: results[entity] for entity in entities[start:start + WATERMARK_BATCH_ENTITIES]}
+            try:
+                self._prepare_watermarks(shard, captured_at=captured_at)
+                yield shard
+            finally:
+                self._watermarked.clear()
+
+    def _prepare_watermarks(
+        self,
+        results: Dict[str, Dict[str, Union[str, bytes]]],
+        workers: Optional[int] = None,
+        captured_at: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> None:
+        """并行为一批截图加水印并按嵌入配置缩放压缩，结果供组装文档时取用
+
+        Args:
+            results: 核查结果 {主体名称: {URL或关键词: 截图路径或截图字节}}
+            workers: 水印进程数（未提供时使用水印配置，1 表示在当前线程逐个处理）
+            captured_at: 截图时间 {主体名称: {URL或关键词: 截图时间戳}}（可选）
+        """
+        keys = []
+        jobs = []
+        for entity, entity_results in results.items():
+            for key, screenshot in entity_results.items():
+                if self._has_screenshot(screenshot):
+                    keys.append((entity, key))
+                    jobs.append(self._watermark_job(screenshot, entity, self._captured_at(captured_at, entity, key)))
+
+        if not jobs:
+            return
+
+        embed_profile = self._embed_profile()
+        watermarked = self.image_engine.add_watermark_many(jobs, workers=workers, embed_profile=embed_profile)
+        original_bytes = 0
+        embedded_bytes = 0
+        prepared = 0
+        for key, job, image in zip(keys, jobs, watermarked):
+            if image is None:
+                continue
+            self._watermarked[key] = image
+            prepared += 1
+            if isinstance(image, bytes):
+                source = job[0]
+                original_bytes += len(source) if isinstance(source, bytes) else source.stat().st_size
+                embedded_bytes += len(image)
+        logger.info(f"截图水印处理完成: {prepared}/{len(jobs)}")
+
+        if embed_profile is not None and original_bytes:
+            logger.info(
+                f"嵌入图片已压缩: {original_bytes / 1024 / 1024:.1f} MB -> {embedded_bytes / 1024 / 1024:.1f} MB"
+                f"（减少 {(1 - embedded_bytes / original_bytes) * 100:.0f}%）"
+            )
+
+    @staticmethod
+    def _captured_at(
+        captured_at: Optional[Dict[str, Dict[str, float]]],
+        entity: str,
+        key: str
+    ) -> Optional[float]:
+        """查找截图时间，未提供时返回 None（使用截图文件的修改时间）"""
+        if not captured_at:
+            return None
+        return captured_at.get(entity, {}).get(key)
+
+    def _embed_profile(self) -> Optional[EmbedProfileConfig]:
+        """获取启用的嵌入配置，未启用时返回 None"""
+        profile = getattr(self.config, "embed", None)
+        return profile if profile is not None and profile.enabled else None
+
+    def _watermarked_image(
+        self,
+        entity: str,
+        key: str,
+        screenshot: Union[str, bytes],
+        captured_at: Optional[float] = None
+    ) -> Union[Path, bytes]:
+        """获取预先生成的水印图片，没有时当场添加水印
+
+        Args:
+            entity: 主体名称
+            key: URL 或搜索关键词
+            screenshot: 原始图片路径或图片字节
+            captured_at: 截图时间戳（可选，当场添加水印时使用）
+
+        Returns:
+            Union[Path, bytes]: 带水印的图片路径或字节
+        """
+        image = self._watermarked.pop((entity, key), None)
+        if image is None:
+            image = self._add_watermark(screenshot, entity, captured_at)
+            embed_profile = self._embed_profile()
+            if embed_profile is not None:
+                image = self.image_engine.prepare_for_embed(image, embed_profile)
+        return image
 
     def generate_search_engine_report(
         self,
         search_results: Dict[str, Dict[str, str]],
         output_path: Optional[Path] = None,
         single_report: bool = True,
-        search_keywords: Optional[List[str]] = None
+        search_keywords: Optional[List[str]] = None,
+        captured_at: Optional[Dict[str, Dict[str, float]]] = None
     ) -> Dict[str, Path]:
         """生成搜索引擎查询结果的报告
 
@@ -237,6 +765,7 @@ class ReportGenerator:
             output_path: 报告输出路径
             single_report: 是否生成单一报告（包含所有主体），还是每个主体单独生成报告
             search_keywords: 搜索关键词列表（用于报告章节标题生成）
+            captured_at: 截图时间 {主体名称: {关键词: 截图时间戳}}（可选，如复用缓存截图的原始时间），用于水印
 
         Returns:
             dict: {主体名称或报告名称: 报告文件路径}
@@ -251,30 +780,35 @@ class ReportGenerator:
             report_path = self._generate_single_report_for_all_entities(
                 search_results,
                 output_dir,
-                search_keywords
+                search_keywords,
+                captured_at
             )
             return {"all_entities": report_path}
         else:
+            # 按批并行加水印，再组装文档
             report_paths = {}
-            for entity, entity_results in search_results.items():
-                try:
-                    report_path = self._generate_single_search_engine_report(
-                        entity,
-                        entity_results,
-                        output_dir,
-                        search_keywords
-                    )
-                    report_paths[entity] = report_path
-                    logger.info(f"主体 '{entity}' 搜索引擎查询报告生成成功: {report_path}")
-                except Exception as e:
-                    logger.error(f"主体 '{entity}' 搜索引擎查询报告生成失败: {e}")
+            for shard in self._watermark_shards(search_results, captured_at):
+                for entity, entity_results in shard.items():
+                    try:
+                        report_path = self._generate_single_search_engine_report(
+                            entity,
+                            entity_results,
+                            output_dir,
+                            search_keywords,
+                            captured_at
+                        )
+                        report_paths[entity] = report_path
+                        logger.info(f"主体 '{entity}' 搜索引擎查询报告生成成功: {report_path}")
+                    except Exception as e:
+                        logger.error(f"主体 '{entity}' 搜索引擎查询报告生成失败: {e}")
             return report_paths
 
     def _generate_single_report_for_all_entities(
         self,
         search_results: Dict[str, Dict[str, str]],
         output_dir: Path,
-        search_keywords: List[str]
+        search_keywords: List[str],
+        captured_at: Optional[Dict[str, Dict[str, float]]] = None
     ) -> Path:
         """为所有主体生成单一的搜索引擎查询报告
 
@@ -282,6 +816,7 @@ class ReportGenerator:
             search_results: 搜索引擎查询结果 {主体名称: {关键词: 截图路径}}
             output_dir: 输出目录
             search_keywords: 搜索关键词列表
+            captured_at: 截图时间 {主体名称: {关键词: 截图时间戳}}（可选）
 
         Returns:
             Path: 报告文件路径
@@ -291,38 +826,43 @@ class ReportGenerator:
 
         current_date = datetime.now().strftime("%Y%m%d")
         title = f"涉贿核查报告{current_date}"
-        self.document_engine.create_document(title)
-        self.document_engine.add_title(title, level=1)
+        filename = f"bribery_check_report{current_date}.docx"
+        report_path = output_dir / filename
 
-        # 为每个主体添加章节
-        for entity, entity_results in search_results.items():
-            # 添加主体名称作为章节标题
-            self.document_engine.add_title(f"{entity} 搜索结果", level=2)
-
-            # 为每个关键词添加子章节
-            for keyword in search_keywords:
-                self.document_engine.add_title(f"公司{keyword}情况", level=3)
-
-                if keyword in entity_results:
-                    screenshot_path = entity_results[keyword]
-                    if screenshot_path and Path(screenshot_path).exists():
-                        # 添加水印
-                        watermarked_path = self._add_watermark(screenshot_path, entity)
-                        self.document_engine.add_image(Path(watermarked_path))
+        # 合并报告可能包含大量主体的截图，使用流式引擎使内存占用不随主体数量增长
+        document_engine = StreamingDocxDocumentEngine(self.config)
+        document_engine.create_document(title, report_path)
+        document_engine.add_title(title, level=1)
+
+        # 为每个主体添加章节：分批并行加水印，已写入文档的图片不再留在内存中
+        for shard in self._watermark_shards(search_results, captured_at):
+            for entity, entity_results in shard.items():
+                # 添加主体名称作为章节标题
+                document_engine.add_title(f"{entity} 搜索结果", level=2)
+
+                # 为每个关键词添加子章节
+                for keyword in search_keywords:
+                    document_engine.add_title(f"公司{keyword}情况", level=3)
+
+                    if keyword in entity_results:
+                        screenshot_path = entity_results[keyword]
+                        if self._has_screenshot(screenshot_path):
+                            # 添加水印
+                            document_engine.add_image(self._watermarked_image(
+                                entity, keyword, screenshot_path, self._captured_at(captured_at, entity, keyword)
+                            ))
+                        else:
+                            document_engine.add_paragraph("未找到截图")
                     else:
-                        self.document_engine.add_paragraph("未找到截图")
-                else:
-                    self.document_engine.add_paragraph("未找到搜索结果")
+                        document_engine.add_paragraph("未找到搜索结果")
 
-            # 添加分隔线
-            self.document_engine.add_paragraph("")
-            self.document_engine.add_paragraph("-" * 50)
-            self.document_engine.add_paragraph("")
+                # 添加分隔线
+                document_engine.add_paragraph("")
+                document_engine.add_paragraph("-" * 50)
+                document_engine.add_paragraph("")
 
         # 保存文档
-        filename = f"bribery_check_report{current_date}.docx"
-        report_path = output_dir / filename
-        self.document_engine.save_document(report_path)
+        document_engine.save_document(report_path)
 
         logger.info(f"涉贿核查报告生成成功: {report_path}")
         return report_path
@@ -332,7 +872,8 @@ class ReportGenerator:
         entity: str,
         entity_results: Dict[str, str],
         output_dir: Path,
-        search_keywords: List[str]
+        search_keywords: List[str],
+        captured_at: Optional[Dict[str, Dict[str, float]]] = None
     ) -> Path:
         """为单个主体生成搜索引擎查询结果报告
 
@@ -341,6 +882,7 @@ class ReportGenerator:
             entity_results: 主体的搜索结果 {关键词: 截图路径}
             output_dir: 输出目录
             search_keywords: 搜索关键词列表
+            captured_at: 截图时间 {主体名称: {关键词: 截图时间戳}}（可选）
 
         Returns:
             Path: 报告文件路径
@@ -365,10 +907,11 @@ class ReportGenerator:
             # 添加搜索结果截图
             if keyword in entity_results:
                 screenshot_path = entity_results[keyword]
-                if screenshot_path and Path(screenshot_path).exists():
+                if self._has_screenshot(screenshot_path):
                     # 添加水印
-                    watermarked_path = self._add_watermark(screenshot_path, entity)
-                    self.document_engine.add_image(Path(watermarked_path))
+                    self.document_engine.add_image(self._watermarked_image(
+                        entity, keyword, screenshot_path, self._captured_at(captured_at, entity, keyword)
+                    ))
                 else:
                     self.document_engine.add_paragraph("未找到截图")
             else:
@@ -390,83 +933,155 @@ class ReportGenerator:
             screenshot_dir: 截图文件夹路径（所有截图都在这个目录下）
             all_entities: 所有需要核查的主体列表（保持原始输入顺序）
         """
-        # 获取所有截图文件
-        screenshots = list(screenshot_dir.glob("*.png")) + list(screenshot_dir.glob("*.jpg")) + list(screenshot_dir.glob("*.jpeg")) + list(screenshot_dir.glob("*.bmp"))
+        # 获取所有截图文件（按文件名排序）
+        screenshots = scan_manual_screenshots(screenshot_dir)
         if not screenshots:
             logger.warning(f"未找到截图文件: {screenshot_dir}")
             return
 
-        # 按文件名排序（按时间戳顺序，确保顺序正确）
-        screenshots.sort(key=lambda x: x.name)
-
-        # 定义需要人工核查的网页（与 report_generator.py 中的一致）
-        manual_chapters = [
-            "国家企业信用信息公示系统（http://www.gsxt.gov.cn/index.html）",
-            "国家税务总局重大税收违法案件信息公布栏（https://www.chinatax.gov.cn）",
-            "信用中国网（http://www.creditchina.gov.cn）",
-            "中国裁判文书网（http://wenshu.court.gov.cn）",
-            "中华人民共和国国家发展和改革委员会网站（http://www.ndrc.gov.cn）",
-            "中国执行信息公开网（http://zxgk.court.gov.cn/shixin/）",
-            "中华人民共和国应急管理部网站（http://www.mem.gov.cn）",
-            "中华人民共和国工业和信息化部网站（http://www.miit.gov.cn）",
-            "中国商务信用平台（http://www.bcpcn.com）",
-            "全国行业信用公共服务平台（http://www.bcp12312.org.cn）",
-            "中国证券监督管理委员会网站（http://www.csrc.gov.cn）",
-            "证券期货市场失信记录查询平台（http://neris.csrc.gov.cn/shixinchaxun/）",
-            "中华人民共和国自然资源部（http://www.mnr.gov.cn/）",
-            "国家财政部网站（http://www.mof.gov.cn/index.htm）",
-            "中国海关企业进出口信用信息公示平台（http://credit.customs.gov.cn）",
-            "全国资源公共交易平台（http://www.ggzy.gov.cn）",
-            "中华人民共和国海关总署（http://www.customs.gov.cn/）",
-            "中华人民共和国交通运输部网站（https://www.mot.gov.cn/）",
-            "政府采购严重违法失信行为信息记录（http://www.ccgp.gov.cn/cr/list）",
-            "信用能源（https://xyny.nea.gov.cn）",
-            "被执行人信息查询（https://zxgk.court.gov.cn/zhzxgk/）"
-        ]
-
-        # 确定当前主体在列表中的索引
-        try:
-            entity_index = all_entities.index(entity)
-        except ValueError:
+        if entity not in all_entities:
             logger.warning(f"主体 '{entity}' 不在主体列表中")
             return
 
-        # 计算每个主体每个网页的截图索引
-        # 截图顺序：网页1主体1 → 网页1主体2 → 网页1主体3 → 网页1主体4 → 网页1主体5 → 网页2主体1 → ...
-        entity_screenshots = []
-        for web_index in range(len(manual_chapters)):
-            # 计算该网页该主体的截图索引
-            screenshot_index = web_index * len(all_entities) + entity_index
-            if screenshot_index < len(screenshots):
-                entity_screenshots.append(screenshots[screenshot_index])
+        manifest = CaptureManifest.load(screenshot_dir)
+        entity_screenshots = map_manual_screenshots(screenshots, all_entities, manifest)[entity]
+        self._insert_manual_screenshot_files(entity, report_path, entity_screenshots)
+
+    def insert_manual_screenshots_batch(
+        self,
+        report_paths: Dict[str, Path],
+        screenshot_dir: Path,
+        all_entities: List[str],
+        workers: Optional[int] = None,
+        on_report: Optional[Callable[[Any], None]] = None,
+        cancel_event: Optional[Any] = None
+    ) -> Dict[str, bool]:
+        """为所有报告插入人工核查截图：截图目录只扫描一次，每个报告只打开、保存一次
+
+        Args:
+            report_paths: {主体名称: 报告文件路径}
+            screenshot_dir: 截图文件夹路径
+            all_entities: 所有需要核查的主体列表（保持原始输入顺序）
+            workers: 并行处理报告的进程数（未提供时使用配置 report_workers，1 表示逐个处理）
+            on_report: 报告处理事件回调，每个报告完成（或失败）时以 VerifyEvent.report_ready 调用
+            cancel_event: 取消标志，设置后不再处理尚未开始的报告
+
+        Returns:
+            dict: {主体名称: 是否插入成功}
+        """
+        import os
+        from everify.core.services.verify_service import VerifyEvent
+
+        screenshots = scan_manual_screenshots(screenshot_dir)
+        if not screenshots:
+            logger.warning(f"未找到截图文件: {screenshot_dir}")
+            return {}
+
+        mapping = map_manual_screenshots(screenshots, all_entities, CaptureManifest.load(screenshot_dir))
+        jobs = []
+        for entity, report_path in report_paths.items():
+            if entity in mapping:
+                jobs.append((entity, Path(report_path), mapping[entity]))
             else:
-                entity_screenshots.append(None)
+                logger.warning(f"主体 '{entity}' 不在主体列表中")
+        logger.info(f"共 {len(screenshots)} 张人工核查截图，待插入 {len(jobs)} 个报告")
+
+        def notify(entity: str, report_path: Path, success: bool) -> None:
+            if on_report is None:
+                return
+            try:
+                on_report(VerifyEvent.report_ready(entity, report_path if success else None))
+            except Exception as e:
+                logger.error(f"报告处理事件回调执行失败: {e}")
+
+        if workers is None:
+            workers = getattr(self.config, "report_workers", 1)
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+        results: Dict[str, bool] = {}
+        if workers <= 1:
+            for entity, report_path, chapter_files in jobs:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                results[entity] = self._insert_manual_screenshot_files(entity, report_path, chapter_files)
+                notify(entity, report_path, results[entity])
+            return results
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_insert_manual_screenshots_job, entity, report_path, chapter_files): (entity, report_path)
+                for entity, report_path, chapter_files in jobs
+            }
+            for future in as_completed(futures):
+                entity, report_path = futures[future]
+                try:
+                    results[entity] = future.result()
+                except Exception as e:
+                    logger.error(f"主体 '{entity}' 插入人工核查截图失败: {e}")
+                    results[entity] = False
+                notify(entity, report_path, results[entity])
 
-        # 打开报告文件并插入截图
-        from docx import Document
-        from docx.shared import Inches
+                if cancel_event is not None and cancel_event.is_set():
+                    # 取消尚未开始的报告，正在处理的报告照常完成
+                    for pending in futures:
+                        pending.cancel()
+        return {entity: results[entity] for entity, _, _ in jobs if entity in results}
 
+    @staticmethod
+    def _add_manual_screenshot(engine: DocxDocumentEngine, chapter_title: str, screenshot: Optional[Path]) -> bool:
+        """在已打开报告的章节标题处插入一张人工核查截图
+
+        Args:
+            engine: 已通过 load_document 打开报告的文档引擎（已建立标题索引）
+            chapter_title: 章节标题（不含编号）
+            screenshot: 截图路径，为 None 时只检查章节是否存在
+
+        Returns:
+            bool: 章节存在且截图已插入（或无需插入）时返回 True
+        """
+        para = engine.headings.get(chapter_title)
+        if para is None:
+            logger.warning(f"未找到章节标题: {chapter_title}")
+            return False
+        # 插入截图（如果有对应的截图）
+        if screenshot is not None:
+            para.add_run().add_picture(str(screenshot), width=engine.Inches(6))
+        return True
+
+    @staticmethod
+    def _insert_manual_screenshot_files(
+        entity: str,
+        report_path: Path,
+        chapter_files: List[Optional[Path]]
+    ) -> bool:
+        """打开报告，按章节插入截图后保存
+
+        Args:
+            entity: 主体名称
+            report_path: 报告文件路径
+            chapter_files: 与 MANUAL_CHAPTERS 一一对应的截图路径（没有截图的章节为 None）
+
+        Returns:
+            bool: 是否插入成功
+        """
+        # 打开时扫描一次段落建立标题索引，各章节直接按标题定位
+        engine = DocxDocumentEngine()
         try:
-            doc = Document(report_path)
-
-            # 遍历每个章节并插入对应的截图
-            for i, chapter_title in enumerate(manual_chapters):
-                # 查找章节标题所在的段落
-                found = False
-                for para in doc.paragraphs:
-                    if para.style.name.startswith("Heading 2") and chapter_title in para.text:
-                        # 插入截图（如果有对应的截图）
-                        if i < len(entity_screenshots) and entity_screenshots[i] is not None:
-                            para.add_run().add_picture(str(entity_screenshots[i]), width=Inches(6))
-                        found = True
-                        break
-
-                if not found:
-                    logger.warning(f"未找到章节标题: {chapter_title}")
+            engine.load_document(report_path, report_path)
+
+            for chapter_title, screenshot in zip(MANUAL_CHAPTERS, chapter_files):
+                ReportGenerator._add_manual_screenshot(engine, chapter_title, screenshot)
 
             # 保存修改后的报告
-            doc.save(report_path)
+            if engine.save_document(report_path) is None:
+                return False
             logger.info(f"主体 '{entity}' 人工核查截图插入完成: {report_path}")
+            return True
 
         except Exception as e:
-            logger.error(f"插入人工核查截图失败: {e}")
\ No newline at end of file
+            logger.error(f"插入人工核查截图失败: {e}")
+            return False
+        finally:
+            engine.close_document()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+核查结果缓存模块
+同一主体在有效期内再次核查同一网页时直接复用已有截图，跨运行、跨操作共享
+"""
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from everify.core.utils import logger
+
+# 同一进程中的多个核查任务共用缓存索引文件，写入时按文件加锁
+_save_locks: Dict[str, threading.Lock] = {}
+_save_locks_guard = threading.Lock()
+
+
+def _save_lock(cache_path: Path) -> threading.Lock:
+    """获取缓存索引文件对应的写入锁"""
+    with _save_locks_guard:
+        return _save_locks.setdefault(str(cache_path.resolve()), threading.Lock())
+
+
+def normalize_entity(entity: str) -> str:
+    """规范化主体名称（全角转半角、去除空白），作为缓存键的一部分
+
+    Args:
+        entity: 主体名称
+
+    Returns:
+        str: 规范化后的名称
+    """
+    return "".join(unicodedata.normalize("NFKC", entity).split())
+
+
+class ResultCache:
+    """核查结果缓存
+
+    键为 (网页范围, 规范化主体名称)，值为截图路径和截图时间。网页范围为核查模板（含 URL 模式，
+    修改模板后自动失效）或 URL，搜索引擎查询使用关键词。超过有效期的结果不再使用，
+    条目数超过上限时淘汰最久未使用的条目。缓存只记录截图位置，不删除截图文件。
+
+    多个任务可能同时使用同一个索引文件，保存时在锁内重新读取磁盘上的索引，只合并本实例的改动后原子替换，
+    不会覆盖其他任务在此期间写入的条目。
+    """
+
+    def __init__(self, cache_config: Any, cache_path: Path):
+        """初始化结果缓存
+
+        Args:
+            cache_config: 缓存配置（ResultCacheConfig）
+            cache_path: 缓存索引文件路径
+        """
+        self.config = cache_config
+        self.cache_path = cache_path
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+        # 本实例写入或使用过的键，以及删除的条目 {键: 截图时间}，保存时据此与磁盘上的索引合并
+        self._touched: set = set()
+        self._removed: Dict[str, float] = {}
+
+    @classmethod
+    def from_app_config(cls, app_config: Any) -> "ResultCache":
+        """按应用配置创建缓存，索引文件位于 output_dir/cache/results.json"""
+        return cls(app_config.result_cache, app_config.output_dir / "cache" / "results.json")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.enabled)
+
+    def get(self, scope: str, entity: str) -> Optional[Dict[str, Any]]:
+        """查找有效期内的缓存结果
+
+        Args:
+            scope: 网页范围（核查模板、URL 或搜索关键词）
+            entity: 主体名称
+
+        Returns:
+            Optional[dict]: {"screenshot": 截图路径, "captured_at": 截图时间戳}，未命中时返回 None
+        """
+        if not self.enabled:
+            return None
+        self._load()
+
+        key = self._key(scope, entity)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if self._expired(entry) or not Path(entry["screenshot"]).exists():
+            del self._entries[key]
+            self._touched.discard(key)
+            self._removed[key] = entry["captured_at"]
+            self._dirty = True
+            return None
+
+        self._entries.move_to_end(key)
+        self._touched.add(key)
+        return entry
+
+    def put(self, scope: str, entity: str, screenshot: str, captured_at: Optional[float] = None) -> None:
+        """记录一次成功的截图
+
+        Args:
+            scope: 网页范围（核查模板、URL 或搜索关键词）
+            entity: 主体名称
+            screenshot: 截图路径
+            captured_at: 截图时间戳（默认为当前时间）
+        """
+        if not self.enabled or not screenshot:
+            return
+        self._load()
+
+        key = self._key(scope, entity)
+        self._entries[key] = {
+            "screenshot": str(screenshot),
+            "captured_at": captured_at if captured_at is not None else time.time()
+        }
+        self._entries.move_to_end(key)
+        self._touched.add(key)
+        self._trim(self._entries)
+        self._dirty = True
+
+    def save(self) -> None:
+        """将缓存索引与磁盘上的最新索引合并后写回（只在有变化时写入）"""
+        if not self._dirty:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with _save_lock(self.cache_path):
+                merged = self._merge(self._read_entries())
+                # 临时文件名按进程和线程区分，写完后原子替换
+                tmp_path = self.cache_path.with_name(
+                    f"{self.cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False)
+                tmp_path.replace(self.cache_path)
+
+            self._entries = merged
+            self._touched.clear()
+            self._removed.clear()
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"保存结果缓存失败: {e}")
+
+    def _merge(self, disk_entries: Dict[str, Dict[str, Any]]) -> "OrderedDict[str, Dict[str, Any]]":
+        """将本实例的改动合并到磁盘上的索引：同一键保留截图时间较新的条目
+
+        Args:
+            disk_entries: 磁盘上的缓存索引
+
+        Returns:
+            OrderedDict: 合并后的缓存索引（按最近使用排序）
+        """
+        merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for key, entry in disk_entries.items():
+            if self._expired(entry) or self._removed.get(key) == entry["captured_at"]:
+                continue
+            merged[key] = entry
+
+        for key, entry in self._entries.items():
+            if key not in self._touched:
+                continue
+            current = merged.get(key)
+            if current is None or current["captured_at"] <= entry["captured_at"]:
+                merged[key] = entry
+            merged.move_to_end(key)
+
+        self._trim(merged)
+        return merged
+
+    def _trim(self, entries: "OrderedDict[str, Dict[str, Any]]") -> None:
+        """超过上限时淘汰最久未使用的条目"""
+        while len(entries) > self.config.max_entries:
+            entries.popitem(last=False)
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        """读取磁盘上的缓存索引，文件不存在或损坏时返回空字典"""
+        if not self.cache_path.exists():
+            return {}
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"读取结果缓存失败，将重新建立: {e}")
+            return {}
+
+    def _load(self) -> None:
+        """首次使用时读取缓存索引，并丢弃已过期的条目"""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        entries = self._read_entries()
+        for key, entry in entries.items():
+            if not self._expired(entry):
+                self._entries[key] = entry
+        self._dirty = len(self._entries) != len(entries)
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["captured_at"] > self.config.ttl_hours * 3600
+
+    @staticmethod
+    def _key(scope: str, entity: str) -> str:
+        return f"{scope}\t{normalize_entity(entity)}"
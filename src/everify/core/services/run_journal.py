@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+核查运行记录模块
+以追加写入的 JSONL 文件记录每个 (主体, 模板) 的核查结果，程序中断后可据此恢复
+"""
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from everify.core.utils import logger
+
+
+class RunJournal:
+    """核查运行记录
+
+    文件位于 output_dir/runs/<run_id>.jsonl：第一行记录本次运行的主体和模板，
+    之后每完成一个 URL 追加一行结果并立即落盘，中断时最多丢失正在处理的页面。
+    """
+
+    def __init__(self, path: Path, run_id: str, entities: List[str], template_names: List[str]):
+        """初始化运行记录
+
+        Args:
+            path: 记录文件路径
+            run_id: 运行 ID
+            entities: 本次核查的主体列表
+            template_names: 本次使用的模板名称列表
+        """
+        self.path = path
+        self.run_id = run_id
+        self.entities = entities
+        self.template_names = template_names
+        self._file = None
+
+    @classmethod
+    def create(cls, runs_dir: Path, entities: List[str], template_names: List[str]) -> "RunJournal":
+        """创建新的运行记录
+
+        Args:
+            runs_dir: 运行记录目录
+            entities: 本次核查的主体列表
+            template_names: 本次使用的模板名称列表
+
+        Returns:
+            RunJournal: 运行记录
+        """
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        journal = cls(runs_dir / f"{run_id}.jsonl", run_id, list(entities), list(template_names))
+        journal._append({
+            "type": "run",
+            "run_id": run_id,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "entities": journal.entities,
+            "templates": journal.template_names
+        })
+        return journal
+
+    @classmethod
+    def open(cls, runs_dir: Path, run_id: str) -> Optional["RunJournal"]:
+        """打开已有的运行记录（用于恢复）
+
+        Args:
+            runs_dir: 运行记录目录
+            run_id: 运行 ID
+
+        Returns:
+            Optional[RunJournal]: 运行记录，不存在或无法读取时返回 None
+        """
+        path = runs_dir / f"{run_id}.jsonl"
+        if not path.exists():
+            logger.error(f"未找到核查记录: {path}")
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except Exception as e:
+            logger.error(f"读取核查记录失败: {e}")
+            return None
+
+        return cls(path, run_id, header.get("entities", []), header.get("templates", []))
+
+    def record(self, entity: str, url: str, template: Optional[str], screenshot: Union[str, bytes, None]) -> None:
+        """记录单个 URL 的核查结果
+
+        Args:
+            entity: 主体名称
+            url: URL地址
+            template: 模板名称
+            screenshot: 截图路径；内存流水线的截图字节无法恢复，记为未完成
+        """
+        path = screenshot if isinstance(screenshot, str) else ""
+        self._append({
+            "type": "result",
+            "entity": entity,
+            "url": url,
+            "template": template,
+            "screenshot": path,
+            "success": bool(path)
+        })
+
+    def completed(self) -> Dict[str, Dict[str, str]]:
+        """读取已成功完成且截图仍存在的结果
+
+        Returns:
+            dict: {主体名称: {URL: 截图路径}}
+        """
+        done: Dict[str, Dict[str, str]] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    # 中断时可能留下不完整的最后一行
+                    continue
+                if item.get("type") != "result":
+                    continue
+
+                entity_done = done.setdefault(item["entity"], {})
+                if item.get("success") and Path(item["screenshot"]).exists():
+                    entity_done[item["url"]] = item["screenshot"]
+                else:
+                    entity_done.pop(item["url"], None)
+        return done
+
+    def close(self) -> None:
+        """关闭记录文件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, item: Dict) -> None:
+        """追加一行记录并立即落盘"""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+人工截图实时插入模块
+监视截图目录，新截图写入完成后立即分配到 (章节, 主体) 并插入对应报告，报告在插入停顿后统一保存
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from everify.core.base.document import DocxDocumentEngine
+from everify.core.services.capture_manifest import CaptureManifest
+from everify.core.services.report_generator import (
+    MANUAL_CHAPTERS, ReportGenerator, map_manual_screenshots, scan_manual_screenshots
+)
+from everify.core.services.verify_service import VerifyEvent
+from everify.core.utils import logger
+
+
+class ManualScreenshotWatcher:
+    """人工截图目录监视器
+
+    截图清单中记录过的截图按记录定位，其余截图按文件名排序后的位置决定其 (章节, 主体)，
+    与批量插入的规则一致。已安装 watchdog 时
+    由系统文件事件触发扫描，否则按间隔轮询目录。报告在监视期间保持打开，每次插入只修改内存中的文档，
+    最后一次插入后经过 debounce_seconds 才写回磁盘，结束监视时保存全部未保存的报告。
+    """
+
+    def __init__(
+        self,
+        report_paths: Dict[str, Path],
+        screenshot_dir: Path,
+        all_entities: List[str],
+        watch_config: Any,
+        on_report: Optional[Callable[[VerifyEvent], None]] = None
+    ):
+        """初始化监视器
+
+        Args:
+            report_paths: {主体名称: 报告文件路径}
+            screenshot_dir: 截图文件夹路径
+            all_entities: 所有需要核查的主体列表（保持原始输入顺序）
+            watch_config: 实时插入配置（ManualWatchConfig）
+            on_report: 报告保存事件回调，每次保存报告时以 VerifyEvent.report_ready 调用
+        """
+        self.screenshot_dir = screenshot_dir
+        self.all_entities = all_entities
+        self.config = watch_config
+        self.on_report = on_report
+        self.report_paths: Dict[str, Path] = {}
+        for entity, report_path in report_paths.items():
+            if entity in all_entities:
+                self.report_paths[entity] = Path(report_path)
+            else:
+                logger.warning(f"主体 '{entity}' 不在主体列表中")
+
+        self.inserted_count = 0
+        # 已打开的报告（打开失败的主体记为 None，不再重试）
+        self._engines: Dict[str, Optional[DocxDocumentEngine]] = {}
+        # 已插入的截图 {(章节序号, 主体名称): 截图路径}
+        self._inserted: Dict[Tuple[int, str], Path] = {}
+        self._conflicts: Set[Tuple[int, str]] = set()
+        self._dirty: Set[str] = set()
+        self._last_insert = 0.0
+        # 有文件尚未写入完成，下一轮需要重新扫描
+        self._unsettled = False
+        self._changed = threading.Event()
+
+    def run(self, stop_event: threading.Event) -> int:
+        """监视截图目录直到 stop_event 被设置，结束时插入剩余截图并保存全部报告
+
+        Args:
+            stop_event: 结束监视的标志
+
+        Returns:
+            int: 本次插入的截图数量
+        """
+        observer = self._start_observer()
+        if observer is None:
+            logger.info(f"每 {self.config.poll_interval} 秒扫描一次截图目录: {self.screenshot_dir}")
+            tick = self.config.poll_interval
+        else:
+            logger.info(f"正在监视截图目录: {self.screenshot_dir}")
+            tick = min(self.config.poll_interval, max(self.config.settle_seconds, 0.1))
+
+        try:
+            # 监视开始前已存在的截图先插入
+            self.sync()
+            while not stop_event.is_set():
+                self._changed.wait(timeout=tick)
+                if observer is None or self._changed.is_set() or self._unsettled:
+                    self._changed.clear()
+                    self.sync()
+                self.flush()
+
+            # 操作员结束截图后，剩余文件不再等待写入完成
+            self.sync(settle=False)
+            self.flush(force=True)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.close()
+
+        logger.info(f"人工核查截图实时插入结束，共插入 {self.inserted_count} 张截图")
+        return self.inserted_count
+
+    def sync(self, settle: bool = True) -> int:
+        """扫描截图目录，插入尚未插入的截图
+
+        Args:
+            settle: 是否跳过最近仍在写入的文件
+
+        Returns:
+            int: 本轮插入的截图数量
+        """
+        now = time.time()
+        screenshots = scan_manual_screenshots(self.screenshot_dir)
+        # 引导式截图会不断追加清单，每轮重新读取
+        mapping = map_manual_screenshots(screenshots, self.all_entities, CaptureManifest.load(self.screenshot_dir))
+        self._unsettled = False
+
+        inserted = 0
+        for entity in self.report_paths:
+            for chapter_index, screenshot in enumerate(mapping[entity]):
+                if screenshot is None:
+                    continue
+
+                key = (chapter_index, entity)
+                previous = self._inserted.get(key)
+                if previous is not None:
+                    # 截图被删除或文件名排在已有截图之前时，后续截图的位置会整体移动
+                    if previous != screenshot and key not in self._conflicts:
+                        self._conflicts.add(key)
+                        logger.warning(
+                            f"截图顺序发生变化：主体 '{entity}' 第 {chapter_index + 1} 个网页已插入 {previous.name}，"
+                            f"现在对应 {screenshot.name}，请检查截图目录"
+                        )
+                    continue
+
+                try:
+                    modified_at = screenshot.stat().st_mtime
+                except OSError:
+                    continue
+                if settle and now - modified_at < self.config.settle_seconds:
+                    self._unsettled = True
+                    continue
+
+                if self._insert(entity, chapter_index, screenshot):
+                    inserted += 1
+
+        if inserted:
+            self.inserted_count += inserted
+            self._last_insert = time.monotonic()
+        return inserted
+
+    def flush(self, force: bool = False) -> None:
+        """保存有改动的报告（最后一次插入后经过 debounce_seconds，或 force 为 True）
+
+        Args:
+            force: 是否立即保存
+        """
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_insert < self.config.debounce_seconds:
+            return
+
+        for entity in list(self._dirty):
+            report_path = self.report_paths[entity]
+            # 报告被 Word 打开等原因保存失败时保留改动，下次再试
+            if self._engines[entity].save_document(report_path) is None:
+                continue
+            self._dirty.discard(entity)
+            if self.on_report is not None:
+                try:
+                    self.on_report(VerifyEvent.report_ready(entity, report_path))
+                except Exception as e:
+                    logger.error(f"报告保存事件回调执行失败: {e}")
+
+    def close(self) -> None:
+        """关闭所有已打开的报告（未保存的改动会丢失）"""
+        for engine in self._engines.values():
+            if engine is not None:
+                engine.close_document()
+        self._engines = {}
+
+    def _insert(self, entity: str, chapter_index: int, screenshot: Path) -> bool:
+        """将一张截图插入主体报告的对应章节"""
+        engine = self._engine(entity)
+        if engine is None:
+            return False
+
+        try:
+            added = ReportGenerator._add_manual_screenshot(engine, MANUAL_CHAPTERS[chapter_index], screenshot)
+        except Exception as e:
+            logger.error(f"插入人工核查截图 {screenshot.name} 失败: {e}")
+            added = False
+        # 失败的截图同样记录，避免每轮重复尝试
+        self._inserted[(chapter_index, entity)] = screenshot
+        if not added:
+            return False
+
+        self._dirty.add(entity)
+        logger.info(f"已插入人工核查截图 {screenshot.name} → 主体 '{entity}' 第 {chapter_index + 1} 个网页")
+        return True
+
+    def _engine(self, entity: str) -> Optional[DocxDocumentEngine]:
+        """取得主体报告的文档引擎，首次使用时打开报告"""
+        if entity in self._engines:
+            return self._engines[entity]
+
+        engine = DocxDocumentEngine()
+        try:
+            engine.load_document(self.report_paths[entity], self.report_paths[entity])
+        except Exception as e:
+            logger.error(f"打开报告失败: {self.report_paths[entity]}: {e}")
+            engine = None
+        self._engines[entity] = engine
+        return engine
+
+    def _start_observer(self) -> Optional[Any]:
+        """启动 watchdog 文件事件监视，未安装或启动失败时返回 None（改为轮询）"""
+        if not self.config.use_watchdog:
+            return None
+
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("未安装 watchdog，改为轮询截图目录")
+            return None
+
+        changed = self._changed
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    changed.set()
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(self.screenshot_dir), recursive=False)
+            observer.start()
+            return observer
+        except Exception as e:
+            logger.warning(f"启动截图目录监视失败，改为轮询: {e}")
+            return None
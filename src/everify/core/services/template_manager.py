@@ -3,7 +3,7 @@
 模板管理服务模块
 负责核查模板的加载、管理、验证和选择
 """
-from typing import List, Dict, Optional, Set
+from typing import Any, List, Dict, Optional, Set
 from pathlib import Path
 import json
 from everify.core.utils import logger
@@ -40,9 +40,37 @@ class TemplateManager:
             self._load_default_templates()
             self._load_user_templates()
 
+        # 预编译模板，核查和报告生成时直接使用
+        for template in self.templates.values():
+            template.compile()
+
         logger.info(f"成功加载 {len(self.templates)} 个核查模板")
         return self.templates
 
+    @staticmethod
+    def _build_template(name: str, data: Dict[str, Any], default_category: str = "general") -> VerifyTemplate:
+        """根据模板文件中的一项数据创建模板
+
+        Args:
+            name: 模板键名（数据中没有 name 时作为模板名称）
+            data: 模板数据
+            default_category: 数据中没有 category 时使用的分类
+
+        Returns:
+            VerifyTemplate: 核查模板
+        """
+        return VerifyTemplate(
+            name=data.get("name", name),
+            description=data.get("description", ""),
+            url_pattern=data.get("url_pattern", ""),
+            category=data.get("category", default_category),
+            InsertContext=data.get("InsertContext", "网页核查"),
+            readiness=data.get("readiness"),
+            stability=data.get("stability"),
+            rate_limit=data.get("rate_limit"),
+            resource_policy=data.get("resource_policy")
+        )
+
     def _load_from_file(self) -> None:
         """从文件加载模板"""
         try:
@@ -51,14 +79,7 @@ class TemplateManager:
 
             for name, data in template_data.items():
                 try:
-                    template = VerifyTemplate(
-                        name=data.get("name", name),
-                        description=data.get("description", ""),
-                        url_pattern=data.get("url_pattern", ""),
-                        category=data.get("category", "general"),
-                        InsertContext=data.get("InsertContext", "网页核查")
-                    )
-                    self.templates[name] = template
+                    self.templates[name] = self._build_template(name, data)
                 except Exception as e:
                     logger.error(f"加载模板 '{name}' 失败: {e}")
 
@@ -84,14 +105,7 @@ class TemplateManager:
 
                 for name, data in template_data.items():
                     try:
-                        template = VerifyTemplate(
-                            name=data.get("name", name),
-                            description=data.get("description", ""),
-                            url_pattern=data.get("url_pattern", ""),
-                            category=data.get("category", "general"),
-                            InsertContext=data.get("InsertContext", "网页核查")
-                        )
-                        self.templates[name] = template
+                        self.templates[name] = self._build_template(name, data)
                     except Exception as e:
                         logger.error(f"加载模板 '{name}' 失败: {e}")
 
@@ -109,14 +123,7 @@ class TemplateManager:
 
                 for name, data in template_data.items():
                     try:
-                        template = VerifyTemplate(
-                            name=data.get("name", name),
-                            description=data.get("description", ""),
-                            url_pattern=data.get("url_pattern", ""),
-                            category=data.get("category", "custom"),
-                            InsertContext=data.get("InsertContext", "网页核查")
-                        )
-                        self.templates[name] = template
+                        self.templates[name] = self._build_template(name, data, "custom")
                     except Exception as e:
                         logger.error(f"加载用户模板 '{name}' 失败: {e}")
 
@@ -3,11 +3,93 @@
 URL生成服务模块
 负责根据主体和模板生成待核查的URL列表
 """
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from everify.core.utils import logger
 from everify.core.utils.config import VerifyTemplate
 
 
+class TemplateURL(str):
+    """携带模板名称的 URL
+
+    与普通字符串完全等价（相等比较、哈希、JSON 序列化不变），核查和报告生成时可以直接读取
+    template 得到模板名称，不必再按 URL 反查模板。
+    """
+
+    __slots__ = ("template",)
+
+    def __new__(cls, url: str, template: Optional[str] = None) -> "TemplateURL":
+        instance = super().__new__(cls, url)
+        instance.template = template
+        return instance
+
+
+class TemplatePrefixIndex:
+    """按 URL 模式中 {} 之前的固定部分建立的前缀索引，用于只有 URL 时反查模板
+
+    固定部分按来源（协议和主机）分组，查找时先取 URL 来源对应的分组，再在组内按前缀从长到短匹配，
+    不必逐个检查全部模板。固定部分完全相同时保留先出现的模板。
+    """
+
+    def __init__(self, templates: Dict[str, VerifyTemplate]):
+        """建立前缀索引
+
+        Args:
+            templates: 核查模板字典
+        """
+        self._names = set(templates)
+        # {来源: [(固定部分, 模板名称), ...]}，组内按固定部分从长到短排列
+        self._by_origin: Dict[str, List[Tuple[str, str]]] = {}
+        # 固定部分不含完整来源的模板（如主机名中含占位符），对所有 URL 检查
+        self._loose: List[Tuple[str, str]] = []
+
+        seen = set()
+        for template_name, template in templates.items():
+            prefix = template.compiled.prefix
+            if not prefix or prefix in seen:
+                continue
+            seen.add(prefix)
+
+            origin = self._origin(prefix)
+            bucket = self._by_origin.setdefault(origin, []) if origin is not None else self._loose
+            bucket.append((prefix, template_name))
+
+        for bucket in (*self._by_origin.values(), self._loose):
+            bucket.sort(key=lambda item: len(item[0]), reverse=True)
+
+    def lookup(self, url: str) -> Optional[str]:
+        """查找 URL 对应的模板名称
+
+        Args:
+            url: URL 地址（TemplateURL 直接返回其携带的模板名称）
+
+        Returns:
+            Optional[str]: 模板名称，未找到则返回 None
+        """
+        template_name = getattr(url, "template", None)
+        if template_name in self._names:
+            return template_name
+
+        for prefix, template_name in self._by_origin.get(self._origin(url), ()):
+            if url.startswith(prefix):
+                return template_name
+        for prefix, template_name in self._loose:
+            if url.startswith(prefix):
+                return template_name
+        return None
+
+    @staticmethod
+    def _origin(url: str) -> Optional[str]:
+        """取 URL 的来源部分（协议和主机，小写），主机之后没有分隔符时返回 None"""
+        start = url.find("://")
+        if start < 0:
+            return None
+        start += 3
+        end = min((index for index in (url.find(sep, start) for sep in "/?#") if index >= 0), default=-1)
+        if end < 0:
+            return None
+        return url[:end].lower()
+
+
 class URLGenerator:
     """URL生成服务"""
 
@@ -23,7 +105,7 @@ class URLGenerator:
             templates: 核查模板字典
 
         Returns:
-            dict: {主体名称: [URL1, URL2, ...]}
+            dict: {主体名称: [URL1, URL2, ...]}，URL 为携带模板名称的 TemplateURL
         """
         entity_urls = {}
 
@@ -32,13 +114,13 @@ class URLGenerator:
             for template_name, template in templates.items():
                 try:
                     # 过滤掉人工核查的模板（URL 模式中不包含 {} 占位符的模板）
-                    if template.category == 'manual' or "{}" not in template.url_pattern:
+                    if template.category == 'manual' or template.compiled.parts is None:
                         logger.debug(f"跳过人工核查模板: {template_name}")
                         continue
 
                     url = URLGenerator._generate_single_url(entity, template)
                     if url:
-                        urls.append(url)
+                        urls.append(TemplateURL(url, template_name))
                         logger.debug(f"生成 URL: {url}")
                 except Exception as e:
                     logger.error(f"为主体 '{entity}' 生成模板 '{template_name}' 的URL失败: {e}")
@@ -96,12 +178,8 @@ class URLGenerator:
         for entity in entities:
             for template_name, template in manual_templates.items():
                 try:
-                    if "{}" in template.url_pattern:
-                        # 如果 URL 模式包含 {} 占位符，则替换它
-                        url = URLGenerator._generate_single_url(entity, template)
-                    else:
-                        # 如果 URL 模式不包含 {} 占位符，则直接使用原始 URL
-                        url = template.url_pattern
+                    # URL 模式包含 {} 占位符时替换为主体名称，否则直接使用原始 URL
+                    url = template.compiled.render(entity)
 
                     if url:
                         manual_urls.append({
@@ -128,16 +206,14 @@ class URLGenerator:
         Returns:
             str: 生成的URL
         """
-        if not template.url_pattern or "{}" not in template.url_pattern:
+        compiled = template.compiled
+        if compiled.parts is None:
             logger.warning(f"模板 '{template.name}' 的URL模式无效: {template.url_pattern}")
             return ""
 
         # 对主体名称进行URL编码
         try:
-            import urllib.parse
-            encoded_entity = urllib.parse.quote(str(entity))
-            url = template.url_pattern.replace("{}", encoded_entity)
-            return url
+            return compiled.render(entity)
         except Exception as e:
             logger.error(f"编码主体名称 '{entity}' 失败: {e}")
             return ""
@@ -4,70 +4,218 @@
 负责异步执行网页核查任务
 """
 import asyncio
-from typing import Dict, List, Optional
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 from pathlib import Path
+from everify.common.file import extract_domain
 from everify.core.utils import logger
-from everify.core.base.browser import BrowserEngine, PlaywrightBrowser
+from everify.core.base.browser import BrowserEngine, BrowserPool, ResourceStats
+from everify.core.base.rate_limiter import HostRateLimiter, shared_rate_limiter
+from everify.core.services.result_cache import ResultCache
+from everify.core.services.url_generator import TemplatePrefixIndex
+from everify.core.utils.config import VerifyTemplate
+
+# 主体全部 URL 核查完成时的回调：(主体名称, {URL: 截图路径或截图字节})
+EntityCompleteCallback = Callable[[str, Dict[str, Union[str, bytes]]], None]
+
+
+class VerifyEvent:
+    """核查事件，核查过程中按完成顺序产生"""
+
+    URL_DONE = "url_done"
+    ENTITY_DONE = "entity_done"
+    # 报告生成阶段的事件：主体报告已生成（或生成失败）
+    REPORT_READY = "report_ready"
+
+    def __init__(
+        self,
+        event_type: str,
+        entity: str,
+        url: Optional[str] = None,
+        result: Union[str, bytes, None] = None,
+        results: Optional[Dict[str, Union[str, bytes]]] = None,
+        template: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        failed: int = 0
+    ):
+        self.type = event_type
+        self.entity = entity
+        self.url = url
+        self.result = result
+        self.results = results
+        self.template = template
+        # URL 核查耗时（秒），使用缓存截图时为 None
+        self.elapsed = elapsed
+        # entity_done：核查失败的 URL 数（失败的 URL 不包含在 results 中）
+        self.failed = failed
+
+    def to_dict(self) -> Dict:
+        def describe(value: Union[str, bytes, None]) -> Optional[str]:
+            # 内存流水线中的截图字节不序列化
+            if isinstance(value, bytes):
+                return f"<{len(value)} 字节>" if value else ""
+            return value
+
+        data = {
+            'type': self.type,
+            'entity': self.entity
+        }
+        if self.type == self.URL_DONE:
+            data.update({
+                'url': self.url,
+                'template': self.template,
+                'success': bool(self.result),
+                'screenshot': describe(self.result),
+                'cached': self.elapsed is None,
+                'elapsed_ms': round(self.elapsed * 1000) if self.elapsed is not None else None
+            })
+        elif self.type == self.REPORT_READY:
+            data.update({
+                'success': bool(self.result),
+                'report': self.result
+            })
+        else:
+            data.update({
+                'success_count': len([r for r in self.results.values() if r]),
+                'failed_count': self.failed + len([r for r in self.results.values() if not r]),
+                'screenshots': {url: describe(r) for url, r in self.results.items()}
+            })
+        return data
+
+    @classmethod
+    def url_done(cls, entity: str, url: str, result: Union[str, bytes], template: Optional[str] = None,
+                 elapsed: Optional[float] = None) -> 'VerifyEvent':
+        return cls(cls.URL_DONE, entity, url=url, result=result, template=template, elapsed=elapsed)
+
+    @classmethod
+    def entity_done(cls, entity: str, results: Dict[str, Union[str, bytes]], failed: int = 0) -> 'VerifyEvent':
+        return cls(cls.ENTITY_DONE, entity, results=results, failed=failed)
+
+    @classmethod
+    def report_ready(cls, entity: str, report_path: Optional[Union[str, Path]]) -> 'VerifyEvent':
+        return cls(cls.REPORT_READY, entity, result=str(report_path) if report_path else "")
+
+
+# 网站的在途页面可能被其他核查任务占用，其释放不会通知本队列，因此定期重试
+INFLIGHT_POLL_SECONDS = 0.5
+
+
+class _HostWorkQueue:
+    """按网站分组的工作队列 - 某个网站达到访问限制时，先取其他网站的任务"""
+
+    def __init__(self, limiter: HostRateLimiter, default_limit: Optional[Any] = None):
+        self.limiter = limiter
+        self.default_limit = default_limit
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._condition = asyncio.Condition()
+        self.size = 0
+
+    def put(self, item: Tuple[str, str, Optional[VerifyTemplate]]) -> None:
+        """加入一个 (主体, URL, 模板) 工作项"""
+        template = item[2]
+        # 模板编译时已解析出域名，域名含占位符的模板再从 URL 解析
+        host = (template.compiled.host if template is not None else None) or extract_domain(item[1])
+        self._queues.setdefault(host, deque()).append(item)
+        self.size += 1
+
+    async def get(self) -> Optional[Tuple[str, Tuple[str, str, Optional[VerifyTemplate]]]]:
+        """取出一个当前允许访问的工作项，所有工作项都已取出时返回 None
+
+        Returns:
+            Optional[tuple]: (网站域名, 工作项)
+        """
+        async with self._condition:
+            while self._queues:
+                retry_after = None
+                for host in list(self._queues):
+                    items = self._queues[host]
+                    template = items[0][2]
+                    limit = (template.compiled.rate_limit if template else None) or self.default_limit
+                    wait = self.limiter.try_acquire(host, limit)
+                    if wait == 0:
+                        item = items.popleft()
+                        if items:
+                            # 轮转到队尾，使各网站交替出队
+                            self._queues.move_to_end(host)
+                        else:
+                            del self._queues[host]
+                        self.size -= 1
+                        return host, item
+                    if wait is not None:
+                        retry_after = wait if retry_after is None else min(retry_after, wait)
+
+                # 所有网站都已饱和：等待页面释放或令牌补充
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait(),
+                        timeout=INFLIGHT_POLL_SECONDS if retry_after is None else min(retry_after, INFLIGHT_POLL_SECONDS)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            return None
+
+    async def done(self, host: str) -> None:
+        """工作项完成，释放该网站的访问名额"""
+        self.limiter.release(host)
+        async with self._condition:
+            self._condition.notify_all()
 
 
 class VerifyService:
     """网页核查服务"""
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, rate_limiter: Optional[HostRateLimiter] = None):
         """初始化核查服务
 
         Args:
             config: 配置对象
+            rate_limiter: 按网站限流器（可选），默认使用进程内共享的限流器，使并发的核查任务共同遵守访问限制
         """
         self.config = config
+        self.rate_limiter = rate_limiter or shared_rate_limiter()
         self.browser: Optional[BrowserEngine] = None
 
-    async def verify_single_entity(self, entity: str, urls: List[str]) -> Dict[str, str]:
+    async def verify_single_entity(
+        self,
+        entity: str,
+        urls: List[str],
+        pool: Optional[BrowserPool] = None,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
+    ) -> Dict[str, str]:
         """核查单个主体的所有 URL
 
         Args:
             entity: 主体名称
             urls: 需要核查的 URL 列表
+            pool: 共享的浏览器池（未提供时单独启动一个）
+            templates: 核查模板字典（用于读取各网页的就绪条件）
 
         Returns:
             dict: {URL: 截图路径}
         """
-        results = {}
-
-        # 创建浏览器实例
-        browser = PlaywrightBrowser(browser_config=self.config.browser)
-
-        try:
-            async with browser:
-                # 检查浏览器页面是否成功初始化
-                if not browser.page:
-                    logger.error(f"浏览器页面未初始化，无法核查主体 '{entity}'")
-                    return results
-
-                for url in urls:
-                    try:
-                        screenshot_path = await self._verify_single_url(entity, url, browser)
-                        if screenshot_path:
-                            results[url] = screenshot_path
-                    except Exception as e:
-                        logger.error(f"核查URL '{url}' 失败: {e}")
-                        results[url] = ""
-        except Exception as e:
-            logger.error(f"浏览器引擎初始化失败: {e}")
-
-        logger.info(f"主体 '{entity}' 核查完成，成功 {len([p for p in results.values() if p])} 个，失败 {len([p for p in results.values() if not p])} 个")
-        return results
-
-    async def _verify_single_url(self, entity: str, url: str, browser: BrowserEngine) -> str:
+        results = await self._run(entity_urls={entity: urls}, templates=templates, pool=pool)
+        return results.get(entity, {})
+
+    async def _verify_single_url(
+        self,
+        entity: str,
+        url: str,
+        browser: BrowserEngine,
+        template: Optional[VerifyTemplate] = None,
+        cache: Optional[ResultCache] = None
+    ) -> Union[str, bytes]:
         """核查单个URL并截图
 
         Args:
             entity: 主体名称
             url: URL地址
             browser: 浏览器引擎实例
+            template: URL 对应的核查模板（用于读取页面就绪条件）
+            cache: 本次核查的结果缓存（可选），成功的截图写入缓存
 
         Returns:
-            str: 截图路径
+            Union[str, bytes]: 截图路径；开启内存流水线时为 PNG 字节
         """
         # 创建输出目录 - 直接使用配置的截图文件夹，不创建子文件夹
         screenshot_dir = self.config.screenshots_dir
@@ -88,68 +236,354 @@ class VerifyService:
                 return ""
 
             # 导航到URL并截图
-            await browser.navigate(url)
-            await browser.screenshot(str(screenshot_path))
+            compiled = template.compiled if template else None
+            await browser.set_resource_policy(compiled.resource_policy if compiled else None)
+            navigated = await browser.navigate(
+                url,
+                readiness=compiled.readiness if compiled else None,
+                max_wait_ms=compiled.max_wait_ms if compiled else None
+            )
+            stability = compiled.stability if compiled else None
+            if self.config.in_memory_pipeline:
+                data = await browser.screenshot_bytes(stability=stability)
+                if data and self.config.archive_screenshots:
+                    screenshot_path.write_bytes(data)
+                    logger.debug(f"URL '{url}' 原始截图已归档: {screenshot_path}")
+                    # 导航失败时截到的是错误页面，不缓存
+                    if navigated and cache:
+                        cache.put(self._cache_scope(url, template), entity, str(screenshot_path))
+                return data
+
+            await browser.screenshot(str(screenshot_path), stability=stability)
             logger.debug(f"URL '{url}' 截图成功: {screenshot_path}")
+            # 导航失败时截到的是错误页面，截图失败时文件不存在，两种情况都不缓存
+            if navigated and cache and screenshot_path.exists():
+                cache.put(self._cache_scope(url, template), entity, str(screenshot_path))
             return str(screenshot_path)
         except Exception as e:
             logger.error(f"URL '{url}' 截图失败: {e}")
             return ""
 
-    async def process_all_entities(self, entity_urls: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+    async def process_all_entities(
+        self,
+        entity_urls: Dict[str, List[str]],
+        templates: Optional[Dict[str, VerifyTemplate]] = None,
+        on_entity_complete: Optional[EntityCompleteCallback] = None
+    ) -> Dict[str, Dict[str, str]]:
         """处理所有需要核查的主体
 
+        所有 (主体, URL) 组合被展平到同一个工作队列中，由固定数量的页面 worker
+        以滑动窗口方式消费，单个慢页面只占用一个 worker，不会阻塞其他主体。
+
         Args:
             entity_urls: {主体名称: [URL1, URL2, ...]}
+            templates: 核查模板字典（用于读取各网页的就绪条件）
+            on_entity_complete: 某个主体的 URL 全部核查完成时立即调用（如交给后台报告 worker）
 
         Returns:
-            dict: {主体名称: {URL: 截图路径}}
+            dict: {主体名称: {URL: 截图路径}}（开启内存流水线时值为 PNG 字节）
         """
-        results = {}
-
-        # 创建任务列表
-        tasks = []
-        for entity, urls in entity_urls.items():
-            task = self.verify_single_entity(entity, urls)
-            tasks.append(task)
+        return await self._run(entity_urls, templates=templates, on_entity_complete=on_entity_complete)
+
+    async def verify_batch(
+        self,
+        entity_urls: Dict[str, List[str]],
+        batch_size: int = 5,
+        templates: Optional[Dict[str, VerifyTemplate]] = None
+    ) -> Dict[str, Dict[str, str]]:
+        """批量核查主体，控制并发数量
 
-        # 并发执行所有任务
-        task_results = await asyncio.gather(*tasks)
+        Args:
+            entity_urls: {主体名称: [URL1, URL2, ...]}
+            batch_size: 同时打开的页面数（worker 数量），批次之间不再等待
+            templates: 核查模板字典（用于读取各网页的就绪条件）
 
-        # 整理结果
-        for i, entity in enumerate(entity_urls.keys()):
-            results[entity] = task_results[i]
+        Returns:
+            dict: {主体名称: {URL: 截图路径}}
+        """
+        return await self._run(entity_urls, templates=templates, workers=batch_size)
+
+    async def iter_results(
+        self,
+        entity_urls: Dict[str, List[str]],
+        templates: Optional[Dict[str, VerifyTemplate]] = None,
+        workers: Optional[int] = None,
+        pool: Optional[BrowserPool] = None,
+        resource_stats: Optional[ResourceStats] = None
+    ) -> AsyncIterator[VerifyEvent]:
+        """按完成顺序逐个产生核查事件（类似 as_completed）
+
+        每个 URL 核查完成产生一个 url_done 事件（失败时结果为空字符串），主体的全部 URL 完成后再产生一个
+        entity_done 事件，其结果只包含成功的 URL，失败数记录在 failed 中。
+        已产生 entity_done 的主体结果不再由核查服务持有，调用方可以边核查边消费。
 
-        return results
+        Args:
+            entity_urls: {主体名称: [URL1, URL2, ...]}
+            templates: 核查模板字典（用于读取各网页的就绪条件）
+            workers: 页面 worker 数量（默认取配置，0 表示等于浏览器池容量）
+            pool: 已启动的浏览器池（未提供时单独启动一个）
+            resource_stats: 接收本次核查请求拦截统计的对象（可选，由调用方持有，并发核查互不影响）
 
-    async def verify_batch(self, entity_urls: Dict[str, List[str]], batch_size: int = 5) -> Dict[str, Dict[str, str]]:
-        """批量核查主体，控制并发数量
+        Yields:
+            VerifyEvent: 核查事件
+        """
+        if pool is None:
+            async with BrowserPool(self.config.browser) as own_pool:
+                async for event in self.iter_results(
+                    entity_urls, templates, workers=workers, pool=own_pool, resource_stats=resource_stats
+                ):
+                    yield event
+            return
+
+        if resource_stats is None:
+            resource_stats = ResourceStats()
+
+        if workers is None:
+            workers = self.config.browser.page_workers
+        workers = min(workers or pool.capacity, pool.capacity)
+
+        events: asyncio.Queue = asyncio.Queue()
+        # 每次核查重新读取缓存索引，与其他操作写入的结果保持一致（只在本次核查中使用，不保存在服务上）
+        cache = ResultCache.from_app_config(self.config)
+
+        async def produce() -> None:
+            try:
+                await self._drain_work_queue(
+                    entity_urls, templates, pool, workers, events.put_nowait, resource_stats, cache
+                )
+            finally:
+                events.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            # 传递核查过程中的异常
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+            cache.save()
+
+        if resource_stats.blocked_requests:
+            logger.info(f"本次核查{resource_stats.summary()}")
+
+    async def _run(
+        self,
+        entity_urls: Dict[str, List[str]],
+        templates: Optional[Dict[str, VerifyTemplate]] = None,
+        workers: Optional[int] = None,
+        pool: Optional[BrowserPool] = None,
+        on_entity_complete: Optional[EntityCompleteCallback] = None,
+        resource_stats: Optional[ResourceStats] = None
+    ) -> Dict[str, Dict[str, str]]:
+        """消费核查事件并汇总为按主体分组的结果
 
         Args:
             entity_urls: {主体名称: [URL1, URL2, ...]}
-            batch_size: 批次大小
+            templates: 核查模板字典
+            workers: 页面 worker 数量（默认取配置，0 表示等于浏览器池容量）
+            pool: 已启动的浏览器池
+            on_entity_complete: 主体核查完成回调
+            resource_stats: 接收本次核查请求拦截统计的对象（可选）
 
         Returns:
             dict: {主体名称: {URL: 截图路径}}
         """
-        results = {}
-        entities = list(entity_urls.keys())
+        results: Dict[str, Dict[str, str]] = {}
+        async for event in self.iter_results(
+            entity_urls, templates, workers=workers, pool=pool, resource_stats=resource_stats
+        ):
+            if event.type != VerifyEvent.ENTITY_DONE:
+                continue
+            results[event.entity] = event.results
+            if on_entity_complete is not None:
+                try:
+                    on_entity_complete(event.entity, event.results)
+                except Exception as e:
+                    logger.error(f"主体 '{event.entity}' 核查完成回调失败: {e}")
+
+        # 按原始主体顺序返回
+        return {entity: results[entity] for entity in entity_urls if entity in results}
+
+    async def _drain_work_queue(
+        self,
+        entity_urls: Dict[str, List[str]],
+        templates: Optional[Dict[str, VerifyTemplate]],
+        pool: BrowserPool,
+        workers: int,
+        emit: Callable[[VerifyEvent], None],
+        resource_stats: Optional[ResourceStats] = None,
+        cache: Optional[ResultCache] = None
+    ) -> None:
+        """将 (主体, URL) 展平为工作队列，由 worker 并发消费，并按完成顺序发出核查事件
+
+        每个网站受令牌桶和在途页面数限制，某个网站饱和时 worker 会先处理其他网站的任务。
 
-        for i in range(0, len(entities), batch_size):
-            batch = entities[i:i+batch_size]
-            logger.info(f"处理批次 {i//batch_size + 1}/{(len(entities) + batch_size - 1)//batch_size}，包含 {len(batch)} 个主体")
+        Args:
+            entity_urls: {主体名称: [URL1, URL2, ...]}
+            templates: 核查模板字典（只在本次核查中使用，不保存在服务上，并发核查互不影响）
+            pool: 浏览器池
+            workers: 页面 worker 数量
+            emit: 事件接收函数
+            resource_stats: 本次核查的请求拦截统计
+            cache: 本次核查的结果缓存（可选）
+        """
+        index = TemplatePrefixIndex(templates) if templates else None
+        queue = _HostWorkQueue(self.rate_limiter, self.config.browser.rate_limit)
+        # 只收集成功的截图，失败的 URL 只计数（与逐个主体核查时的结果格式一致）
+        collected: Dict[str, Dict[str, str]] = {entity: {} for entity in entity_urls}
+        failed = {entity: 0 for entity in entity_urls}
+        remaining = {entity: len(urls) for entity, urls in entity_urls.items()}
+        cached = 0
+
+        for entity, urls in entity_urls.items():
+            for url in urls:
+                template = self._resolve_template(url, templates, index)
+                # 有效期内已有截图的直接复用，不再访问网页
+                result = self._cached_result(entity, url, template, cache)
+                if result:
+                    collected[entity][url] = result
+                    emit(VerifyEvent.url_done(entity, url, result, template.name if template else None))
+                    remaining[entity] -= 1
+                    cached += 1
+                else:
+                    queue.put((entity, url, template))
+        if cached:
+            logger.info(f"{cached} 个 URL 使用缓存的截图")
+
+        def entity_done(entity: str) -> None:
+            # 按原始 URL 顺序整理结果，之后不再持有该主体的结果
+            entity_results = collected.pop(entity)
+            emit(VerifyEvent.entity_done(
+                entity,
+                {url: entity_results[url] for url in entity_urls[entity] if url in entity_results},
+                failed.pop(entity)
+            ))
+
+        # 没有 URL 的主体直接视为已完成
+        for entity, count in remaining.items():
+            if count == 0:
+                entity_done(entity)
+
+        async def worker() -> None:
+            while True:
+                picked = await queue.get()
+                if picked is None:
+                    return
+
+                host, (entity, url, template) = picked
+                started = time.monotonic()
+                try:
+                    result = await self._verify_work_item(entity, url, template, pool, resource_stats, cache)
+                finally:
+                    await queue.done(host)
+
+                if result:
+                    collected[entity][url] = result
+                else:
+                    failed[entity] += 1
+                emit(VerifyEvent.url_done(
+                    entity, url, result, template.name if template else None, time.monotonic() - started
+                ))
+
+                remaining[entity] -= 1
+                if remaining[entity] == 0:
+                    logger.info(f"主体 '{entity}' 核查完成，成功 {len(collected[entity])} 个，失败 {failed[entity]} 个")
+                    entity_done(entity)
+
+        total = queue.size
+        logger.info(f"共 {total} 个核查任务，使用 {min(workers, total)} 个页面 worker")
+        await asyncio.gather(*(worker() for _ in range(min(workers, total))))
+
+    async def _verify_work_item(
+        self,
+        entity: str,
+        url: str,
+        template: Optional[VerifyTemplate],
+        pool: BrowserPool,
+        resource_stats: Optional[ResourceStats] = None,
+        cache: Optional[ResultCache] = None
+    ) -> Union[str, bytes]:
+        """租借一个独立上下文核查单个工作项
+
+        Args:
+            entity: 主体名称
+            url: URL地址
+            template: URL 对应的核查模板
+            pool: 浏览器池
+            resource_stats: 本次核查的请求拦截统计
+            cache: 本次核查的结果缓存（可选）
+
+        Returns:
+            Union[str, bytes]: 截图路径或 PNG 字节（失败时为空字符串）
+        """
+        try:
+            async with pool.lease(resource_stats) as browser:
+                return await self._verify_single_url(entity, url, browser, template, cache)
+        except Exception as e:
+            logger.error(f"核查URL '{url}' 失败: {e}")
+            return ""
 
-            # 创建批次任务
-            tasks = []
-            for entity in batch:
-                task = self.verify_single_entity(entity, entity_urls[entity])
-                tasks.append(task)
+    def _cached_result(
+        self,
+        entity: str,
+        url: str,
+        template: Optional[VerifyTemplate],
+        cache: Optional[ResultCache]
+    ) -> Optional[str]:
+        """从结果缓存中取截图
 
-            # 执行批次任务
-            batch_results = await asyncio.gather(*tasks)
+        内存流水线模式下同样返回截图路径，报告生成时从文件读取并保留原始截图时间。
 
-            # 保存结果
-            for j, entity in enumerate(batch):
-                results[entity] = batch_results[j]
+        Args:
+            entity: 主体名称
+            url: URL地址
+            template: URL 对应的核查模板
+            cache: 本次核查的结果缓存
+
+        Returns:
+            Optional[str]: 截图路径，未命中时返回 None
+        """
+        entry = cache.get(self._cache_scope(url, template), entity) if cache else None
+        if entry is None:
+            return None
+
+        logger.debug(f"URL '{url}' 使用缓存截图: {entry['screenshot']}")
+        return entry["screenshot"]
+
+    @staticmethod
+    def _cache_scope(url: str, template: Optional[VerifyTemplate]) -> str:
+        """结果缓存的网页范围：模板名称加 URL 模式（修改模板后自动失效），无模板时使用 URL"""
+        if template is not None:
+            return template.compiled.cache_scope
+        return url
+
+    @staticmethod
+    def _resolve_template(
+        url: str,
+        templates: Optional[Dict[str, VerifyTemplate]],
+        index: Optional[TemplatePrefixIndex]
+    ) -> Optional[VerifyTemplate]:
+        """根据URL查找对应的核查模板（TemplateURL 直接使用携带的模板名称，否则查前缀索引）
+
+        Args:
+            url: URL地址
+            templates: 核查模板字典
+            index: 由 templates 建立的前缀索引
+
+        Returns:
+            Optional[VerifyTemplate]: 匹配的模板，未找到则返回 None
+        """
+        if not templates or index is None:
+            return None
 
-        return results
+        template_name = index.lookup(url)
+        return templates[template_name] if template_name is not None else None
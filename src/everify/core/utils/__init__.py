@@ -2,7 +2,7 @@
 核心工具模块
 """
 from .logger import setup_logging, get_logger, logger
-from .config import config, AppConfig, BrowserConfig, WatermarkConfig, VerifyTemplate
+from .config import config, AppConfig, BrowserConfig, WatermarkConfig, EmbedProfileConfig, ResultCacheConfig, ManualWatchConfig, GuidedCaptureConfig, ReadinessConfig, StabilityConfig, RateLimitConfig, ResourcePolicyConfig, VerifyTemplate
 
 __all__ = [
     "setup_logging",
@@ -12,5 +12,13 @@ __all__ = [
     "AppConfig",
     "BrowserConfig",
     "WatermarkConfig",
+    "EmbedProfileConfig",
+    "ResultCacheConfig",
+    "ManualWatchConfig",
+    "GuidedCaptureConfig",
+    "ReadinessConfig",
+    "StabilityConfig",
+    "RateLimitConfig",
+    "ResourcePolicyConfig",
     "VerifyTemplate"
 ]
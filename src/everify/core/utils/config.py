@@ -1,8 +1,8 @@
 """
 配置管理模块
 """
-from typing import Dict, List, Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, PrivateAttr
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -13,6 +13,44 @@ load_dotenv()
 logger = None
 
 
+class StabilityConfig(BaseModel):
+    """截图视觉稳定检测配置 - 连续低分辨率采样帧不再变化时才正式截图
+
+    默认关闭：截图前固定等待 budget_ms；开启后页面一旦稳定即提前截图，最长同样等待 budget_ms
+    """
+    enabled: bool = False
+    interval_ms: int = 200  # 采样间隔（毫秒）
+    stable_frames: int = 2  # 连续多少次采样无变化视为稳定
+    budget_ms: int = 2000  # 最长等待时间（毫秒），超时后直接截图；关闭检测时为固定等待时间
+    frame_scale: float = 0.25  # 采样帧缩放比例（仅 Chromium 的 CDP 采样生效）
+    frame_quality: int = 30  # 采样帧 JPEG 质量
+
+
+class RateLimitConfig(BaseModel):
+    """单个网站的访问限制 - 令牌桶限制请求速率，并限制同时打开的页面数"""
+    rate: float = Field(default=1.0, ge=0)  # 每秒补充的令牌数（平均每秒请求数），0 表示不限速率
+    burst: int = Field(default=2, ge=1)  # 令牌桶容量（允许的突发请求数），至少为 1，否则永远攒不到令牌
+    max_inflight: int = Field(default=2, ge=0)  # 同时打开的页面数上限，0 表示不限制
+
+
+class ResourcePolicyConfig(BaseModel):
+    """请求拦截策略 - 拦截音视频和统计脚本等不影响截图内容的重资源
+
+    默认不拦截字体：图标字体和中文网页字体被拦截后会显示为方框，改变作为核查证据的截图；
+    确认不影响截图的模板可以在自己的拦截策略中加入 "font"
+    """
+    enabled: bool = True
+    blocked_resource_types: List[str] = ["media"]  # Playwright 资源类型
+    blocked_url_patterns: List[str] = [  # URL 中包含任一片段即拦截
+        "hm.baidu.com",
+        "cnzz.com",
+        "51.la",
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+    ]
+
+
 class BrowserConfig(BaseModel):
     """浏览器配置"""
     headless: bool = True
@@ -20,6 +58,18 @@ class BrowserConfig(BaseModel):
     timeout: int = 30000
     user_agent: Optional[str] = None
     proxy: Optional[str] = None
+    # 浏览器池配置
+    pool_size: int = 1  # 常驻 Chromium 进程数
+    contexts_per_browser: int = 4  # 每个进程同时租出的 BrowserContext 上限
+    reuse_contexts: bool = False  # 归还后清理 cookies 并复用上下文，而不是关闭重建
+    recycle_after: int = 200  # 单个进程累计租出多少次后重启以释放内存，0 表示不回收
+    page_workers: int = 0  # 并发核查的页面 worker 数，0 表示等于浏览器池容量
+    # 截图前的视觉稳定检测（模板可单独覆盖）
+    stability: StabilityConfig = StabilityConfig()
+    # 每个网站的默认访问限制（模板可单独覆盖）
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    # 全局请求拦截策略（模板可单独覆盖）
+    resource_policy: ResourcePolicyConfig = ResourcePolicyConfig()
 
 
 class WatermarkConfig(BaseModel):
@@ -29,8 +79,50 @@ class WatermarkConfig(BaseModel):
     color: str = "#808080"
     opacity: float = 0.5
     position: str = "bottom_right"
+    workers: int = 0  # 批量加水印的并行进程数，0 表示使用 CPU 核数
+
+
+class ResultCacheConfig(BaseModel):
+    """核查结果缓存配置 - 有效期内再次核查同一主体的同一网页时直接复用截图
+
+    默认关闭：复用的截图不反映网页的最新状态，需要时显式开启
+    """
+    enabled: bool = False
+    ttl_hours: float = Field(default=24, gt=0)
+    max_entries: int = 5000
 
 
+class ManualWatchConfig(BaseModel):
+    """人工截图实时插入配置 - 监视截图目录，新截图到达后立即插入对应报告"""
+    use_watchdog: bool = True  # 安装了 watchdog 时使用系统文件事件，否则轮询目录
+    poll_interval: float = 1.0  # 轮询目录的间隔（秒）
+    settle_seconds: float = 0.5  # 文件最后修改后经过多久才视为写入完成（秒）
+    debounce_seconds: float = 3.0  # 最后一次插入后经过多久保存报告（秒）
+
+
+class GuidedCaptureConfig(BaseModel):
+    """引导式人工截图配置 - 有界面浏览器预先在后台标签页打开后续网页，按快捷键或按钮截图"""
+    preload_tabs: int = 3  # 同时打开的标签页数（含当前页）
+    capture_key: str = "F8"  # 截图快捷键
+    skip_key: str = "F9"  # 跳过快捷键
+    full_page: bool = False  # 是否截取整页（默认截取可见区域）
+
+
+class EmbedProfileConfig(BaseModel):
+    """报告嵌入图片配置 - 插入 docx 前按显示尺寸缩放并重新压缩，存档的原图不受影响"""
+    enabled: bool = True
+    width_inches: float = 6.0  # 图片在报告中的显示宽度
+    target_dpi: int = 200
+    format: str = "JPEG"  # JPEG 或 PNG（PNG 会量化为 256 色调色板）
+    quality: int = 85  # JPEG 压缩质量
+
+
+class ReadinessConfig(BaseModel):
+    """页面就绪条件 - 已配置的条件全部满足即视为就绪，max_wait_ms 为等待上限"""
+    wait_selector: Optional[str] = None  # 等待出现的元素选择器
+    network_idle_ms: Optional[int] = None  # 无网络请求持续多久（毫秒）视为就绪
+    dom_quiet_ms: Optional[int] = None  # DOM 无变化持续多久（毫秒）视为就绪
+    max_wait_ms: Optional[int] = None  # 最长等待时间（毫秒），未配置时按网站使用默认上限
 
 
 class VerifyTemplate(BaseModel):
@@ -40,6 +132,40 @@ class VerifyTemplate(BaseModel):
     url_pattern: str
     category: str = "general"
     InsertContext: str = "网页核查"
+    readiness: Optional[ReadinessConfig] = None
+    stability: Optional[StabilityConfig] = None
+    rate_limit: Optional[RateLimitConfig] = None
+    resource_policy: Optional[ResourcePolicyConfig] = None
+    # 预编译结果（CompiledTemplate），修改任一字段或复制模板后失效；嵌套配置由编译结果直接引用，修改后无需失效
+    _compiled: Optional[Any] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._compiled = None
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "VerifyTemplate":
+        """复制模板（update 直接写入字段，不经过 __setattr__，因此复制后丢弃原模板的编译结果）"""
+        copied = super().model_copy(update=update, deep=deep)
+        copied._compiled = None
+        return copied
+
+    def compile(self) -> Any:
+        """预编译模板（TemplateManager 加载模板时调用）
+
+        Returns:
+            CompiledTemplate: 预编译的模板
+        """
+        from everify.core.utils.template import CompiledTemplate
+        self._compiled = CompiledTemplate(self)
+        return self._compiled
+
+    @property
+    def compiled(self) -> Any:
+        """预编译的模板，未编译时立即编译"""
+        # 直接读取私有属性字典，避免经过 BaseModel.__getattr__（核查和报告生成中频繁访问）
+        compiled = self.__pydantic_private__.get("_compiled")
+        return compiled if compiled is not None else self.compile()
 
 
 from pathlib import Path
@@ -68,6 +194,15 @@ class AppConfig(BaseModel):
     temp_dir: Path = Path("output") / "temp"
     templates: Dict[str, VerifyTemplate] = {}
     templates_path: Optional[Path] = None
+    # 截图处理流水线：开启后截图以字节形式从浏览器经水印直达 docx，不经磁盘中转
+    in_memory_pipeline: bool = False
+    archive_screenshots: bool = True  # 内存流水线下是否仍将原始截图保存到截图目录
+    embed: EmbedProfileConfig = EmbedProfileConfig()
+    result_cache: ResultCacheConfig = ResultCacheConfig()
+    manual_watch: ManualWatchConfig = ManualWatchConfig()
+    guided_capture: GuidedCaptureConfig = GuidedCaptureConfig()
+    report_workers: int = 1  # 并行生成报告的进程数，1 表示在当前进程逐个生成，0 表示使用 CPU 核数
+    job_workers: int = 1  # 网页端同时运行的后台任务数，超出的任务排队等待
     # 搜索引擎查询配置
     search_keywords: List[str] = ['舆情', '查封', '冻结', '收购']
 
@@ -0,0 +1,92 @@
+"""
+核查模板预编译模块
+加载模板时一次性算出核查和报告生成中反复用到的信息，同时提供页面等待上限的默认值
+"""
+import urllib.parse
+from typing import Any
+from everify.common.file import extract_domain
+
+# 未配置就绪条件时各网站的等待上限（毫秒），原先的固定等待时间仅作为兜底
+FALLBACK_MAX_WAIT_MS = {
+    "nea.gov.cn": 15000,  # 国家能源局网站
+    "samr.gov.cn": 8000,  # 国家市场监督管理总局网站
+}
+DEFAULT_MAX_WAIT_MS = 2000
+
+
+def fallback_max_wait_ms(url: str) -> int:
+    """未配置上限时按网站取默认等待上限
+
+    Args:
+        url: URL 地址或 URL 模式
+
+    Returns:
+        int: 等待上限（毫秒）
+    """
+    for host, wait_ms in FALLBACK_MAX_WAIT_MS.items():
+        if host in url:
+            return wait_ms
+    return DEFAULT_MAX_WAIT_MS
+
+
+class CompiledTemplate:
+    """预编译的核查模板
+
+    加载模板时一次性算出核查和报告生成中反复用到的信息：URL 模式按 {} 拆分后的各段、网站域名
+    （同时是限流分组）、主体名称编码方式和报告章节，使用时直接读取。就绪条件、视觉稳定检测等嵌套配置
+    直接引用模板上的对象，页面等待上限在读取时由就绪条件算出，修改嵌套配置后无需重新编译。
+    """
+
+    __slots__ = (
+        "name", "url_pattern", "parts", "prefix", "suffix", "host", "encode",
+        "readiness", "fallback_max_wait_ms", "stability", "resource_policy", "rate_limit", "chapter", "cache_scope"
+    )
+
+    def __init__(self, template: Any):
+        """编译模板
+
+        Args:
+            template: 核查模板（VerifyTemplate）
+        """
+        self.name = template.name
+        self.url_pattern = template.url_pattern
+        # 不含 {} 占位符的模板（人工核查网页）parts 为 None，URL 即 URL 模式本身
+        self.parts = tuple(template.url_pattern.split("{}")) if "{}" in template.url_pattern else None
+        self.prefix = self.parts[0] if self.parts else None
+        self.suffix = self.parts[-1] if self.parts else None
+        self.encode = urllib.parse.quote
+
+        # 占位符位于域名中时（如 https://{}.example.com）无法预先确定域名，核查时再从 URL 解析
+        fixed = self.prefix if self.parts else template.url_pattern
+        host_known = not self.parts or any(sep in fixed.partition("://")[2] for sep in "/?#")
+        self.host = (extract_domain(fixed) or None) if host_known else None
+
+        self.readiness = template.readiness
+        self.fallback_max_wait_ms = fallback_max_wait_ms(template.url_pattern)
+        self.stability = template.stability
+        self.resource_policy = template.resource_policy
+        self.rate_limit = template.rate_limit
+        self.chapter = template.InsertContext
+        # 结果缓存的网页范围：模板名称加 URL 模式（修改模板后自动失效）
+        self.cache_scope = f"{template.name}:{template.url_pattern}"
+
+    @property
+    def max_wait_ms(self) -> int:
+        """页面等待上限（毫秒）：就绪条件中配置的上限，未配置时按网站取默认值"""
+        readiness = self.readiness
+        if readiness is not None and readiness.max_wait_ms:
+            return readiness.max_wait_ms
+        return self.fallback_max_wait_ms
+
+    def render(self, entity: str) -> str:
+        """生成主体对应的 URL
+
+        Args:
+            entity: 主体名称
+
+        Returns:
+            str: URL（主体名称已编码）
+        """
+        if self.parts is None:
+            return self.url_pattern
+        return self.encode(str(entity)).join(self.parts)
@@ -14,6 +14,7 @@ from everify.core.services.template_manager import TemplateManager
 from everify.core.services.url_generator import URLGenerator
 from everify.core.services.verify_service import VerifyService
 from everify.core.services.report_generator import ReportGenerator
+from everify.core.services.run_journal import RunJournal
 from everify.core.operations.operation_factory import OperationFactory
 from everify.core.operations.base_operation import OperationResult
 
@@ -40,11 +41,12 @@ class EverifyApplication:
         # 初始化操作工厂，用于创建不同类型的操作实例
         self.operation_factory = OperationFactory()
 
-    def run(self, entities_file: str = None):
+    def run(self, entities_file: str = None, resume_run_id: str = None):
         """运行应用程序
 
         Args:
             entities_file: 主体列表文件路径（可选）
+            resume_run_id: 要恢复的自动核查运行 ID（可选）
         """
         # 加载模板
         self.templates = self.template_manager.load_templates()
@@ -54,8 +56,13 @@ class EverifyApplication:
 
         logger.info(f"成功加载 {len(self.templates)} 个核查模板")
 
+        # 恢复中断的自动核查：主体和模板取自运行记录，跳过已完成的部分直接生成报告
+        if resume_run_id:
+            if not self._resume_auto_verify(resume_run_id):
+                return
+
         # 获取需要核查的主体
-        if entities_file:
+        elif entities_file:
             self.entities = self.entity_manager.load_entities_from_file(entities_file)
         else:
             self.entities = self.entity_manager.get_entities_from_input()
@@ -128,8 +135,12 @@ class EverifyApplication:
         else:
             logger.info("未选择任何模板")
 
-    def _perform_auto_verify(self):
-        """执行自动核查部分"""
+    def _perform_auto_verify(self, resume_run_id: str = None):
+        """执行自动核查部分
+
+        Args:
+            resume_run_id: 要恢复的运行 ID（可选）
+        """
         # 检查是否选择了模板
         if not self.template_manager.get_selected_templates():
             logger.info("未选择核查模板，请先选择模板（选择选项1）")
@@ -140,7 +151,7 @@ class EverifyApplication:
             self.url_generator, self.verify_service, self.report_generator
         )
         result: OperationResult = auto_verify_operation.execute(
-            self.entities, self.template_manager.get_selected_templates()
+            self.entities, self.template_manager.get_selected_templates(), resume_run_id
         )
 
         if result.success:
@@ -151,6 +162,28 @@ class EverifyApplication:
         else:
             logger.error(result.error)
 
+    def _resume_auto_verify(self, run_id: str) -> bool:
+        """从运行记录恢复自动核查
+
+        Args:
+            run_id: 运行 ID
+
+        Returns:
+            bool: 是否成功恢复
+        """
+        journal = RunJournal.open(self.config.output_dir / "runs", run_id)
+        if journal is None:
+            return False
+
+        self.entities = journal.entities
+        self.template_manager.set_selected_templates({
+            name: self.templates[name] for name in journal.template_names if name in self.templates
+        })
+        logger.info(f"恢复核查记录 {run_id}：{len(self.entities)} 个主体，{len(journal.template_names)} 个模板")
+
+        self._perform_auto_verify(resume_run_id=run_id)
+        return True
+
     def _perform_insert_manual_screenshots(self):
         """执行插入人工核查图片"""
         # 检查是否选择了模板
@@ -176,26 +209,83 @@ class EverifyApplication:
         if screenshot_dir_input:
             self.config.screenshots_dir = Path(screenshot_dir_input)
         logger.info(f"截图将从: {self.config.screenshots_dir} 读取")
-        logger.info("确认已完成截图后，按 Enter 键继续...")
+        manual_screenshot_operation = self.operation_factory.create_manual_screenshot_operation(
+            self.report_generator, self.config
+        )
+
+        logger.info("是否开启实时插入（边截图边插入报告）？输入 y 开启，输入 g 由程序打开浏览器引导截图，"
+                    "直接按 Enter 键在截图完成后统一插入：")
         try:
-            input()
+            mode = input().strip().lower()
         except EOFError:
             logger.warning("未检测到用户输入，返回菜单")
             return
 
-        logger.info("开始插入人工核查截图...")
-        manual_screenshot_operation = self.operation_factory.create_manual_screenshot_operation(
-            self.report_generator, self.config
-        )
-        result: OperationResult = manual_screenshot_operation.execute(
-            self.entities, self.report_paths, self.config.screenshots_dir
-        )
+        if mode == "y":
+            result = self._watch_manual_screenshots(manual_screenshot_operation)
+        elif mode == "g":
+            result = self._guided_manual_screenshots(manual_screenshot_operation)
+        else:
+            logger.info("确认已完成截图后，按 Enter 键继续...")
+            try:
+                input()
+            except EOFError:
+                logger.warning("未检测到用户输入，返回菜单")
+                return
+
+            logger.info("开始插入人工核查截图...")
+            result = manual_screenshot_operation.execute(
+                self.entities, self.report_paths, self.config.screenshots_dir
+            )
 
         if result.success:
             logger.info(result.data['message'])
         else:
             logger.error(result.error)
 
+    def _guided_manual_screenshots(self, manual_screenshot_operation) -> OperationResult:
+        """引导式截图模式：程序依次打开人工核查网页，操作员截图后统一插入报告"""
+        capture_config = self.config.guided_capture
+        logger.info(
+            f"即将打开浏览器，按 {capture_config.capture_key} 截图、{capture_config.skip_key} 跳过，"
+            "关闭浏览器结束截图"
+        )
+        result = manual_screenshot_operation.guided_capture(
+            self.entities, self.template_manager.get_selected_templates(), self.config.screenshots_dir
+        )
+        if not result.success:
+            return result
+        logger.info(result.data['message'])
+
+        logger.info("开始插入人工核查截图...")
+        return manual_screenshot_operation.execute(
+            self.entities, self.report_paths, self.config.screenshots_dir
+        )
+
+    def _watch_manual_screenshots(self, manual_screenshot_operation) -> OperationResult:
+        """实时插入模式：后台监视截图目录，操作员按 Enter 键结束"""
+        import threading
+
+        stop_event = threading.Event()
+        outcome = {}
+
+        def watch():
+            outcome['result'] = manual_screenshot_operation.watch(
+                self.entities, self.report_paths, self.config.screenshots_dir, stop_event
+            )
+
+        watcher_thread = threading.Thread(target=watch, name="everify-manual-watch")
+        watcher_thread.start()
+        logger.info("已开启实时插入，新截图会自动插入对应报告。完成全部截图后按 Enter 键结束...")
+        try:
+            input()
+        except EOFError:
+            pass
+        finally:
+            stop_event.set()
+            watcher_thread.join()
+        return outcome.get('result') or OperationResult.error_result("实时插入人工核查截图异常结束")
+
     def _perform_search_engine_query(self):
         """执行搜索引擎查询操作"""
         logger.info("开始执行搜索引擎查询操作...")
@@ -259,6 +349,7 @@ def main() -> None:
     parser.add_argument("-v", "--verbose", action="store_true", help="显示详细日志")
     parser.add_argument("-e", "--entities", help="主体列表文件路径（批量模式）")
     parser.add_argument("-s", "--screenshots-dir", help="截图保存目录")
+    parser.add_argument("--resume", metavar="RUN_ID", help="恢复中断的自动核查（运行 ID 见 输出目录/runs）")
     args = parser.parse_args()
 
     # 初始化配置
@@ -292,11 +383,14 @@ def main() -> None:
     elif choice == "2":
         # 启动后端版（CLI）
         app = EverifyApplication(config)
-        app.run(args.entities)
+        app.run(args.entities, args.resume)
     else:
         print("无效的选择，请输入 1 或 2")
         return
 
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，水印进程池的子进程需要此调用才能正常启动
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
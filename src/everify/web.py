@@ -2,9 +2,10 @@
 """
 Everify Flask 应用 - 网页核查自动化系统
 """
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, session, redirect, url_for, stream_with_context
 from everify.core.services.template_manager import TemplateManager
 from everify.core.services.entity_manager import EntityManager
+from everify.core.services.job_manager import JobManager
 from everify.core.utils.config import AppConfig
 from everify.core.utils import logger
 from pathlib import Path
@@ -32,6 +33,10 @@ app.secret_key = 'everify_flask_app_secret_key_12345'
 tm = TemplateManager()
 em = EntityManager()
 config = AppConfig()
+# 核查任务在后台线程池中执行，请求立即返回任务 ID
+job_manager = JobManager(config)
+# SSE 连接没有新事件时发送心跳的间隔（秒）
+SSE_KEEPALIVE_SECONDS = 15
 
 
 @app.route('/')
@@ -528,19 +533,20 @@ def start_verification():
             url_generator, VerifyService(config), report_generator
         )
 
-        # 执行核查操作
-        result = auto_verify_operation.execute(entities, selected_templates)
-
-        if result.success:
-            # 保存报告路径到会话
-            session['report_paths'] = result.data['report_paths']
-            return jsonify({
-                'status': 'success',
-                'message': result.data['message'],
-                'report_count': len(result.data['report_paths'])
-            })
-        else:
-            return jsonify({'status': 'error', 'message': result.error})
+        # 提交后台任务执行核查操作，前端通过任务 ID 查询进度和结果
+        def run(job):
+            return auto_verify_operation.execute(
+                entities, selected_templates,
+                on_event=lambda event: job_manager.report_progress(job, event),
+                cancel_event=job.cancel_event
+            )
+
+        job = job_manager.submit(
+            'verify', run,
+            params={'entities': entities, 'templates': list(selected_templates)},
+            entities_total=len(entities)
+        )
+        return jsonify({'status': 'success', 'job_id': job.id, 'message': '核查任务已提交'})
     except Exception as e:
         import logging
         import traceback
@@ -573,19 +579,20 @@ def start_bribery_verification():
         data = request.get_json()
         search_keywords = data.get('search_keywords', None)
 
-        # 执行搜索引擎查询操作
-        result = search_operation.execute(entities, search_keywords)
-
-        if result.success:
-            # 保存报告路径到会话
-            session['report_paths'] = result.data['report_paths']
-            return jsonify({
-                'status': 'success',
-                'message': result.data['message'],
-                'report_count': len(result.data['report_paths'])
-            })
-        else:
-            return jsonify({'status': 'error', 'message': result.error})
+        # 提交后台任务执行搜索引擎查询操作
+        def run(job):
+            return search_operation.execute(
+                entities, search_keywords,
+                on_event=lambda event: job_manager.report_progress(job, event),
+                cancel_event=job.cancel_event
+            )
+
+        job = job_manager.submit(
+            'bribery_verify', run,
+            params={'entities': entities, 'search_keywords': search_keywords},
+            entities_total=len(entities)
+        )
+        return jsonify({'status': 'success', 'job_id': job.id, 'message': '核查任务已提交'})
     except Exception as e:
         import logging
         import traceback
@@ -624,18 +631,20 @@ def start_manual_verification():
             report_generator, config
         )
 
-        # 执行人工截图插入操作
-        result = manual_screenshot_operation.execute(
-            entities, report_paths, config.screenshots_dir
+        # 提交后台任务执行人工截图插入操作
+        def run(job):
+            return manual_screenshot_operation.execute(
+                entities, report_paths, config.screenshots_dir,
+                on_event=lambda event: job_manager.report_progress(job, event),
+                cancel_event=job.cancel_event
+            )
+
+        job = job_manager.submit(
+            'manual_verify', run,
+            params={'entities': entities, 'reports': list(report_paths)},
+            entities_total=len(report_paths)
         )
-
-        if result.success:
-            return jsonify({
-                'status': 'success',
-                'message': result.data['message']
-            })
-        else:
-            return jsonify({'status': 'error', 'message': result.error})
+        return jsonify({'status': 'success', 'job_id': job.id, 'message': '人工核查任务已提交'})
     except Exception as e:
         import logging
         import traceback
@@ -644,6 +653,135 @@ def start_manual_verification():
         return jsonify({'status': 'error', 'message': f'执行人工核查失败: {str(e)}', 'stack': traceback.format_exc()})
 
 
+@app.route('/api/manual-verify/guided/start', methods=['POST'])
+def start_guided_capture():
+    """API: 开始引导式人工截图（在本机打开浏览器，关闭浏览器或取消任务时结束）
+
+    浏览器窗口打开在运行网页端的机器上，因此只接受本机请求；同一时间只能进行一个引导式截图会话。
+    会话在任务管理器的交互式线程池中执行，不占用核查任务的并发名额。
+    """
+    try:
+        if request.remote_addr not in ('127.0.0.1', '::1'):
+            return jsonify({'status': 'error', 'message': '引导式截图会在运行网页端的电脑上打开浏览器，只能在本机使用'})
+        if job_manager.active('manual_capture'):
+            return jsonify({'status': 'error', 'message': '已有引导式截图正在进行，请先完成或取消'})
+
+        entities = session.get('entities', [])
+        selected_template_names = session.get('selected_templates', [])
+
+        if not entities:
+            return jsonify({'status': 'error', 'message': '请先输入需要核查的主体'})
+
+        templates = tm.load_templates()
+        manual_templates = {
+            name: templates[name] for name in selected_template_names
+            if name in templates and templates[name].category == 'manual'
+        }
+        if not manual_templates:
+            return jsonify({'status': 'error', 'message': '没有选择需要人工核查的网页'})
+
+        from everify.core.operations.operation_factory import OperationFactory
+        from everify.core.services.report_generator import ReportGenerator
+
+        manual_screenshot_operation = OperationFactory().create_manual_screenshot_operation(
+            ReportGenerator(config), config
+        )
+
+        # 取消任务即结束截图，已完成的截图保留在截图目录和清单中
+        def run(job):
+            return manual_screenshot_operation.guided_capture(
+                entities, manual_templates, config.screenshots_dir,
+                stop_event=job.cancel_event,
+                on_event=lambda event: job_manager.report_progress(job, event)
+            )
+
+        job = job_manager.submit(
+            'manual_capture', run,
+            params={'entities': entities, 'templates': list(manual_templates)},
+            interactive=True
+        )
+        return jsonify({'status': 'success', 'job_id': job.id, 'message': '引导式截图已开始'})
+    except Exception as e:
+        logger.error(f"开始引导式截图失败: {e}")
+        return jsonify({'status': 'error', 'message': f'开始引导式截图失败: {str(e)}'})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """API: 查询后台任务状态和进度"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': '任务不存在'})
+    return jsonify({'status': 'success', 'job': job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """API: 以 SSE 推送后台任务事件（URL 完成/失败及耗时、报告生成、状态变化）"""
+    import json
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': '任务不存在'})
+
+    # 浏览器断线重连时通过 Last-Event-ID 告知已收到的最后一个事件
+    last_event_id = request.headers.get('Last-Event-ID', '0')
+    last_seq = int(last_event_id) if last_event_id.isdigit() else 0
+
+    def generate():
+        seq = last_seq
+        while True:
+            events = job.events_since(seq, timeout=SSE_KEEPALIVE_SECONDS)
+            if not events:
+                if job.finished:
+                    break
+                # 心跳注释，避免代理因连接空闲而断开
+                yield ": keepalive\n\n"
+                continue
+            for seq, data in events:
+                yield f"id: {seq}\nevent: {data['type']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        yield f"event: end\ndata: {json.dumps(job.to_dict(), ensure_ascii=False, default=str)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id):
+    """API: 获取后台任务结果，并将生成的报告路径保存到会话"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': '任务不存在'})
+    if not job.finished:
+        return jsonify({'status': 'error', 'message': '任务尚未完成', 'job_status': job.status})
+    if job.error:
+        return jsonify({'status': 'error', 'message': job.error, 'job_status': job.status})
+
+    report_paths = job.result.get('report_paths')
+    if report_paths:
+        session['report_paths'] = report_paths
+    return jsonify({
+        'status': 'success',
+        'job_status': job.status,
+        'message': job.result.get('message', ''),
+        'report_count': len(report_paths or {}),
+        'report_paths': report_paths or {},
+        'run_id': job.result.get('run_id')
+    })
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """API: 取消后台任务"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': '任务不存在'})
+    return jsonify({'status': 'success', 'job': job.to_dict(), 'message': '已请求取消任务'})
+
+
 def main():
     """Web 应用入口函数"""
     import webbrowser
@@ -653,6 +791,8 @@ def main():
 
     def signal_handler(sig, frame):
         print('\n收到终止信号，正在关闭应用程序...')
+        # 取消后台任务，运行中的核查在下一个事件时停止
+        job_manager.shutdown(wait=False)
         sys.exit(0)
 
     # 设置信号处理程序
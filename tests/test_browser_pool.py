@@ -0,0 +1,171 @@
+import asyncio
+
+import playwright.async_api
+
+from everify.core.base import browser as browser_module
+from everify.core.base.browser import BrowserPool, ResourceStats
+from everify.core.utils.config import BrowserConfig, ResourcePolicyConfig
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.url = "about:blank"
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def unroute(self, pattern, handler=None):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+        self.cookies_cleared = 0
+
+    async def new_page(self):
+        return FakePage()
+
+    async def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+def make_pool(monkeypatch, **options):
+    launched = []
+
+    async def launch(playwright, browser_config):
+        launched.append(FakeChromium())
+        return launched[-1]
+
+    monkeypatch.setattr(playwright.async_api, "async_playwright", FakePlaywright)
+    monkeypatch.setattr(browser_module, "_launch_chromium", launch)
+    options.setdefault("resource_policy", ResourcePolicyConfig(enabled=False))
+    return BrowserPool(BrowserConfig(**options)), launched
+
+
+def test_each_lease_gets_its_own_context_within_capacity(monkeypatch):
+    pool, launched = make_pool(monkeypatch, pool_size=1, contexts_per_browser=2)
+    active = []
+    peak = []
+
+    async def use():
+        async with pool.lease() as browser:
+            active.append(browser.page)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(browser.page)
+
+    async def main():
+        async with pool:
+            await asyncio.gather(*(use() for _ in range(6)))
+
+    asyncio.run(main())
+
+    assert len(launched) == 1
+    assert max(peak) == 2
+    assert len(launched[0].contexts) == 6
+    assert all(context.closed for context in launched[0].contexts)
+    assert not launched[0].connected
+
+
+def test_reused_contexts_are_cleared_between_leases(monkeypatch):
+    pool, launched = make_pool(monkeypatch, contexts_per_browser=1, reuse_contexts=True)
+    pages = []
+
+    async def main():
+        async with pool:
+            for url in ("https://a.example.com", "https://b.example.com"):
+                async with pool.lease() as browser:
+                    pages.append(browser.page)
+                    await browser.page.goto(url)
+
+    asyncio.run(main())
+
+    [context] = launched[0].contexts
+    assert pages[0] is pages[1]
+    assert context.cookies_cleared == 2
+    assert pages[1].url == "about:blank"
+
+
+def test_browser_is_recycled_after_configured_leases(monkeypatch):
+    pool, launched = make_pool(monkeypatch, contexts_per_browser=1, recycle_after=2)
+
+    async def main():
+        async with pool:
+            for _ in range(3):
+                async with pool.lease():
+                    pass
+            return len(launched), launched[0].connected
+
+    count, first_connected = asyncio.run(main())
+
+    assert count == 2
+    assert not first_connected
+
+
+def test_disconnected_browser_is_replaced(monkeypatch):
+    pool, launched = make_pool(monkeypatch, contexts_per_browser=1, recycle_after=0)
+
+    async def main():
+        async with pool:
+            launched[0].connected = False
+            async with pool.lease() as browser:
+                return browser.page
+
+    asyncio.run(main())
+
+    assert len(launched) == 2
+    assert len(launched[1].contexts) == 1
+
+
+def test_lease_records_blocked_requests_in_given_stats(monkeypatch):
+    pool, _ = make_pool(monkeypatch)
+    stats = ResourceStats()
+
+    async def main():
+        async with pool:
+            async with pool.lease(stats) as browser:
+                leased = browser.resource_stats
+            async with pool.lease() as browser:
+                return leased, browser.resource_stats
+
+    leased, default = asyncio.run(main())
+
+    assert leased is stats
+    assert default is pool.resource_stats
@@ -0,0 +1,96 @@
+import json
+
+from everify.core.services.capture_manifest import MANIFEST_FILENAME, CaptureManifest
+
+
+def test_add_persists_and_reloads(tmp_path):
+    manifest = CaptureManifest.load(tmp_path)
+    screenshot = tmp_path / "shot.png"
+    screenshot.write_bytes(b"png")
+
+    manifest.add(screenshot, "甲公司", "章节一", template="模板", url="https://example.com")
+
+    reloaded = CaptureManifest.load(tmp_path)
+    assert "shot.png" in reloaded
+    assert len(reloaded) == 1
+    assert reloaded.entries["shot.png"]["entity"] == "甲公司"
+    assert reloaded.lookup() == {"甲公司": {"章节一": screenshot}}
+
+
+def test_lookup_skips_missing_files_and_prefers_latest_capture(tmp_path):
+    manifest = CaptureManifest(tmp_path / MANIFEST_FILENAME)
+    for name in ("old.png", "new.png", "deleted.png"):
+        (tmp_path / name).write_bytes(b"png")
+    manifest.add(tmp_path / "old.png", "甲公司", "章节一")
+    manifest.add(tmp_path / "new.png", "甲公司", "章节一")
+    manifest.add(tmp_path / "deleted.png", "乙公司", "章节一")
+    manifest.entries["old.png"]["captured_at"] = "2024-01-01T00:00:00"
+    (tmp_path / "deleted.png").unlink()
+
+    assert manifest.lookup() == {"甲公司": {"章节一": tmp_path / "new.png"}}
+
+
+def test_unreadable_manifest_loads_empty(tmp_path):
+    (tmp_path / MANIFEST_FILENAME).write_text("{not json", encoding="utf-8")
+
+    assert len(CaptureManifest.load(tmp_path)) == 0
+
+
+def test_manifest_file_format(tmp_path):
+    manifest = CaptureManifest(tmp_path / MANIFEST_FILENAME)
+    manifest.add(tmp_path / "shot.png", "甲公司", "章节一")
+
+    data = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert set(data["captures"]["shot.png"]) == {"entity", "chapter", "template", "url", "captured_at", "modified_at"}
+
+
+def test_load_drops_entries_for_missing_files(tmp_path):
+    manifest = CaptureManifest(tmp_path / MANIFEST_FILENAME)
+    for name in ("kept.png", "deleted.png"):
+        (tmp_path / name).write_bytes(b"png")
+        manifest.add(tmp_path / name, "甲公司", name)
+    (tmp_path / "deleted.png").unlink()
+
+    reloaded = CaptureManifest.load(tmp_path)
+
+    assert "deleted.png" not in reloaded
+    assert "kept.png" in reloaded
+
+
+def test_replaced_file_is_no_longer_tagged(tmp_path):
+    import os
+
+    screenshot = tmp_path / "shot.png"
+    screenshot.write_bytes(b"png")
+    manifest = CaptureManifest(tmp_path / MANIFEST_FILENAME)
+    manifest.add(screenshot, "甲公司", "章节一")
+    # 同名文件被替换为另一张截图
+    modified_at = screenshot.stat().st_mtime + 10
+    os.utime(screenshot, (modified_at, modified_at))
+
+    assert manifest.lookup() == {}
+    assert "shot.png" not in manifest
+
+
+def test_entries_without_modified_time_are_kept_while_file_exists(tmp_path):
+    (tmp_path / "legacy.png").write_bytes(b"png")
+    (tmp_path / MANIFEST_FILENAME).write_text(json.dumps({"captures": {
+        "legacy.png": {"entity": "甲公司", "chapter": "章节一", "captured_at": "2024-01-01T00:00:00"},
+        "gone.png": {"entity": "乙公司", "chapter": "章节一", "captured_at": "2024-01-01T00:00:00"},
+    }}), encoding="utf-8")
+
+    assert CaptureManifest.load(tmp_path).lookup() == {"甲公司": {"章节一": tmp_path / "legacy.png"}}
+
+
+def test_add_writes_back_without_stale_entries(tmp_path):
+    (tmp_path / "old.png").write_bytes(b"png")
+    manifest = CaptureManifest(tmp_path / MANIFEST_FILENAME)
+    manifest.add(tmp_path / "old.png", "甲公司", "章节一")
+    (tmp_path / "old.png").unlink()
+
+    # 新截图在写入文件前登记，不会被当作失效记录
+    manifest.add(tmp_path / "new.png", "甲公司", "章节二", modified_at=123.0)
+
+    data = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+    assert list(data["captures"]) == ["new.png"]
+    assert data["captures"]["new.png"]["modified_at"] == 123.0
@@ -0,0 +1,171 @@
+import io
+
+from docx import Document
+from PIL import Image
+
+from everify.core.base.document import DocxDocumentEngine
+
+
+def png_bytes(size=(120, 80)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "white").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def build_skeleton(engine, chapters):
+    engine.create_document("诚信核查报告")
+    engine.add_title("诚信核查报告", level=1)
+    for chapter in chapters:
+        engine.add_title(chapter, level=2)
+    return engine.save_to_bytes()
+
+
+def headings(document):
+    return [para.text for para in document.paragraphs if para.style.name.startswith("Heading")]
+
+
+def test_skeleton_reload_rebuilds_heading_index():
+    engine = DocxDocumentEngine()
+    skeleton = build_skeleton(engine, ["信用中国", "裁判文书"])
+    engine.close_document()
+
+    engine.load_document(skeleton)
+
+    assert set(engine.headings) == {"诚信核查报告", "信用中国", "裁判文书"}
+    # 重新打开骨架后继续编号
+    engine.add_title("补充章节", level=2)
+    assert headings(Document(io.BytesIO(engine.save_to_bytes())))[-1] == "3、补充章节"
+
+
+def test_set_title_replaces_heading_and_core_properties():
+    engine = DocxDocumentEngine()
+    skeleton = build_skeleton(engine, ["信用中国"])
+
+    engine.load_document(skeleton)
+    engine.set_title("甲公司诚信核查报告")
+    document = Document(io.BytesIO(engine.save_to_bytes()))
+
+    assert headings(document) == ["甲公司诚信核查报告", "1、信用中国"]
+    assert document.core_properties.title == "甲公司诚信核查报告"
+    assert "甲公司诚信核查报告" in engine.headings
+    assert "诚信核查报告" not in engine.headings
+
+
+def test_each_reload_starts_from_clean_skeleton():
+    engine = DocxDocumentEngine()
+    skeleton = build_skeleton(engine, ["信用中国", "裁判文书"])
+
+    engine.load_document(skeleton)
+    engine.set_title("甲公司诚信核查报告")
+    engine.add_image(png_bytes(), heading="裁判文书")
+    first = Document(io.BytesIO(engine.save_to_bytes()))
+
+    engine.load_document(skeleton)
+    engine.set_title("乙公司诚信核查报告")
+    second = Document(io.BytesIO(engine.save_to_bytes()))
+
+    assert len(first.inline_shapes) == 1
+    assert len(second.inline_shapes) == 0
+    assert headings(second) == ["乙公司诚信核查报告", "1、信用中国", "2、裁判文书"]
+
+
+def test_add_image_at_unknown_heading_is_skipped():
+    engine = DocxDocumentEngine()
+    engine.load_document(build_skeleton(engine, ["信用中国"]))
+
+    engine.add_image(png_bytes(), heading="不存在的章节")
+
+    assert len(Document(io.BytesIO(engine.save_to_bytes())).inline_shapes) == 0
+
+
+def test_streaming_report_opens_in_python_docx(tmp_path):
+    from everify.core.base.document import StreamingDocxDocumentEngine
+
+    shot = tmp_path / "shot.png"
+    shot.write_bytes(png_bytes((300, 200)))
+    engine = StreamingDocxDocumentEngine()
+    output_path = engine.create_document("合并报告", tmp_path / "combined.docx")
+    engine.add_title("合并报告", level=1)
+    for entity in ("甲公司", "乙公司"):
+        engine.add_title(entity, level=2)
+        engine.add_paragraph("关键词 <A&B>")
+        engine.add_image(shot)
+    engine.add_image(png_bytes(), caption="内存图片")
+    engine.add_table([["甲公司", "1"]], headers=["主体", "数量"])
+
+    assert engine.save_document() == output_path
+    document = Document(str(output_path))
+
+    assert headings(document) == ["合并报告", "1、甲公司", "2、乙公司"]
+    assert "关键词 <A&B>" in [para.text for para in document.paragraphs]
+    assert len(document.inline_shapes) == 3
+    assert document.tables[0].rows[0].cells[0].text == "主体"
+    assert document.core_properties.title == "合并报告"
+    # 不残留临时压缩包
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["combined.docx", "shot.png"]
+
+
+def test_streaming_report_uses_default_file_mode(tmp_path):
+    import os
+    import stat
+
+    from everify.core.base.document import StreamingDocxDocumentEngine
+
+    engine = StreamingDocxDocumentEngine()
+    engine.create_document("合并报告", tmp_path / "streamed.docx")
+    engine.add_title("合并报告", level=1)
+    streamed = engine.save_document()
+
+    regular = DocxDocumentEngine()
+    regular.create_document("合并报告")
+    regular.add_title("合并报告", level=1)
+    saved = regular.save_document(tmp_path / "regular.docx")
+
+    assert stat.S_IMODE(os.stat(streamed).st_mode) == stat.S_IMODE(os.stat(saved).st_mode)
+
+
+def test_streaming_report_close_removes_partial_package(tmp_path):
+    from everify.core.base.document import StreamingDocxDocumentEngine
+
+    engine = StreamingDocxDocumentEngine()
+    engine.create_document("合并报告", tmp_path / "combined.docx")
+    engine.add_image(png_bytes())
+    engine.close_document()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_text_is_formatted_through_named_styles():
+    from everify.core.base.document import BODY_STYLE, LATIN_STYLE
+
+    engine = DocxDocumentEngine()
+    engine.create_document("诚信核查报告")
+    engine.add_title("诚信核查报告", level=1)
+    engine.add_title("Credit China", level=2)
+    engine.add_paragraph("正文内容")
+    engine.add_paragraph("2024")
+    document = Document(io.BytesIO(engine.save_to_bytes()))
+
+    heading1, heading2, body, number = document.paragraphs
+    assert heading1.style.name == "Heading 1"
+    assert heading2.style.name == "Heading 2"
+    assert body.style.name == number.style.name == BODY_STYLE
+    # 不含汉字的文字块使用西文字符样式，汉字保持段落样式的字体
+    assert number.runs[0].style.name == LATIN_STYLE
+    assert body.runs[0].style.name != LATIN_STYLE
+    # 格式由样式提供，文字块上不带直接格式
+    assert all(run.font.name is None and run.font.size is None for para in document.paragraphs for run in para.runs)
+    assert document.styles[BODY_STYLE].font.name == "楷体"
+    assert document.styles[LATIN_STYLE].font.name == "Times New Roman"
+
+
+def test_styles_are_registered_once_per_document():
+    from everify.core.base.document import BODY_STYLE
+
+    engine = DocxDocumentEngine()
+    engine.create_document("诚信核查报告")
+    engine.load_document(engine.save_to_bytes())
+    engine._register_styles()
+
+    names = [style.name for style in engine.doc.styles]
+    assert names.count(BODY_STYLE) == 1
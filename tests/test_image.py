@@ -0,0 +1,50 @@
+import io
+import os
+
+from PIL import Image
+
+from everify.core.base import image as image_module
+from everify.core.base.image import PillowImageEngine
+from everify.core.utils.config import WatermarkConfig
+
+
+def png_bytes(size=(200, 120)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "white").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _crash_worker(*args):
+    # 模拟水印进程异常退出，使进程池损坏
+    os._exit(1)
+
+
+def test_watermark_many_in_current_process():
+    engine = PillowImageEngine(WatermarkConfig())
+
+    results = engine.add_watermark_many([(png_bytes(), "甲公司", None), (b"not an image", "乙公司", None)], workers=1)
+
+    assert Image.open(io.BytesIO(results[0])).size == (200, 120)
+    # 失败的任务返回 None，不影响其他任务
+    assert results[1] is None
+
+
+def test_watermark_many_recovers_from_broken_pool(monkeypatch):
+    monkeypatch.setattr(image_module, "_watermark_job", _crash_worker)
+    engine = PillowImageEngine(WatermarkConfig())
+    jobs = [(png_bytes(), f"主体{index}", None) for index in range(3)]
+
+    results = engine.add_watermark_many(jobs, workers=2)
+
+    assert all(isinstance(result, bytes) for result in results)
+
+
+def test_watermark_many_writes_output_files(tmp_path):
+    source = tmp_path / "shot.png"
+    source.write_bytes(png_bytes())
+    engine = PillowImageEngine(WatermarkConfig())
+
+    [result] = engine.add_watermark_many([(source, "甲公司", tmp_path / "shot_watermarked.png")], workers=1)
+
+    assert result == tmp_path / "shot_watermarked.png"
+    assert result.exists()
@@ -0,0 +1,97 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from everify.core.operations.base_operation import OperationResult
+from everify.core.services import job_manager
+from everify.core.services.job_manager import Job, JobManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager(SimpleNamespace(output_dir=tmp_path, job_workers=1))
+    yield manager
+    manager.shutdown(wait=True)
+
+
+def run_to_completion(manager, count):
+    jobs = [manager.submit("verify", lambda job: OperationResult.success_result({"n": 1})) for _ in range(count)]
+    for job in jobs:
+        with job._condition:
+            job._condition.wait_for(lambda: job.finished, 5)
+    return jobs
+
+
+def test_finished_jobs_are_pruned_but_still_readable(manager, monkeypatch):
+    monkeypatch.setattr(job_manager, "MAX_FINISHED_JOBS", 2)
+    jobs = run_to_completion(manager, 4)
+    manager._executor.shutdown(wait=True)
+
+    assert len(manager._jobs) <= 2
+    assert not manager._futures
+    # 移出内存的任务从任务文件读取
+    reloaded = manager.get(jobs[0].id)
+    assert reloaded is not jobs[0]
+    assert reloaded.status == Job.SUCCEEDED
+    assert reloaded.result == {"n": 1}
+
+
+def test_expired_finished_jobs_are_pruned(manager, monkeypatch):
+    monkeypatch.setattr(job_manager, "FINISHED_JOB_TTL", 0)
+    jobs = run_to_completion(manager, 2)
+    manager._executor.shutdown(wait=True)
+
+    with manager._lock:
+        manager._prune_finished()
+    assert not manager._jobs
+    assert not manager._saved_at
+    assert manager.get(jobs[1].id).status == Job.SUCCEEDED
+
+
+def test_interactive_jobs_do_not_wait_for_busy_pool(manager):
+    release = threading.Event()
+    blocking = manager.submit("verify", lambda job: (release.wait(5), OperationResult.success_result({}))[1])
+    interactive = manager.submit(
+        "manual_capture", lambda job: OperationResult.success_result({"done": True}), interactive=True
+    )
+
+    with interactive._condition:
+        assert interactive._condition.wait_for(lambda: interactive.finished, 5)
+    assert interactive.status == Job.SUCCEEDED
+    assert manager.active("verify") == [blocking]
+    assert manager.active("manual_capture") == []
+    release.set()
+
+
+def test_progress_is_saved_while_other_jobs_finish(manager, monkeypatch):
+    from everify.core.services.verify_service import VerifyEvent
+
+    monkeypatch.setattr(job_manager, "PROGRESS_SAVE_INTERVAL", 0)
+    monkeypatch.setattr(job_manager, "MAX_FINISHED_JOBS", 0)
+    release = threading.Event()
+    running = manager.submit("verify", lambda job: (release.wait(5), OperationResult.success_result({}))[1])
+
+    def report():
+        for index in range(100):
+            manager.report_progress(running, VerifyEvent.url_done("甲公司", f"https://example.com/{index}", "shot.png"))
+
+    reporters = [threading.Thread(target=report) for _ in range(4)]
+    for thread in reporters:
+        thread.start()
+    # 其他任务结束时清理已结束任务（同时移除其保存时间）
+    quick = [
+        manager.submit("manual_capture", lambda job: OperationResult.success_result({}), interactive=True)
+        for _ in range(20)
+    ]
+    for thread in reporters:
+        thread.join()
+    for job in quick:
+        with job._condition:
+            assert job._condition.wait_for(lambda: job.finished, 5)
+
+    assert running.progress["urls_done"] == 400
+    with manager._lock:
+        assert set(manager._saved_at) <= set(manager._jobs) | {job.id for job in quick}
+        assert running.id in manager._saved_at
+    release.set()
@@ -0,0 +1,70 @@
+from everify.core.services.capture_manifest import CaptureManifest
+from everify.core.services.report_generator import MANUAL_CHAPTERS, map_manual_screenshots, scan_manual_screenshots
+
+
+def touch(directory, name):
+    path = directory / name
+    path.write_bytes(b"")
+    return path
+
+
+def test_scan_matches_suffixes_case_insensitively_and_sorts_by_name(tmp_path):
+    touch(tmp_path, "20240101_120002.JPG")
+    touch(tmp_path, "20240101_120001.png")
+    touch(tmp_path, "20240101_120003.Bmp")
+    touch(tmp_path, "20240101_120000.jpeg")
+
+    assert [path.name for path in scan_manual_screenshots(tmp_path)] == [
+        "20240101_120000.jpeg",
+        "20240101_120001.png",
+        "20240101_120002.JPG",
+        "20240101_120003.Bmp",
+    ]
+
+
+def test_scan_skips_hidden_files_other_formats_and_directories(tmp_path):
+    touch(tmp_path, "._20240101_120000.png")
+    touch(tmp_path, "everify_captures.json")
+    touch(tmp_path, "notes.txt")
+    touch(tmp_path, "20240101_120000.png.part")
+    (tmp_path / "folder.png").mkdir()
+    shot = touch(tmp_path, "20240101_120001.png")
+
+    assert scan_manual_screenshots(tmp_path) == [shot]
+
+
+def test_scan_missing_directory(tmp_path):
+    assert scan_manual_screenshots(tmp_path / "missing") == []
+
+
+def test_map_assigns_screenshots_page_by_page():
+    screenshots = [f"{index:02}.png" for index in range(5)]
+
+    mapping = map_manual_screenshots(screenshots, ["A", "B"])
+
+    assert mapping["A"][:3] == ["00.png", "02.png", "04.png"]
+    assert mapping["B"][:3] == ["01.png", "03.png", None]
+    assert len(mapping["A"]) == len(MANUAL_CHAPTERS)
+
+
+def test_map_duplicate_entities_use_first_position():
+    mapping = map_manual_screenshots(["0.png", "1.png", "2.png", "3.png"], ["A", "B", "A"])
+
+    assert list(mapping) == ["A", "B"]
+    assert mapping["A"][:2] == ["0.png", "3.png"]
+    assert mapping["B"][:2] == ["1.png", None]
+
+
+def test_map_untagged_screenshots_fill_only_slots_left_by_manifest(tmp_path):
+    manifest = CaptureManifest(tmp_path / "everify_captures.json")
+    first = touch(tmp_path, "20240101_120000_A.png")
+    second = touch(tmp_path, "20240101_120001_A.png")
+    manifest.add(first, "A", MANUAL_CHAPTERS[0])
+    manifest.add(second, "A", MANUAL_CHAPTERS[1])
+    untagged = touch(tmp_path, "20240101_120002.png")
+
+    mapping = map_manual_screenshots(scan_manual_screenshots(tmp_path), ["A", "B"], manifest)
+
+    assert mapping["A"][:2] == [first, second]
+    # 未记录在清单中的截图属于第一个空位，即网页1主体B
+    assert mapping["B"][:2] == [untagged, None]
@@ -0,0 +1,60 @@
+import pytest
+from pydantic import ValidationError
+
+from everify.core.base import rate_limiter
+from everify.core.base.rate_limiter import HostRateLimiter, shared_rate_limiter
+from everify.core.utils.config import RateLimitConfig
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动拨动的 time.monotonic"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_must_allow_at_least_one_token():
+    with pytest.raises(ValidationError):
+        RateLimitConfig(burst=0)
+    with pytest.raises(ValidationError):
+        RateLimitConfig(rate=-1)
+
+
+def test_tokens_run_out_after_burst_and_refill_over_time(clock):
+    limiter = HostRateLimiter(RateLimitConfig(rate=2.0, burst=2, max_inflight=0))
+
+    assert limiter.try_acquire("a.com") == 0
+    assert limiter.try_acquire("a.com") == 0
+    assert limiter.try_acquire("a.com") == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert limiter.try_acquire("a.com") == 0
+
+
+def test_max_inflight_blocks_until_release(clock):
+    limiter = HostRateLimiter(RateLimitConfig(rate=0, burst=1, max_inflight=1))
+
+    assert limiter.try_acquire("a.com") == 0
+    assert limiter.try_acquire("a.com") is None
+    # 其他网站不受影响
+    assert limiter.try_acquire("b.com") == 0
+
+    limiter.release("a.com")
+    assert limiter.inflight("a.com") == 0
+    assert limiter.try_acquire("a.com") == 0
+
+
+def test_per_call_limit_overrides_default_and_follows_updates(clock):
+    limiter = HostRateLimiter(RateLimitConfig(rate=0, burst=1, max_inflight=1))
+    relaxed = RateLimitConfig(rate=0, burst=1, max_inflight=3)
+
+    for _ in range(3):
+        assert limiter.try_acquire("a.com", relaxed) == 0
+    assert limiter.try_acquire("a.com", relaxed) is None
+    # 配置更新后立即生效
+    assert limiter.try_acquire("a.com", RateLimitConfig(rate=0, burst=1, max_inflight=4)) == 0
+
+
+def test_shared_rate_limiter_is_process_wide():
+    assert shared_rate_limiter() is shared_rate_limiter()
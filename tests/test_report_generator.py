@@ -0,0 +1,81 @@
+import io
+import os
+
+import pytest
+from docx import Document
+from PIL import Image
+
+from everify.core.services import report_generator as report_module
+from everify.core.services.report_generator import AUTOMATED_CHAPTERS, ReportGenerator
+from everify.core.utils import config
+from everify.core.utils.config import VerifyTemplate
+
+
+def png_bytes(size=(200, 120)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "white").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+TEMPLATES = {
+    name: VerifyTemplate(name=name, description=name, url_pattern=f"https://{name}.example.com/s?wd={{}}", InsertContext=chapter)
+    for name, chapter in (("first", AUTOMATED_CHAPTERS[0]), ("second", AUTOMATED_CHAPTERS[1]))
+}
+
+
+def entity_results(entity):
+    return {template.compiled.render(entity): png_bytes() for template in TEMPLATES.values()}
+
+
+def _crash_worker(*args):
+    # 模拟报告进程异常退出，使进程池损坏
+    os._exit(1)
+
+
+def test_parallel_reports_recover_from_broken_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_module, "_generate_report_job", _crash_worker)
+    generator = ReportGenerator(config)
+    results = {f"公司{index}": {"https://example.com/a": png_bytes()} for index in range(3)}
+
+    report_paths = generator.generate_report(results, tmp_path, workers=2)
+
+    assert sorted(report_paths) == sorted(results)
+    assert all(path.exists() for path in report_paths.values())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipeline_generates_report_per_submitted_entity(tmp_path, workers):
+    events = []
+    generator = ReportGenerator(config)
+    pipeline = generator.start_pipeline(tmp_path, TEMPLATES, workers=workers, on_report=events.append)
+    entities = ["甲公司", "乙公司", "丙公司"]
+
+    for entity in entities:
+        pipeline.submit(entity, entity_results(entity))
+    report_paths = pipeline.finish()
+
+    assert sorted(report_paths) == sorted(entities)
+    for entity, path in report_paths.items():
+        document = Document(str(path))
+        assert document.paragraphs[0].text.startswith(f"{entity}诚信核查报告")
+        assert len(document.inline_shapes) == len(TEMPLATES)
+    assert sorted(event.entity for event in events) == sorted(entities)
+    assert all(event.result for event in events)
+    assert generator._watermarked == {}
+
+
+def test_thread_pipeline_watermarks_in_current_thread(tmp_path, monkeypatch):
+    generator = ReportGenerator(config)
+    calls = []
+    add_watermark_many = generator.image_engine.add_watermark_many
+
+    def record_workers(jobs, workers=None, embed_profile=None):
+        calls.append(workers)
+        return add_watermark_many(jobs, workers=workers, embed_profile=embed_profile)
+
+    monkeypatch.setattr(generator.image_engine, "add_watermark_many", record_workers)
+    pipeline = generator.start_pipeline(tmp_path, TEMPLATES, workers=1)
+    pipeline.submit("甲公司", entity_results("甲公司"))
+    pipeline.finish()
+
+    assert calls == [1]
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from everify.core.services.result_cache import ResultCache, normalize_entity
+from everify.core.utils.config import ResultCacheConfig
+
+
+@pytest.fixture
+def screenshot(tmp_path):
+    path = tmp_path / "shot.png"
+    path.write_bytes(b"png")
+    return str(path)
+
+
+def make_cache(tmp_path, **options):
+    return ResultCache(ResultCacheConfig(enabled=True, **options), tmp_path / "cache" / "results.json")
+
+
+def test_cache_is_opt_in(tmp_path, screenshot):
+    cache = ResultCache(ResultCacheConfig(), tmp_path / "results.json")
+    cache.put("template", "甲公司", screenshot)
+    assert cache.get("template", "甲公司") is None
+
+
+def test_entity_names_are_normalized(tmp_path, screenshot):
+    cache = make_cache(tmp_path)
+    cache.put("template", "甲 公司（一）", screenshot)
+    assert normalize_entity("甲 公司（一）") == "甲公司(一)"
+    assert cache.get("template", "甲公司(一)")["screenshot"] == screenshot
+
+
+def test_expired_entries_are_not_used(tmp_path, screenshot):
+    cache = make_cache(tmp_path, ttl_hours=1)
+    cache.put("template", "甲公司", screenshot, captured_at=time.time() - 2 * 3600)
+    cache.put("other", "甲公司", screenshot)
+
+    assert cache.get("template", "甲公司") is None
+    assert cache.get("other", "甲公司") is not None
+
+
+def test_missing_screenshot_invalidates_entry(tmp_path, screenshot):
+    cache = make_cache(tmp_path)
+    cache.put("template", "甲公司", screenshot)
+    (tmp_path / "shot.png").unlink()
+    assert cache.get("template", "甲公司") is None
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, screenshot):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", "甲公司", screenshot)
+    cache.put("b", "甲公司", screenshot)
+    # 使用 a 之后，b 成为最久未使用的条目
+    assert cache.get("a", "甲公司") is not None
+    cache.put("c", "甲公司", screenshot)
+
+    assert cache.get("b", "甲公司") is None
+    assert cache.get("a", "甲公司") is not None
+    assert cache.get("c", "甲公司") is not None
+
+
+def test_save_round_trip(tmp_path, screenshot):
+    cache = make_cache(tmp_path)
+    cache.put("template", "甲公司", screenshot)
+    cache.save()
+
+    assert make_cache(tmp_path).get("template", "甲公司")["screenshot"] == screenshot
+
+
+def test_concurrent_writers_merge_instead_of_overwriting(tmp_path, screenshot):
+    first = make_cache(tmp_path)
+    second = make_cache(tmp_path)
+    # 两个任务都在对方保存之前读取了索引
+    assert first.get("a", "甲公司") is None
+    assert second.get("b", "乙公司") is None
+
+    first.put("a", "甲公司", screenshot)
+    second.put("b", "乙公司", screenshot)
+    first.save()
+    second.save()
+
+    reloaded = make_cache(tmp_path)
+    assert reloaded.get("a", "甲公司") is not None
+    assert reloaded.get("b", "乙公司") is not None
+
+
+def test_newer_entry_wins_on_merge(tmp_path, screenshot):
+    older = make_cache(tmp_path)
+    newer = make_cache(tmp_path)
+    older.put("a", "甲公司", screenshot, captured_at=time.time() - 60)
+    newer.put("a", "甲公司", screenshot, captured_at=time.time())
+    newer.save()
+    older.save()
+
+    entry = make_cache(tmp_path).get("a", "甲公司")
+    assert entry["captured_at"] == newer.get("a", "甲公司")["captured_at"]
+
+
+def test_ttl_must_be_positive():
+    with pytest.raises(ValueError):
+        ResultCacheConfig(ttl_hours=0)
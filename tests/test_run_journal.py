@@ -0,0 +1,127 @@
+import io
+
+from PIL import Image
+
+from everify.core.operations.auto_verify_operation import AutoVerifyOperation
+from everify.core.services.report_generator import ReportGenerator
+from everify.core.services.run_journal import RunJournal
+from everify.core.services.url_generator import URLGenerator
+from everify.core.services.verify_service import VerifyEvent
+from everify.core.utils import config
+from everify.core.utils.config import VerifyTemplate
+
+
+def screenshot(directory, name):
+    path = directory / name
+    Image.new("RGB", (200, 120), "white").save(path, "PNG")
+    return str(path)
+
+
+def test_create_writes_header_and_open_restores_it(tmp_path):
+    journal = RunJournal.create(tmp_path, ["甲公司", "乙公司"], ["search", "court"])
+    journal.close()
+
+    reopened = RunJournal.open(tmp_path, journal.run_id)
+
+    assert reopened.path == tmp_path / f"{journal.run_id}.jsonl"
+    assert reopened.entities == ["甲公司", "乙公司"]
+    assert reopened.template_names == ["search", "court"]
+    assert reopened.completed() == {}
+
+
+def test_open_missing_run(tmp_path):
+    assert RunJournal.open(tmp_path, "20240101_000000_abcdef") is None
+
+
+def test_completed_keeps_last_successful_result_with_existing_screenshot(tmp_path):
+    shot = screenshot(tmp_path, "a.png")
+    retried = screenshot(tmp_path, "b.png")
+    journal = RunJournal.create(tmp_path / "runs", ["甲公司"], ["search"])
+    journal.record("甲公司", "https://a.example.com", "search", shot)
+    journal.record("甲公司", "https://b.example.com", "search", "")
+    journal.record("甲公司", "https://b.example.com", "search", retried)
+    journal.record("甲公司", "https://c.example.com", "search", str(tmp_path / "deleted.png"))
+    # 内存流水线的截图字节无法恢复
+    journal.record("甲公司", "https://d.example.com", "search", b"png")
+    journal.close()
+
+    done = RunJournal.open(tmp_path / "runs", journal.run_id).completed()
+
+    assert done == {"甲公司": {"https://a.example.com": shot, "https://b.example.com": retried}}
+
+
+def test_later_failure_overrides_earlier_success(tmp_path):
+    shot = screenshot(tmp_path, "a.png")
+    journal = RunJournal.create(tmp_path, ["甲公司"], ["search"])
+    journal.record("甲公司", "https://a.example.com", "search", shot)
+    journal.record("甲公司", "https://a.example.com", "search", "")
+    journal.close()
+
+    assert journal.completed() == {"甲公司": {}}
+
+
+def test_completed_skips_truncated_last_line(tmp_path):
+    shot = screenshot(tmp_path, "a.png")
+    journal = RunJournal.create(tmp_path, ["甲公司"], ["search"])
+    journal.record("甲公司", "https://a.example.com", "search", shot)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "result", "entity": "甲公')
+
+    assert journal.completed() == {"甲公司": {"https://a.example.com": shot}}
+
+
+class RecordingVerifyService:
+    """只记录待核查 URL 的核查服务，每个 URL 返回一张新截图"""
+
+    def __init__(self, app_config, screenshot_dir):
+        self.config = app_config
+        self.screenshot_dir = screenshot_dir
+        self.requested = {}
+
+    async def iter_results(self, entity_urls, templates=None):
+        self.requested = entity_urls
+        for entity, urls in entity_urls.items():
+            results = {}
+            for index, url in enumerate(urls):
+                results[url] = screenshot(self.screenshot_dir, f"{entity}_{index}_new.png")
+                yield VerifyEvent.url_done(entity, url, results[url], url.template)
+            yield VerifyEvent.entity_done(entity, results)
+
+
+def test_resume_verifies_only_unfinished_urls(tmp_path):
+    app_config = config.model_copy(update={"output_dir": tmp_path, "reports_dir": tmp_path / "reports"})
+    templates = {
+        name: VerifyTemplate(name=name, description=name, url_pattern=f"https://{name}.example.com/s?wd={{}}")
+        for name in ("search", "court")
+    }
+    entity_urls = URLGenerator.generate_verify_urls(["甲公司", "乙公司"], templates)
+    first_url = entity_urls["甲公司"][0]
+
+    journal = RunJournal.create(tmp_path / "runs", list(entity_urls), list(templates))
+    journal.record("甲公司", first_url, "search", screenshot(tmp_path, "done.png"))
+    journal.record("乙公司", entity_urls["乙公司"][0], "search", "")
+    journal.close()
+
+    service = RecordingVerifyService(app_config, tmp_path)
+    operation = AutoVerifyOperation(URLGenerator(), service, ReportGenerator(app_config))
+    result = operation.execute(["甲公司", "乙公司"], templates, resume_run_id=journal.run_id)
+
+    assert result.success
+    assert result.data["run_id"] == journal.run_id
+    assert service.requested == {"甲公司": entity_urls["甲公司"][1:], "乙公司": entity_urls["乙公司"]}
+    assert sorted(result.data["report_paths"]) == ["乙公司", "甲公司"]
+    # 新的结果追加到同一份记录，再次恢复时全部完成
+    assert all(len(urls) == 2 for urls in RunJournal.open(tmp_path / "runs", journal.run_id).completed().values())
+
+
+def test_resume_unknown_run_fails(tmp_path):
+    app_config = config.model_copy(update={"output_dir": tmp_path})
+    templates = {"search": VerifyTemplate(name="search", description="search", url_pattern="https://s.example.com/{}")}
+    service = RecordingVerifyService(app_config, tmp_path)
+    operation = AutoVerifyOperation(URLGenerator(), service, ReportGenerator(app_config))
+
+    result = operation.execute(["甲公司"], templates, resume_run_id="missing")
+
+    assert not result.success
+    assert service.requested == {}
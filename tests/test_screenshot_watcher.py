@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+
+from docx import Document
+from PIL import Image
+
+from everify.core.services.capture_manifest import CaptureManifest
+from everify.core.services.report_generator import MANUAL_CHAPTERS, ReportGenerator
+from everify.core.services.screenshot_watcher import ManualScreenshotWatcher
+from everify.core.utils import config
+from everify.core.utils.config import ManualWatchConfig
+
+ENTITIES = ["甲公司", "乙公司"]
+
+
+def make_reports(tmp_path):
+    skeleton = ReportGenerator(config)._build_report_skeleton()
+    reports = {}
+    for entity in ENTITIES:
+        reports[entity] = tmp_path / f"{entity}.docx"
+        reports[entity].write_bytes(skeleton)
+    return reports
+
+
+def screenshot(directory, name, age=10):
+    path = directory / name
+    Image.new("RGB", (200, 120), "white").save(path, "PNG")
+    # 默认视为早已写入完成的文件
+    modified_at = time.time() - age
+    os.utime(path, (modified_at, modified_at))
+    return path
+
+
+def image_count(report_path):
+    return len(Document(str(report_path)).inline_shapes)
+
+
+def make_watcher(tmp_path, events=None, **options):
+    options.setdefault("use_watchdog", False)
+    options.setdefault("debounce_seconds", 0)
+    screenshot_dir = tmp_path / "shots"
+    screenshot_dir.mkdir(exist_ok=True)
+    return ManualScreenshotWatcher(
+        make_reports(tmp_path), screenshot_dir, ENTITIES, ManualWatchConfig(**options),
+        on_report=events.append if events is not None else None
+    )
+
+
+def test_sync_inserts_page_by_page_and_flush_saves(tmp_path):
+    events = []
+    watcher = make_watcher(tmp_path, events)
+    for index in range(3):
+        screenshot(watcher.screenshot_dir, f"20240101_12000{index}.png")
+
+    assert watcher.sync() == 3
+    watcher.flush()
+    watcher.close()
+
+    # 截图按文件名顺序交替分配给各主体
+    assert image_count(watcher.report_paths["甲公司"]) == 2
+    assert image_count(watcher.report_paths["乙公司"]) == 1
+    assert sorted(event.entity for event in events) == sorted(ENTITIES)
+    assert watcher._inserted[(0, "乙公司")].name == "20240101_120001.png"
+
+
+def test_sync_waits_for_files_still_being_written(tmp_path):
+    watcher = make_watcher(tmp_path, settle_seconds=60)
+    screenshot(watcher.screenshot_dir, "20240101_120000.png", age=0)
+
+    assert watcher.sync() == 0
+    assert watcher._unsettled
+    assert watcher.sync(settle=False) == 1
+    watcher.close()
+
+
+def test_flush_waits_for_debounce_unless_forced(tmp_path):
+    watcher = make_watcher(tmp_path, debounce_seconds=60)
+    screenshot(watcher.screenshot_dir, "20240101_120000.png")
+    watcher.sync()
+
+    watcher.flush()
+    assert image_count(watcher.report_paths["甲公司"]) == 0
+    watcher.flush(force=True)
+    watcher.close()
+    assert image_count(watcher.report_paths["甲公司"]) == 1
+
+
+def test_screenshots_are_inserted_once_and_reordering_is_not_reinserted(tmp_path):
+    watcher = make_watcher(tmp_path)
+    screenshot(watcher.screenshot_dir, "20240101_120001.png")
+    watcher.sync()
+    assert watcher.sync() == 0
+
+    # 文件名排在已插入截图之前的新截图会使位置整体移动，只提示不重复插入
+    screenshot(watcher.screenshot_dir, "20240101_120000.png")
+    watcher.sync()
+    watcher.flush(force=True)
+    watcher.close()
+
+    assert watcher.inserted_count == 2
+    assert (0, "甲公司") in watcher._conflicts
+    assert watcher._inserted[(0, "甲公司")].name == "20240101_120001.png"
+
+
+def test_manifest_tagged_screenshot_goes_to_recorded_slot(tmp_path):
+    watcher = make_watcher(tmp_path)
+    tagged = screenshot(watcher.screenshot_dir, "guided.png")
+    CaptureManifest.load(watcher.screenshot_dir).add(tagged, "乙公司", MANUAL_CHAPTERS[2])
+
+    assert watcher.sync() == 1
+    watcher.close()
+
+    assert watcher._inserted == {(2, "乙公司"): tagged}
+
+
+def test_run_polls_until_stopped(tmp_path):
+    watcher = make_watcher(tmp_path, poll_interval=0.05, settle_seconds=0)
+    screenshot(watcher.screenshot_dir, "20240101_120000.png")
+    stop_event = threading.Event()
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(count=watcher.run(stop_event)))
+    thread.start()
+
+    time.sleep(0.2)
+    screenshot(watcher.screenshot_dir, "20240101_120001.png")
+    time.sleep(0.2)
+    stop_event.set()
+    thread.join(5)
+
+    assert result["count"] == 2
+    assert image_count(watcher.report_paths["甲公司"]) == 1
+    assert image_count(watcher.report_paths["乙公司"]) == 1
+
+
+def test_entities_outside_the_list_are_ignored(tmp_path):
+    reports = make_reports(tmp_path)
+    reports["丙公司"] = tmp_path / "丙公司.docx"
+
+    watcher = ManualScreenshotWatcher(reports, tmp_path, ENTITIES, ManualWatchConfig(use_watchdog=False))
+
+    assert list(watcher.report_paths) == ENTITIES
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime
+
+from PIL import Image
+
+from everify.core.operations.search_engine_query_operation import SearchEngineQueryOperation
+from everify.core.services.report_generator import ReportGenerator
+from everify.core.services.result_cache import ResultCache
+from everify.core.utils import config
+from everify.core.utils.config import ResultCacheConfig
+
+
+class FakeBrowser:
+    """记录访问次数的浏览器引擎，每次截图写入一张新图片"""
+
+    def __init__(self):
+        self.navigations = 0
+
+    async def initialize(self):
+        pass
+
+    async def navigate(self, url, **kwargs):
+        self.navigations += 1
+        return True
+
+    async def screenshot(self, path, **kwargs):
+        Image.new("RGB", (200, 120), (self.navigations, 0, 0)).save(path, "PNG")
+
+    async def close(self):
+        pass
+
+
+def make_config(tmp_path, cache_enabled=True):
+    return config.model_copy(update={
+        "output_dir": tmp_path / "output",
+        "screenshots_dir": tmp_path / "screenshots",
+        "reports_dir": tmp_path / "reports",
+        "result_cache": ResultCacheConfig(enabled=cache_enabled),
+    })
+
+
+def run_search(app_config, browser):
+    operation = SearchEngineQueryOperation(browser, ReportGenerator(app_config), app_config)
+    return asyncio.run(operation._async_execute(["甲公司"], ["舆情"]))
+
+
+def test_each_capture_writes_a_new_file(tmp_path):
+    (tmp_path / "screenshots").mkdir()
+    app_config = make_config(tmp_path, cache_enabled=False)
+
+    first, _ = run_search(app_config, FakeBrowser())
+    first_bytes = open(first["甲公司"]["舆情"], "rb").read()
+    second, _ = run_search(app_config, FakeBrowser())
+
+    assert first["甲公司"]["舆情"] != second["甲公司"]["舆情"]
+    assert open(first["甲公司"]["舆情"], "rb").read() == first_bytes
+
+
+def test_cache_hit_returns_original_screenshot_and_capture_time(tmp_path):
+    (tmp_path / "screenshots").mkdir()
+    cached_config = make_config(tmp_path)
+    first, first_times = run_search(cached_config, FakeBrowser())
+    # 缓存关闭的运行写入新截图，不影响缓存中的截图
+    run_search(make_config(tmp_path, cache_enabled=False), FakeBrowser())
+
+    browser = FakeBrowser()
+    second, second_times = run_search(cached_config, browser)
+
+    assert browser.navigations == 0
+    assert second == first
+    assert first_times == {}
+    entry = ResultCache.from_app_config(cached_config).get("search_engine:舆情", "甲公司")
+    assert second_times == {"甲公司": {"舆情": entry["captured_at"]}}
+
+
+def test_watermark_uses_supplied_capture_time(tmp_path):
+    shot = tmp_path / "shot.png"
+    Image.new("RGB", (200, 120), "white").save(shot, "PNG")
+    generator = ReportGenerator(make_config(tmp_path))
+
+    _, supplied_text, _ = generator._watermark_job(str(shot), "甲公司", 0.0)
+    _, file_text, _ = generator._watermark_job(str(shot), "甲公司")
+
+    assert supplied_text == f"甲公司 - {datetime.fromtimestamp(0.0).strftime('%Y-%m-%d %H:%M:%S')}"
+    assert file_text == f"甲公司 - {datetime.fromtimestamp(shot.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S')}"
@@ -0,0 +1,77 @@
+import json
+import pickle
+
+from everify.core.services.url_generator import TemplatePrefixIndex, TemplateURL, URLGenerator
+from everify.core.utils.config import VerifyTemplate
+
+
+def template(name, url_pattern, **fields):
+    return VerifyTemplate(name=name, description=name, url_pattern=url_pattern, **fields)
+
+
+TEMPLATES = {
+    "search": template("search", "https://www.example.com/s?wd={}"),
+    "search_news": template("search_news", "https://www.example.com/s?tn=news&wd={}"),
+    "court": template("court", "https://court.example.org/query/{}/detail"),
+    "subdomain": template("subdomain", "https://{}.example.net/"),
+    "duplicate": template("duplicate", "https://www.example.com/s?wd={}&page=2"),
+    "manual": template("manual", "https://manual.example.com/", category="manual"),
+}
+
+
+def test_template_url_behaves_like_str():
+    url = TemplateURL("https://www.example.com/s?wd=甲", "search")
+
+    assert url == "https://www.example.com/s?wd=甲"
+    assert hash(url) == hash("https://www.example.com/s?wd=甲")
+    assert {url: 1}["https://www.example.com/s?wd=甲"] == 1
+    assert json.dumps(url) == json.dumps(str(url))
+    assert url.template == "search"
+
+
+def test_template_url_survives_pickling():
+    restored = pickle.loads(pickle.dumps(TemplateURL("https://court.example.org/query/甲/detail", "court")))
+
+    assert restored == "https://court.example.org/query/甲/detail"
+    assert restored.template == "court"
+
+
+def test_lookup_uses_longest_matching_prefix():
+    index = TemplatePrefixIndex(TEMPLATES)
+
+    assert index.lookup("https://www.example.com/s?wd=甲") == "search"
+    assert index.lookup("https://www.example.com/s?tn=news&wd=甲") == "search_news"
+    assert index.lookup("https://court.example.org/query/甲/detail") == "court"
+
+
+def test_lookup_matches_templates_with_placeholder_in_host():
+    index = TemplatePrefixIndex(TEMPLATES)
+
+    assert index.lookup("https://甲.example.net/") == "subdomain"
+
+
+def test_lookup_unknown_url():
+    # 主机名含占位符的模板固定部分只有协议，会匹配所有 https URL，这里不包含它
+    index = TemplatePrefixIndex({name: value for name, value in TEMPLATES.items() if name != "subdomain"})
+
+    assert index.lookup("https://unknown.example.com/s?wd=甲") is None
+    assert index.lookup("https://court.example.org/other") is None
+    assert index.lookup("not a url") is None
+
+
+def test_lookup_prefers_template_carried_by_url():
+    index = TemplatePrefixIndex(TEMPLATES)
+
+    # 前缀相同的模板只能通过 URL 携带的模板名称区分
+    assert index.lookup(TemplateURL("https://www.example.com/s?wd=甲&page=2", "duplicate")) == "duplicate"
+    assert index.lookup(TemplateURL("https://www.example.com/s?wd=甲", "removed")) == "search"
+
+
+def test_generated_urls_carry_template_names():
+    entity_urls = URLGenerator.generate_verify_urls(["甲公司"], TEMPLATES)
+    urls = entity_urls["甲公司"]
+
+    assert all(isinstance(url, TemplateURL) for url in urls)
+    assert {url.template for url in urls} == set(TEMPLATES) - {"manual"}
+    index = TemplatePrefixIndex(TEMPLATES)
+    assert all(index.lookup(url) == url.template for url in urls)
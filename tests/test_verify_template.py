@@ -0,0 +1,76 @@
+import copy
+
+from everify.core.utils.config import RateLimitConfig, ReadinessConfig, VerifyTemplate
+from everify.core.utils.template import DEFAULT_MAX_WAIT_MS, FALLBACK_MAX_WAIT_MS, fallback_max_wait_ms
+
+
+def make_template(**fields):
+    fields.setdefault("url_pattern", "https://www.example.com/s?wd={}")
+    return VerifyTemplate(name="search", description="搜索", **fields)
+
+
+def test_compiled_is_cached_until_a_field_changes():
+    template = make_template()
+    compiled = template.compiled
+
+    assert template.compiled is compiled
+    assert compiled.prefix == "https://www.example.com/s?wd="
+    assert compiled.host == "www.example.com"
+    assert compiled.render("甲 公司") == "https://www.example.com/s?wd=%E7%94%B2%20%E5%85%AC%E5%8F%B8"
+
+    template.url_pattern = "https://court.example.org/query/{}"
+    assert template.compiled is not compiled
+    assert template.compiled.prefix == "https://court.example.org/query/"
+
+
+def test_model_copy_with_update_recompiles():
+    template = make_template()
+    template.compile()
+
+    copied = template.model_copy(update={"url_pattern": "https://other.example.com/{}", "InsertContext": "章节"})
+
+    assert copied.compiled.prefix == "https://other.example.com/"
+    assert copied.compiled.chapter == "章节"
+    assert template.compiled.prefix == "https://www.example.com/s?wd="
+
+
+def test_copies_do_not_share_compiled_results():
+    template = make_template()
+    template.compile()
+
+    for copied in (template.model_copy(), template.model_copy(deep=True), copy.deepcopy(template)):
+        copied.url_pattern = "https://other.example.com/{}"
+        assert copied.compiled.prefix == "https://other.example.com/"
+    assert template.compiled.prefix == "https://www.example.com/s?wd="
+
+
+def test_nested_config_changes_are_visible_without_recompiling():
+    template = make_template(readiness=ReadinessConfig(max_wait_ms=500), rate_limit=RateLimitConfig(rate=1))
+    compiled = template.compiled
+    assert compiled.max_wait_ms == 500
+
+    template.readiness.max_wait_ms = 900
+    template.rate_limit.max_inflight = 5
+
+    assert template.compiled.max_wait_ms == 900
+    assert template.compiled.rate_limit.max_inflight == 5
+
+    template.readiness.max_wait_ms = None
+    assert template.compiled.max_wait_ms == DEFAULT_MAX_WAIT_MS
+
+
+def test_fallback_max_wait_by_host():
+    host, wait_ms = next(iter(FALLBACK_MAX_WAIT_MS.items()))
+
+    assert fallback_max_wait_ms(f"https://www.{host}/search?q={{}}") == wait_ms
+    assert fallback_max_wait_ms("https://www.example.com/") == DEFAULT_MAX_WAIT_MS
+    assert make_template(url_pattern=f"https://www.{host}/search?q={{}}").compiled.max_wait_ms == wait_ms
+
+
+def test_template_without_placeholder():
+    compiled = make_template(url_pattern="https://manual.example.com/login").compiled
+
+    assert compiled.parts is None
+    assert compiled.prefix is None
+    assert compiled.host == "manual.example.com"
+    assert compiled.render("甲公司") == "https://manual.example.com/login"
@@ -396,6 +396,124 @@ function throttle(func, limit) {
     };
 }
 
+// 后台任务：轮询任务状态直到结束，再获取任务结果
+function waitForJob(jobId, onProgress, interval = 2000) {
+    return new Promise((resolve, reject) => {
+        function poll() {
+            fetch(`/api/jobs/${jobId}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP 错误：${response.status} ${response.statusText}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (data.status !== 'success') {
+                    throw new Error(data.message);
+                }
+                if (onProgress) {
+                    onProgress(data.job);
+                }
+                if (['succeeded', 'failed', 'cancelled', 'interrupted'].includes(data.job.status)) {
+                    return fetch(`/api/jobs/${jobId}/results`)
+                        .then(response => response.json())
+                        .then(resolve);
+                }
+                setTimeout(poll, interval);
+            })
+            .catch(reject);
+        }
+        poll();
+    });
+}
+
+// 后台任务事件流（SSE）：实时接收任务事件，任务结束后获取任务结果；浏览器不支持或连接无法建立时退回轮询
+function watchJob(jobId, onEvent) {
+    const pollProgress = job => {
+        if (onEvent) {
+            onEvent({type: 'status', status: job.status, progress: job.progress});
+        }
+    };
+    if (!window.EventSource) {
+        return waitForJob(jobId, pollProgress);
+    }
+
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`/api/jobs/${jobId}/events`);
+        ['url_done', 'entity_done', 'report_ready', 'status'].forEach(type => {
+            source.addEventListener(type, event => {
+                if (onEvent) {
+                    onEvent(JSON.parse(event.data));
+                }
+            });
+        });
+        source.addEventListener('end', () => {
+            source.close();
+            fetch(`/api/jobs/${jobId}/results`)
+                .then(response => response.json())
+                .then(resolve)
+                .catch(reject);
+        });
+        source.onerror = () => {
+            // 连接中断时浏览器会携带 Last-Event-ID 自动重连，彻底关闭时才改为轮询
+            if (source.readyState === EventSource.CLOSED) {
+                waitForJob(jobId, pollProgress).then(resolve).catch(reject);
+            }
+        };
+    });
+}
+
+// 在按钮下方创建任务事件日志，显示失败的网页、耗时和已生成的报告
+function createJobLog(button) {
+    const log = document.createElement('div');
+    log.className = 'job-log';
+    button.parentNode.insertBefore(log, button.nextSibling);
+    return log;
+}
+
+function appendJobLog(log, data) {
+    let text = null;
+    let className = 'job-log-item';
+    if (data.type === 'url_done' && !data.success) {
+        text = `失败：${data.entity} - ${data.url}`;
+        className += ' failed';
+    } else if (data.type === 'url_done' && !data.cached) {
+        text = `完成：${data.entity} - ${data.url}`;
+    } else if (data.type === 'report_ready') {
+        text = data.success ? `报告已生成：${data.report}` : `报告生成失败：${data.entity}`;
+        className += data.success ? ' report' : ' failed';
+    }
+    if (!text) {
+        return;
+    }
+    if (data.elapsed_ms !== null && data.elapsed_ms !== undefined) {
+        text += `（${(data.elapsed_ms / 1000).toFixed(1)} 秒）`;
+    }
+
+    const item = document.createElement('div');
+    item.className = className;
+    item.textContent = text;
+    log.appendChild(item);
+    log.scrollTop = log.scrollHeight;
+}
+
+function formatJobProgress(job) {
+    const progress = job.progress;
+    let text = `${progress.entities_done}/${progress.entities_total}`;
+    if (progress.urls_done) {
+        text += `，已完成 ${progress.urls_done} 个网页`;
+        if (progress.urls_failed) {
+            text += `（失败 ${progress.urls_failed}）`;
+        }
+    }
+    return text;
+}
+
+function cancelJob(jobId) {
+    return fetch(`/api/jobs/${jobId}/cancel`, {method: 'POST'})
+        .then(response => response.json());
+}
+
 // 工具函数
 function formatDate(date, format = 'YYYY-MM-DD HH:mm:ss') {
     const d = new Date(date);